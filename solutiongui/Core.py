@@ -1,11 +1,14 @@
 import customtkinter as ctk 
 import logging
 from solutiongui.gui.gui_helpers import create_credentials_frame  # Converted to absolute import
+from app_startup import start_background_services, stop_background_services
 
 def main():
     # Your main application logic
     root = ctk.CTk()
     app = QuickLinksApp(root)
+    root.after_idle(start_background_services, root)
+    root.protocol("WM_DELETE_WINDOW", lambda: stop_background_services(root))
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,11 +1,2 @@
-import logging
-
-def setup_logging():
-    logging.basicConfig(
-        level=logging.DEBUG,  # Capture all debug messages
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('link_opener.log'),
-            logging.StreamHandler()  # Output logs to the terminal
-        ]
-    ) 
\ No newline at end of file
+# Kept for modules that import setup_logging from app_logger; the pipeline lives in logger.py.
+from logger import setup_logging, shutdown_logging, add_textbox_handler, remove_textbox_handler
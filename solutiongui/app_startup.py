@@ -0,0 +1,59 @@
+"""
+Background services started once the main window exists. Everything here is scheduled
+off the Tk thread or is cheap, so it does not delay the first frame. The automation
+modules are imported on that first call rather than when this module is imported.
+"""
+import logging
+
+
+def start_background_services(tk_root):
+    """
+    Starts the services the main window relies on.
+
+    Args:
+        tk_root (ctk.CTk): The main window.
+    """
+    from automation import warm_browser_pool
+    from automation_loop import get_automation_loop
+    from config_store import get_config_store
+    from event_log import apply_event_log_setting
+    from timing import apply_timing_setting
+
+    try:
+        apply_timing_setting(get_config_store().get("timing_enabled"))
+    except Exception:
+        logging.exception("Failed to apply the step timing setting.")
+
+    try:
+        apply_event_log_setting(get_config_store().get("event_log_enabled"))
+    except Exception:
+        logging.exception("Failed to start the structured event log.")
+
+    try:
+        # Completion callbacks of automations run on the Tk thread from now on.
+        get_automation_loop(tk_root)
+    except Exception:
+        logging.exception("Failed to start the automation loop.")
+
+    try:
+        # Launch the pooled browsers now so the first link click gets a warm browser.
+        warm_browser_pool()
+    except Exception:
+        logging.exception("Failed to schedule the browser pool warm-up.")
+
+
+def stop_background_services(tk_root):
+    """
+    Closes the pooled browsers and the automation loop, then destroys the main window.
+    Installed as the main window's close handler.
+
+    Args:
+        tk_root (ctk.CTk): The main window.
+    """
+    from automation import shutdown_automation
+
+    try:
+        shutdown_automation()
+    except Exception:
+        logging.exception("Failed to shut down the automation loop.")
+    tk_root.destroy()
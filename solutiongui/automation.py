@@ -2,144 +2,268 @@ import asyncio
 import logging
 import os
 import datetime
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from lazy_import import lazy_import
 from constants import LINKS
-import pywinauto
-import time
+from browser_pool import get_browser_pool, close_browser_pool, release_pooled_context, browser_settings, launch_options
+from automation_loop import current_automation_loop, get_automation_loop
+from retry_policy import RetryPolicy, async_call_with_retry, get_circuit_breaker, is_retryable_network_error
+from urllib.parse import urlparse
+from session_cache import get_session_cache
+from event_log import timed_event
+from route_profiles import navigate
+from diagnostics import start_run, end_run, current_run, record_step
+from timing import span, timed
+from ui_steps import Locator, Step, StepEngine, PywinautoBackend, disappears
 import threading
 
-async def async_open_link(url, name):
-    try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(
-            channel="chrome",
-            headless=False,
-            args=["--start-maximized"]
-        )
-
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto(url, timeout=60000)
-        logging.info(f"Opened URL with Playwright: {name} - {url}")
-
-        page_title = await page.title()
-        logging.info(f"Page Title for {name}: {page_title}")
+# Heavy dependencies load on first use so importing this module does not delay the first window.
+playwright_api = lazy_import("playwright.async_api")
 
-        await browser.close()
+# Navigation is retried once on connection errors (net::ERR_*), within a total budget.
+# Navigation timeouts are not retried, so a slow page fails after one timeout.
+NAVIGATION_RETRY_POLICY = RetryPolicy(max_attempts=2, base_delay=1.0, max_delay=2.0, deadline=150.0,
+                                      retryable=is_retryable_network_error)
 
-        await page.close()
-        await context.close()
-        await playwright.stop()
-
-    except PlaywrightTimeoutError:
-        logging.exception(f"Timeout while loading the page: {name} - {url}")
-    except Exception as e:
-        logging.exception(f"Failed to open URL with Playwright: {name} - {url}")
+@timed("flow.open_link")
+async def async_open_link(url, name, username=None):
+    """
+    Opens a link, reusing the cached authenticated session for `username` if there is one.
 
+    Args:
+        url (str): The URL to open.
+        name (str): Display name of the link.
+        username (str): User whose cached session should be reused (optional).
+    """
+    context = None
+    with timed_event("link_open", name=name, url=url) as event:
+        try:
+            context, page = await open_authenticated_page(url, username, name=name)
+            logging.info(f"Opened URL with Playwright: {name} - {url}")
+
+            page_title = await page.title()
+            logging.info(f"Page Title for {name}: {page_title}")
+
+        except playwright_api.TimeoutError:
+            event["outcome"] = "timeout"
+            logging.exception(f"Timeout while loading the page: {name} - {url}")
+        except Exception as e:
+            event.update(outcome="failure", error=type(e).__name__)
+            logging.exception(f"Failed to open URL with Playwright: {name} - {url}")
+        finally:
+            await release_page_context(context)
+
+@timed("flow.midway_login")
 async def async_open_midway_access(username, pin, testing_mode=False, timeout=60000):
     """
     Automates MIDWAY ACCESS login with optional testing mode and customizable timeout.
 
+    A cached session for the username is reused when it is still valid, in which
+    case the login form is skipped entirely.
+
     Args:
         username (str): User's username.
         pin (str): User's PIN.
         testing_mode (bool): Enable testing mode for detailed logs and screenshots.
         timeout (int): Timeout for page navigation in milliseconds.
     """
-    try:
-        log_debug_step(1, "Setting up Playwright.")
-        playwright, browser, context, page = await setup_playwright()
+    cache = get_session_cache()
+    context = None
+    diagnostics = start_run("midway_login") if testing_mode else None
+    with timed_event("midway_login", username=username) as event:
+        try:
+            log_debug_step(1, "Acquiring browser context from the pool.")
+            cached_state = cache.load(username)
+            context_options = {"storage_state": cached_state} if cached_state else {}
+            with span("midway.acquire_page"):
+                context, page = await acquire_pooled_page(**context_options)
         
-        log_debug_step(2, f"Navigating to MIDWAY ACCESS URL: {LINKS['MIDWAY ACCESS']} with timeout={timeout}ms")
-        await page.goto(LINKS["MIDWAY ACCESS"], timeout=timeout)
-        logging.info("Opened MIDWAY ACCESS URL.")
-        if testing_mode:
-            await capture_screenshot(page, "midway_access_open.png", "Opened MIDWAY ACCESS URL")
-
-        log_debug_step(3, "Filling in username and PIN.")
-        await page.fill('#user_name', username)
-        await page.fill('#password', pin)
-        if testing_mode:
-            await capture_screenshot(page, "midway_access_filled_form.png", "Filled login form")
-
-        log_debug_step(4, "Submitting the login form.")
-        await page.click('#verify_btn')
-        await page.wait_for_load_state('networkidle', timeout=15000)
-        logging.info("Submitted login form.")
-        if testing_mode:
-            await capture_screenshot(page, "midway_access_submit.png", "Submitted login form")
-
-        log_debug_step(5, "Retrieving page title after login.")
-        page_title = await page.title()
-        logging.info(f"Page Title after login: {page_title}")
-
-        await browser.close()
-        await playwright.stop()
-    except PlaywrightTimeoutError as te:
-        log_error("MIDWAY ACCESS automation", te, LINKS["MIDWAY ACCESS"])
-    except Exception as e:
-        log_error("MIDWAY ACCESS automation", e, LINKS["MIDWAY ACCESS"])
-
-async def async_open_reports_page(testing_mode=False, timeout=60000):
+            log_debug_step(2, f"Navigating to MIDWAY ACCESS URL: {LINKS['MIDWAY ACCESS']} with timeout={timeout}ms")
+            with span("midway.navigate"):
+                await navigate(page, LINKS["MIDWAY ACCESS"], "MIDWAY ACCESS", timeout, goto=goto_with_retry)
+            logging.info("Opened MIDWAY ACCESS URL.")
+            if testing_mode:
+                await capture_screenshot(page, "midway_access_open.png", "Opened MIDWAY ACCESS URL")
+
+            if cached_state and not await is_login_form_present(page):
+                event["reused_session"] = True
+                logging.info(f"Reused cached MIDWAY session for {username}; skipping login.")
+            else:
+                if cached_state:
+                    cache.invalidate(username)
+
+                log_debug_step(3, "Filling in username and PIN.")
+                with span("midway.fill_form"):
+                    await page.fill('#user_name', username)
+                    await page.fill('#password', pin)
+                if testing_mode:
+                    await capture_screenshot(page, "midway_access_filled_form.png", "Filled login form")
+
+                log_debug_step(4, "Submitting the login form.")
+                with span("midway.submit"):
+                    await page.click('#verify_btn')
+                try:
+                    # The form disappears once the login is accepted.
+                    with span("midway.wait_for_login"):
+                        await page.wait_for_selector('#verify_btn', state='detached', timeout=15000)
+                except playwright_api.TimeoutError:
+                    logging.info("Login form is still shown after submitting.")
+                logging.info("Submitted login form.")
+                if testing_mode:
+                    await capture_screenshot(page, "midway_access_submit.png", "Submitted login form")
+
+                if not await is_login_form_present(page):
+                    cache.save(username, await context.storage_state())
+                else:
+                    event["outcome"] = "rejected"
+
+            log_debug_step(5, "Retrieving page title after login.")
+            page_title = await page.title()
+            logging.info(f"Page Title after login: {page_title}")
+        except playwright_api.TimeoutError as te:
+            event["outcome"] = "timeout"
+            log_error("MIDWAY ACCESS automation", te, LINKS["MIDWAY ACCESS"])
+        except Exception as e:
+            event.update(outcome="failure", error=type(e).__name__)
+            log_error("MIDWAY ACCESS automation", e, LINKS["MIDWAY ACCESS"])
+        finally:
+            await release_page_context(context)
+            if diagnostics is not None:
+                end_run(diagnostics, event.get("outcome", "success"))
+
+@timed("flow.reports_open")
+async def async_open_reports_page(testing_mode=False, timeout=60000, username=None):
     """
     Opens the REPORTS page with optional testing mode and customizable timeout.
 
     Args:
         testing_mode (bool): Enable testing mode for detailed logs and screenshots.
         timeout (int): Timeout for page navigation in milliseconds.
+        username (str): User whose cached session should be reused (optional).
+    """
+    context = None
+    diagnostics = start_run("reports_open") if testing_mode else None
+    with timed_event("reports_open", url=LINKS["REPORTS"]) as event:
+        try:
+            log_debug_step(1, "Acquiring browser context from the pool.")
+            log_debug_step(2, f"Navigating to REPORTS URL: {LINKS['REPORTS']} with timeout={timeout}ms")
+            context, page = await open_authenticated_page(LINKS["REPORTS"], username, timeout=timeout, name="REPORTS")
+            logging.info("Opened REPORTS page with Playwright.")
+
+            if testing_mode:
+                await capture_screenshot(page, "reports_page_open.png", "Opened REPORTS page")
+        except playwright_api.TimeoutError as te:
+            event["outcome"] = "timeout"
+            log_error("REPORTS page automation", te, LINKS["REPORTS"])
+        except Exception as e:
+            event.update(outcome="failure", error=type(e).__name__)
+            log_error("REPORTS page automation", e, LINKS["REPORTS"])
+        finally:
+            await release_page_context(context)
+            if diagnostics is not None:
+                end_run(diagnostics, event.get("outcome", "success"))
+
+async def open_authenticated_page(url, username=None, timeout=60000, name=None):
     """
+    Opens a URL in a pooled context seeded with the cached session for `username`.
+
+    If the page is redirected to a login page the cached session is invalidated,
+    so the next MIDWAY ACCESS run performs a full login.
+
+    Args:
+        url (str): The URL to open.
+        username (str): User whose cached session should be reused (optional).
+        timeout (int): Timeout for page navigation in milliseconds.
+        name (str): Link name selecting the route profile and readiness condition (optional).
+
+    Returns:
+        tuple: (context, page). Release the context with `release_page_context()`.
+    """
+    cache = get_session_cache()
+    cached_state = cache.load(username)
+    context_options = {"storage_state": cached_state} if cached_state else {}
+    context, page = await acquire_pooled_page(**context_options)
     try:
-        log_debug_step(1, "Setting up Playwright.")
-        playwright, browser, context, page = await setup_playwright()
-        
-        log_debug_step(2, f"Navigating to REPORTS URL: {LINKS['REPORTS']} with timeout={timeout}ms")
-        await page.goto(LINKS["REPORTS"], timeout=timeout)
-        logging.info("Opened REPORTS page with Playwright.")
+        await navigate(page, url, name, timeout, goto=goto_with_retry)
+    except Exception:
+        await release_page_context(context)
+        raise
+    if cached_state and cache.is_login_redirect(page.url):
+        logging.info(f"Cached session for {username} was redirected to login.")
+        cache.invalidate(username)
+    return context, page
 
-        if testing_mode:
-            await capture_screenshot(page, "reports_page_open.png", "Opened REPORTS page")
+@timed("page.goto")
+async def goto_with_retry(page, url, timeout=60000, wait_until="load"):
+    """
+    Navigates to a URL, retrying transient failures under the navigation retry policy
+    and a per-host circuit breaker.
 
-        await browser.close()
-        await playwright.stop()
-    except PlaywrightTimeoutError as te:
-        log_error("REPORTS page automation", te, LINKS["REPORTS"])
-    except Exception as e:
-        log_error("REPORTS page automation", e, LINKS["REPORTS"])
+    Args:
+        page: Playwright page instance.
+        url (str): The URL to open.
+        timeout (int): Timeout for each navigation attempt in milliseconds.
+        wait_until (str): Playwright load event that ends the navigation.
+
+    Returns:
+        Response: The Playwright navigation response.
+    """
+    breaker = get_circuit_breaker(urlparse(url).netloc)
+    return await async_call_with_retry(
+        lambda: page.goto(url, timeout=timeout, wait_until=wait_until), NAVIGATION_RETRY_POLICY, breaker
+    )
+
+async def is_login_form_present(page):
+    """
+    Checks whether the MIDWAY login form is shown on the page.
+
+    Args:
+        page: Playwright page instance.
+
+    Returns:
+        bool: True if the username field is present.
+    """
+    return await page.query_selector('#user_name') is not None
 
 async def capture_screenshot(page, filename, description):
     """
     Captures a screenshot of the current page and logs the action.
 
+    During a diagnostics run the trace already holds a screenshot of every step, so
+    only a step marker is recorded. Otherwise the PNG goes to this session's debug folder.
+
     Args:
         page: Playwright page instance.
         filename (str): Name of the file to save the screenshot.
         description (str): A description to log.
     """
+    if current_run() is not None:
+        record_step("screenshot", description)
+        return
     try:
-        debug_folder = create_debug_folder()
+        debug_folder = get_debug_folder()
         screenshot_path = os.path.join(debug_folder, filename)
         await page.screenshot(path=screenshot_path)
         logging.info(f"{description}. Screenshot saved: {screenshot_path}")
     except Exception as e:
         logging.exception(f"Failed to capture screenshot: {e}")
 
-async def setup_playwright(channel="chrome", headless=False):
+async def setup_playwright(channel="chrome", headless=None, browser_type=None):
     """
     Sets up Playwright browser, context, and page instances.
 
     Args:
-        channel (str): Browser channel to use (default: Chrome).
-        headless (bool): Whether to run the browser in headless mode.
+        channel (str): Browser channel to use for Chromium (default: Chrome).
+        headless (bool): Whether to run the browser in headless mode (default: the saved setting).
+        browser_type (str): "chromium" or "firefox" (default: the saved setting).
 
     Returns:
         tuple: (playwright, browser, context, page)
     """
     try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(
-            channel=channel,
-            headless=headless,
-            args=["--start-maximized"]
+        browser_type, headless = browser_settings(browser_type, headless)
+        playwright = await playwright_api.async_playwright().start()
+        browser = await getattr(playwright, browser_type).launch(
+            **launch_options(browser_type, headless, channel)
         )
         context = await browser.new_context()
         page = await context.new_page()
@@ -148,6 +272,147 @@ async def setup_playwright(channel="chrome", headless=False):
         logging.exception("Failed to setup Playwright.")
         raise
 
+@timed("browser.acquire_page")
+async def acquire_pooled_page(**context_options):
+    """
+    Acquires a fresh context from the shared browser pool and opens a page in it. During
+    a diagnostics run the context records a trace and a HAR file.
+
+    Args:
+        **context_options: Keyword arguments passed to `browser.new_context()`.
+
+    Returns:
+        tuple: (context, page). Release the context with `release_page_context()`.
+    """
+    pool = get_browser_pool()
+    diagnostics = current_run()
+    if diagnostics is not None:
+        context_options.update(diagnostics.context_options())
+    context = await pool.acquire_context(**context_options)
+    try:
+        if diagnostics is not None:
+            await diagnostics.attach(context)
+        page = await context.new_page()
+    except Exception:
+        await release_page_context(context)
+        raise
+    return context, page
+
+async def release_page_context(context):
+    """
+    Returns a context from `acquire_pooled_page` to the pool, saving the diagnostics
+    trace first when a diagnostics run is active.
+
+    Args:
+        context (BrowserContext): The context, or None if none was acquired.
+    """
+    if context is None:
+        return
+    diagnostics = current_run()
+    if diagnostics is not None:
+        await diagnostics.detach(context)
+    await release_pooled_context(context)
+
+async def async_warm_browser_pool():
+    """
+    Starts the Playwright driver and launches the pooled browsers ahead of the first click.
+    """
+    try:
+        await get_browser_pool().start()
+    except Exception:
+        logging.exception("Failed to pre-launch the browser pool.")
+
+def warm_browser_pool():
+    """
+    Runs `async_warm_browser_pool` on the shared automation loop without blocking the caller.
+
+    Returns:
+        concurrent.futures.Future: Future for the warm-up.
+    """
+    return get_automation_loop().submit(async_warm_browser_pool)
+
+def open_link(url, name, username=None, callback=None):
+    """
+    Runs `async_open_link` on the shared automation loop without blocking the caller.
+
+    Args:
+        url (str): The URL to open.
+        name (str): Display name of the link.
+        username (str): User whose cached session should be reused (optional).
+        callback (function): Called with the finished future on the Tk main loop (optional).
+
+    Returns:
+        concurrent.futures.Future: Future for the automation run.
+    """
+    return get_automation_loop().submit(async_open_link, url, name, username=username, callback=callback)
+
+def open_midway_access(username, pin, testing_mode=False, timeout=60000, callback=None):
+    """
+    Runs `async_open_midway_access` on the shared automation loop without blocking the caller.
+
+    Args:
+        username (str): User's username.
+        pin (str): User's PIN.
+        testing_mode (bool): Enable testing mode for detailed logs and screenshots.
+        timeout (int): Timeout for page navigation in milliseconds.
+        callback (function): Called with the finished future on the Tk main loop (optional).
+
+    Returns:
+        concurrent.futures.Future: Future for the automation run.
+    """
+    return get_automation_loop().submit(
+        async_open_midway_access, username, pin,
+        testing_mode=testing_mode, timeout=timeout, callback=callback
+    )
+
+def open_reports_page(testing_mode=False, timeout=60000, username=None, callback=None):
+    """
+    Runs `async_open_reports_page` on the shared automation loop without blocking the caller.
+
+    Args:
+        testing_mode (bool): Enable testing mode for detailed logs and screenshots.
+        timeout (int): Timeout for page navigation in milliseconds.
+        username (str): User whose cached session should be reused (optional).
+        callback (function): Called with the finished future on the Tk main loop (optional).
+
+    Returns:
+        concurrent.futures.Future: Future for the automation run.
+    """
+    return get_automation_loop().submit(
+        async_open_reports_page, testing_mode=testing_mode, timeout=timeout,
+        username=username, callback=callback
+    )
+
+def shutdown_automation(timeout=10):
+    """
+    Closes the browser pool on the automation loop and stops the loop thread.
+
+    Args:
+        timeout (float): Seconds to wait for the pool to close.
+    """
+    automation_loop = current_automation_loop()
+    if automation_loop is None or automation_loop.loop is None or not automation_loop.loop.is_running():
+        return
+    try:
+        automation_loop.submit(close_browser_pool, block=True, timeout=timeout).result(timeout)
+    except Exception:
+        logging.exception("Failed to close the browser pool.")
+    automation_loop.stop(timeout)
+
+_debug_folder = None
+
+def get_debug_folder():
+    """
+    Returns this session's debug folder, creating it on first use.
+
+    Returns:
+        str: Path to the debug folder.
+    """
+    global _debug_folder
+    if _debug_folder is None:
+        _debug_folder = create_debug_folder()
+    return _debug_folder
+
 def create_debug_folder():
     """
     Creates a timestamped folder for debug output.
@@ -188,50 +453,51 @@ def log_debug_step(step, message):
         message (str): Description of the step.
     """
     logging.debug(f"[Step {step}] {message}")
-
-def reset_security_key():
-    """
-    Automates the reset process for a security key via Windows Settings using pywinauto.
+    record_step(step, message)
+
+SETTINGS_APP_COMMAND = (
+    "explorer.exe shell:appsFolder\\windows.immersivecontrolpanel_cw5n1h2txyewy!microsoft.windows.immersivecontrolpanel"
+)
+
+RESET_SECURITY_KEY_STEPS = [
+    Step("settings window", Locator(title_re=".*Settings.*", control_type="Window"), action=None, timeout=15),
+    Step("sign-in options", Locator("Sign-in options", "ListItem")),
+    Step("security key", Locator("Security Key", "Button")),
+    Step("manage", Locator("Manage", "Button")),
+    Step("reset", Locator("Reset", "Button")),
+    # Only some Windows versions ask for confirmation.
+    Step("confirm", Locator("Yes", "Button"), verify=disappears(Locator("Yes", "Button")), timeout=5,
+         optional=True),
+]
+
+def reset_security_key(backend=None, engine=None):
     """
-    try:
-        # Start the Settings application
-        logging.info("Opening Windows Settings...")
-        app = pywinauto.Application(backend="uia").start(
-            "explorer.exe shell:appsFolder\\windows.immersivecontrolpanel_cw5n1h2txyewy!microsoft.windows.immersivecontrolpanel"
-        )
-
-        # Wait for the Settings window to appear
-        time.sleep(3)
-        settings_window = app.window(title_re=".*Settings.*")
-
-        # Navigate to the "Sign-in Options" page
-        logging.info("Navigating to 'Sign-in options'...")
-        settings_window.child_window(title="Sign-in options", control_type="ListItem").wait("exists", timeout=10).click_input()
-
-        # Wait for the "Sign-in Options" page to load
-        time.sleep(2)
-
-        # Click the "Security Key" button
-        logging.info("Clicking the 'Security Key' button...")
-        settings_window.child_window(title="Security Key", control_type="Button").wait("exists", timeout=10).click_input()
-
-        # Click the "Manage" button
-        logging.info("Clicking the 'Manage' button...")
-        settings_window.child_window(title="Manage", control_type="Button").wait("exists", timeout=10).click_input()
-
-        # Click the "Reset" button
-        logging.info("Clicking the 'Reset' button...")
-        settings_window.child_window(title="Reset", control_type="Button").wait("exists", timeout=10).click_input()
+    Automates the reset process for a security key via Windows Settings.
 
-        # Confirm the reset action (if applicable)
-        logging.info("Confirming the reset action...")
-        if settings_window.child_window(title="Yes", control_type="Button").exists(timeout=5):
-            settings_window.child_window(title="Yes", control_type="Button").click_input()
+    Each step continues as soon as its control is ready and is retried on its own if it fails.
 
-        logging.info("Security key reset successfully completed!")
+    Args:
+        backend (UiBackend): UI backend (default: pywinauto).
+        engine (StepEngine): Step engine (default: one using `backend`).
 
+    Returns:
+        FlowResult: Per-step results, or None if Settings could not be started.
+    """
+    backend = backend or PywinautoBackend()
+    engine = engine or StepEngine(backend)
+    try:
+        logging.info("Opening Windows Settings...")
+        backend.launch(SETTINGS_APP_COMMAND)
     except Exception as e:
         logging.error(f"An error occurred during the reset process: {e}")
+        return None
+
+    result = engine.run("reset_security_key", RESET_SECURITY_KEY_STEPS)
+    if result.ok:
+        logging.info(f"Security key reset successfully completed in {result.duration_ms / 1000:.1f}s!")
+    else:
+        logging.error(f"The reset process stopped at step '{result.steps[-1].name}': {result.steps[-1].error}")
+    return result
 
 def initiate_reset_security_key():
     reset_thread = threading.Thread(target=reset_security_key, daemon=True)
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import queue
+import threading
+
+
+class AutomationLoop:
+    """
+    Runs a single asyncio event loop on a background thread for all automation
+    coroutines, so Tk callbacks never create their own loops or block on
+    navigation.
+    """
+
+    def __init__(self, tk_root=None, max_pending=8, poll_interval_ms=50):
+        """
+        Initializes the loop. Call `start()` before submitting work.
+
+        Args:
+            tk_root (ctk.CTk): Window whose main loop receives completion callbacks (optional).
+                Without it, callbacks run on the automation thread.
+            max_pending (int): Maximum number of submitted coroutines not yet finished.
+            poll_interval_ms (int): How often the Tk main loop drains completed callbacks.
+        """
+        self.tk_root = tk_root
+        self.max_pending = max_pending
+        self.poll_interval_ms = poll_interval_ms
+        self.loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._callbacks = queue.Queue()
+        self._pump_scheduled = False
+
+    def start(self):
+        """
+        Starts the background thread and waits until its event loop is running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="automation-loop", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        self._schedule_pump()
+        logging.info("Automation event loop started.")
+
+    def set_tk_root(self, tk_root):
+        """
+        Attaches the window whose main loop receives completion callbacks. Callbacks of
+        coroutines that finish afterwards run on that window's thread.
+
+        Args:
+            tk_root (ctk.CTk): The main window.
+        """
+        self.tk_root = tk_root
+        if self.loop is not None and self.loop.is_running():
+            self._schedule_pump()
+
+    def _schedule_pump(self):
+        if self.tk_root is not None and not self._pump_scheduled:
+            self._pump_scheduled = True
+            self.tk_root.after(self.poll_interval_ms, self._pump_callbacks)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+
+    @property
+    def pending(self):
+        """
+        int: Number of submitted coroutines that have not finished yet.
+        """
+        with self._pending_lock:
+            return self._pending
+
+    def submit(self, coro_fn, *args, callback=None, block=False, timeout=None, **kwargs):
+        """
+        Schedules `coro_fn(*args, **kwargs)` on the automation loop.
+
+        Args:
+            coro_fn (function): Coroutine function to run.
+            *args: Positional arguments for `coro_fn`.
+            callback (function): Called with the finished future, on the Tk main loop
+                when a window was given (optional).
+            block (bool): Wait for a free slot instead of failing when the queue is full.
+            timeout (float): Maximum seconds to wait for a free slot when `block` is True.
+            **kwargs: Keyword arguments for `coro_fn`.
+
+        Returns:
+            concurrent.futures.Future: Future for the coroutine result. `future.cancel()`
+            cancels the running task.
+
+        Raises:
+            queue.Full: If `max_pending` coroutines are already queued or running.
+        """
+        if self.loop is None or not self.loop.is_running():
+            raise RuntimeError("Automation loop is not running.")
+        if callback is not None and self.tk_root is None:
+            logging.warning(f"{getattr(coro_fn, '__name__', coro_fn)} was submitted with a callback but no Tk root "
+                            f"is attached; the callback will run on the automation thread.")
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            raise queue.Full(f"{self.max_pending} automations already pending.")
+        with self._pending_lock:
+            self._pending += 1
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro_fn(*args, **kwargs), self.loop)
+        except Exception:
+            self._release_slot()
+            raise
+
+        def on_done(done_future):
+            self._release_slot()
+            if callback is None:
+                return
+            if self.tk_root is None:
+                self._invoke(callback, done_future)
+            else:
+                self._callbacks.put((callback, done_future))
+
+        future.add_done_callback(on_done)
+        return future
+
+    def _release_slot(self):
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _pump_callbacks(self):
+        while True:
+            try:
+                callback, future = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            self._invoke(callback, future)
+        if self.loop is not None and not self.loop.is_closed():
+            self.tk_root.after(self.poll_interval_ms, self._pump_callbacks)
+        else:
+            self._pump_scheduled = False
+
+    def _invoke(self, callback, future):
+        try:
+            callback(future)
+        except Exception:
+            logging.exception("Automation callback failed.")
+
+    def stop(self, timeout=10):
+        """
+        Cancels outstanding work, stops the event loop and joins the thread.
+
+        Args:
+            timeout (float): Seconds to wait for the thread to finish.
+        """
+        if self.loop is None or not self.loop.is_running():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        logging.info("Automation event loop stopped.")
+
+
+_shared_loop = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_automation_loop(tk_root=None, max_pending=8):
+    """
+    Returns the application-wide automation loop, starting it on first use.
+
+    Args:
+        tk_root (ctk.CTk): Window whose main loop receives completion callbacks (optional).
+            Attached to the loop even when it was created earlier without one.
+        max_pending (int): Maximum number of pending coroutines when the loop is created.
+
+    Returns:
+        AutomationLoop: The running shared loop.
+    """
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = AutomationLoop(tk_root=tk_root, max_pending=max_pending)
+        _shared_loop.start()
+        if tk_root is not None and _shared_loop.tk_root is not tk_root:
+            _shared_loop.set_tk_root(tk_root)
+        return _shared_loop
+
+
+def current_automation_loop():
+    """
+    Returns the application-wide automation loop without creating it.
+
+    Returns:
+        AutomationLoop: The shared loop, or None if nothing has used it yet.
+    """
+    with _shared_loop_lock:
+        return _shared_loop
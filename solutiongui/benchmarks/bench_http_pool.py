@@ -0,0 +1,72 @@
+"""
+Compares per-request latency of bare `requests.get` against the pooled sessions and
+cached signers from `http_pool`, using a local HTTPS stand-in for the device-admin API.
+
+Run from the solutiongui directory:
+    python benchmarks/bench_http_pool.py --requests 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+from http_pool import SessionPool, SignerCache
+from benchmarks.standin import StandInServer
+
+
+def measure(send, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = send()
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def summarize(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<10} mean={statistics.mean(latencies):7.2f} ms  p50={statistics.median(latencies):7.2f} ms  p95={p95:7.2f} ms")
+    return statistics.mean(latencies)
+
+
+def run(count):
+    signer_cache = SignerCache()
+    credentials = ("AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", "session-token")
+
+    with StandInServer() as server:
+        url = f"{server.base_url}/devices/G030PM0123456789/passcode"
+        verify = server.cert_path or True
+
+        def bare():
+            auth = signer_cache.factory(credentials[0], credentials[1], "us-east-1", "execute-api", session_token=credentials[2])
+            return requests.get(url, auth=auth, timeout=30, verify=verify)
+
+        pool = SessionPool()
+
+        def pooled():
+            auth = signer_cache.get(*credentials, "us-east-1", "execute-api")
+            return pool.get(url).get(url, auth=auth, timeout=30, verify=verify)
+
+        print(f"{count} requests against {server.base_url}")
+        before = summarize("bare", measure(bare, count))
+        after = summarize("pooled", measure(pooled, count))
+        pool.close()
+        print(f"speedup    {before / after:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per variant.")
+    args = parser.parse_args()
+    run(args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+In-process fakes used by the benchmark suite so it runs headless on Linux without
+security keys, a browser or the real device-admin API.
+"""
+import asyncio
+import contextlib
+import importlib.machinery
+import importlib.util
+import sys
+import types
+
+
+def make_fake_customtkinter():
+    """
+    Builds a `customtkinter` placeholder whose widget classes can be referenced and
+    subclassed, enough to import GUI modules whose hot paths the suite drives through
+    other fakes such as FakeTextbox.
+    """
+    module = types.ModuleType("customtkinter")
+
+    def placeholder(name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        widget = type(name, (), {"__init__": lambda self, *args, **kwargs: None})
+        setattr(module, name, widget)
+        return widget
+
+    # Any attribute (CTk, CTkTextbox, StringVar, ...) resolves to a do-nothing class.
+    module.__getattr__ = placeholder
+    return module
+
+
+def make_fake_requests_aws4auth():
+    """
+    Builds a `requests_aws4auth` placeholder whose AWS4Auth leaves requests unsigned.
+    """
+    module = types.ModuleType("requests_aws4auth")
+
+    class AWS4Auth:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __call__(self, request):
+            return request
+
+    module.AWS4Auth = AWS4Auth
+    return module
+
+
+@contextlib.contextmanager
+def fake_missing_modules(**modules):
+    """
+    Makes each named module that is not installed importable as the given fake while the
+    block runs. Installed modules are left alone, so real dependencies are always preferred.
+    """
+    installed = [name for name in modules if name not in sys.modules and importlib.util.find_spec(name) is None]
+    for name in installed:
+        # find_spec() on a module in sys.modules returns its __spec__, which must not be None.
+        modules[name].__spec__ = importlib.machinery.ModuleSpec(name, None)
+        sys.modules[name] = modules[name]
+    try:
+        yield installed
+    finally:
+        for name in installed:
+            sys.modules.pop(name, None)
+
+
+class FakeTextbox:
+    """
+    Minimal stand-in for CTkTextbox that stores its content as a list of lines.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.state = "normal"
+        self.operations = 0
+
+    def configure(self, **kwargs):
+        self.state = kwargs.get("state", self.state)
+
+    def delete(self, start, end=None):
+        self.operations += 1
+        if start == "1.0" and end == "end":
+            self.lines = []
+        else:
+            line = int(str(start).split(".")[0]) - 1
+            del self.lines[line]
+
+    def insert(self, index, text):
+        self.operations += 1
+        new_lines = [line for line in text.split("\n") if line]
+        if index == "end":
+            self.lines.extend(new_lines)
+        else:
+            line = int(str(index).split(".")[0]) - 1
+            self.lines[line:line] = new_lines
+
+    def get(self, start="1.0", end="end"):
+        return "\n".join(self.lines) + "\n"
+
+    def see(self, index):
+        pass
+
+
+class FakeHid:
+    """
+    Stand-in for the `hid` module: `enumerate()` returns a configurable device list.
+    """
+
+    def __init__(self, devices=None):
+        self.devices = list(devices or [])
+        self.enumerations = 0
+
+    def enumerate(self, vendor_id=0, product_id=0):
+        self.enumerations += 1
+        return [dict(device) for device in self.devices]
+
+
+def make_hid_devices(count, vendor_id=0x1949, product_id=0x0429):
+    """
+    Builds `count` HID device descriptors shaped like `hid.enumerate()` results.
+    """
+    return [
+        {
+            "path": f"/dev/hidraw{index}".encode(),
+            "vendor_id": vendor_id,
+            "product_id": product_id,
+            "serial_number": f"SN{index:06d}",
+            "product_string": "ZUKEY 2 HID",
+            "manufacturer_string": "Amazon",
+            "usage_page": 0xF1D0,
+            "usage": 1,
+        }
+        for index in range(count)
+    ]
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+
+class FakeBrowserContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        return FakePage(self.browser.page_delays, self.browser.page_statuses)
+
+    async def close(self):
+        await asyncio.sleep(0)
+
+    async def storage_state(self):
+        return {"cookies": [], "origins": []}
+
+
+class FakePage:
+    def __init__(self, delays=None, statuses=None):
+        self.url = "about:blank"
+        self.delays = delays or {}
+        self.statuses = statuses or {}
+
+    async def goto(self, url, timeout=None, **kwargs):
+        await asyncio.sleep(self.delays.get(url, 0))
+        self.url = url
+        return FakeResponse(self.statuses.get(url, 200))
+
+    async def title(self):
+        return "Fake Page"
+
+    def on(self, event, callback):
+        pass
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def wait_for_load_state(self, state="load", timeout=None):
+        pass
+
+    async def wait_for_selector(self, selector, state="visible", timeout=None):
+        pass
+
+    async def content(self):
+        return "<html><head><title>Fake Page</title></head><body></body></html>"
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, launch_delay, page_delays=None, page_statuses=None):
+        self.launch_delay = launch_delay
+        self.page_delays = page_delays
+        self.page_statuses = page_statuses
+        self.connected = True
+
+    async def new_context(self, **kwargs):
+        await asyncio.sleep(0)
+        return FakeBrowserContext(self)
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeBrowserType:
+    def __init__(self, launch_delay, page_delays=None, page_statuses=None):
+        self.launch_delay = launch_delay
+        self.page_delays = page_delays
+        self.page_statuses = page_statuses
+        self.launches = 0
+        self.launch_options = []
+
+    async def launch(self, **kwargs):
+        self.launches += 1
+        self.launch_options.append(kwargs)
+        await asyncio.sleep(self.launch_delay)
+        return FakeBrowser(self.launch_delay, self.page_delays, self.page_statuses)
+
+
+class FakePlaywright:
+    def __init__(self, launch_delay, page_delays=None, page_statuses=None):
+        self.chromium = FakeBrowserType(launch_delay, page_delays, page_statuses)
+        self.firefox = FakeBrowserType(launch_delay, page_delays, page_statuses)
+
+    async def stop(self):
+        pass
+
+
+class FakePlaywrightApi:
+    """
+    Stand-in for `playwright.async_api`; browser launches sleep for `launch_delay`
+    seconds to model a cold Chrome start. `page_delays` and `page_statuses` map URLs to
+    the seconds `goto()` takes and the HTTP status it returns (default: instant, 200).
+    Every started driver is kept in `started`.
+    """
+
+    class TimeoutError(Exception):
+        pass
+
+    def __init__(self, launch_delay=0.05, page_delays=None, page_statuses=None):
+        self.launch_delay = launch_delay
+        self.page_delays = page_delays
+        self.page_statuses = page_statuses
+        self.started = []
+
+    def async_playwright(self):
+        api = self
+
+        class Starter:
+            async def start(self):
+                playwright = FakePlaywright(api.launch_delay, api.page_delays, api.page_statuses)
+                api.started.append(playwright)
+                return playwright
+
+        return Starter()
+
+
+class FakeMidwayHelper:
+    """
+    Stand-in for MidwayAuthHelper returning fixed credentials.
+    """
+
+    def get_creds(self, aws_account_id, identity_pool_id):
+        return "AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", "session-token"
+
+
+def make_button_template(text="Manage", width=150, height=40, seed=0):
+    """
+    Draws a Windows-style button with a label as an RGB NumPy array (needs numpy and cv2).
+    """
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    button = np.full((height, width, 3), (225, 225, 225), dtype=np.uint8)
+    cv2.rectangle(button, (0, 0), (width - 1, height - 1), (120, 120, 120), 2)
+    cv2.rectangle(button, (8, 10), (28, 30), tuple(int(c) for c in rng.integers(0, 200, 3)), -1)
+    cv2.putText(button, text, (36, 27), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (20, 20, 20), 2, cv2.LINE_AA)
+    return button
+
+
+def make_synthetic_screen(template, position, scale=1.0, size=(1920, 1080), windows=25, seed=0):
+    """
+    Builds a desktop-like RGB screenshot (gradient, random windows with text, noise)
+    and pastes `template`, resized by `scale`, with its top-left corner at `position`.
+
+    Returns:
+        numpy.ndarray: The screenshot.
+    """
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    width, height = size
+    gradient = np.linspace(40, 120, width, dtype=np.float32)
+    screen = np.repeat(np.repeat(gradient[None, :, None], height, axis=0), 3, axis=2).astype(np.uint8)
+    for _ in range(windows):
+        x, y = int(rng.integers(0, width - 200)), int(rng.integers(0, height - 150))
+        w, h = int(rng.integers(150, 600)), int(rng.integers(100, 400))
+        color = tuple(int(c) for c in rng.integers(60, 255, 3))
+        cv2.rectangle(screen, (x, y), (x + w, y + h), color, -1)
+        for line in range(int(rng.integers(1, 6))):
+            label = "".join(chr(int(c)) for c in rng.integers(97, 123, int(rng.integers(4, 14))))
+            cv2.putText(screen, label, (x + 10, y + 25 + 22 * line), cv2.FONT_HERSHEY_SIMPLEX, 0.55,
+                        (0, 0, 0), 1, cv2.LINE_AA)
+    noise = rng.integers(-6, 7, screen.shape, dtype=np.int16)
+    screen = np.clip(screen.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+    button = template if scale == 1.0 else cv2.resize(template, None, fx=scale, fy=scale,
+                                                      interpolation=cv2.INTER_LINEAR)
+    x, y = position
+    screen[y:y + button.shape[0], x:x + button.shape[1]] = button
+    return screen
@@ -0,0 +1,126 @@
+"""
+Runs the benchmark suite, writes machine-readable results and flags regressions
+against a stored baseline.
+
+Usage (from the solutiongui directory):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --only context_acquisition log_handler
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# Add the package directory and repository root to sys.path
+sys.path.insert(0, PACKAGE_DIR)
+sys.path.insert(1, os.path.dirname(PACKAGE_DIR))
+
+from benchmarks.suite import BENCHMARKS
+
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_TOLERANCE = 0.25
+# Sub-0.1 ms latencies jitter by more than 25% from run to run; a change must also
+# exceed this absolute amount (in the metric's own unit) to count as a regression.
+DEFAULT_MIN_DELTA = 0.05
+
+
+def higher_is_better(metric):
+    return metric.endswith("_per_s")
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Compares results with a baseline.
+
+    Args:
+        results (dict): {benchmark: {metric: value}} from this run.
+        baseline (dict): Same shape, from the stored baseline.
+        tolerance (float): Allowed relative slowdown, e.g. 0.25 for 25%.
+        min_delta (float): Absolute change a metric must also exceed to count as a regression.
+
+    Returns:
+        list: (benchmark, metric, baseline value, current value, relative change) per regression.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(expected, (int, float)) or expected == 0:
+                continue
+            change = (value - expected) / expected
+            if higher_is_better(metric):
+                change = -change
+            if change > tolerance and abs(value - expected) > min_delta:
+                regressions.append((name, metric, expected, value, change))
+    return regressions
+
+
+def run(names):
+    results = {}
+    for name in names:
+        started = time.perf_counter()
+        try:
+            results[name] = BENCHMARKS[name]()
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        elapsed = time.perf_counter() - started
+        metrics = results[name]
+        if "skipped" in metrics or "error" in metrics:
+            print(f"{name:<22} {'SKIPPED' if 'skipped' in metrics else 'ERROR'}: {metrics.get('skipped') or metrics.get('error')}")
+            continue
+        print(f"{name:<22} ({elapsed:.1f}s)")
+        for metric, value in metrics.items():
+            print(f"    {metric:<44} {value}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the startup and hot-path benchmarks.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all).")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative regression.")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                        help="Absolute change below which a metric never counts as a regression.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline.")
+    args = parser.parse_args(argv)
+
+    results = run(args.only or list(BENCHMARKS))
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f).get("results", {})
+    regressions = find_regressions(results, baseline, args.tolerance, args.min_delta)
+    for name, metric, expected, value, change in regressions:
+        print(f"REGRESSION {name}.{metric}: {expected} -> {value} ({change:+.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class DeviceAdminStandIn(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the device-admin API: answers
+    GET /devices/<serial>/passcode with a fixed passcode payload over keep-alive HTTP/1.1.
+    """
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY each keep-alive
+    # response waits for the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "devices" and parts[2] == "passcode":
+            status, payload = 200, {"reported": "123456", "desired": "123456", "serial": parts[1]}
+        else:
+            status, payload = 404, {"message": "Not Found"}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CognitoStandIn(BaseHTTPRequestHandler):
+    """
+    Local stand-in for Cognito Identity's JSON API: answers GetId and
+    GetCredentialsForIdentity with fixed identities and credentials.
+    """
+    protocol_version = "HTTP/1.1"
+    # See DeviceAdminStandIn.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        operation = self.headers.get("X-Amz-Target", "").rsplit(".", 1)[-1]
+        request = json.loads(body or b"{}")
+        if operation == "GetId":
+            status, payload = 200, {"IdentityId": f"{request.get('IdentityPoolId', '').split(':')[0]}:identity"}
+        elif operation == "GetCredentialsForIdentity":
+            status, payload = 200, {"IdentityId": request.get("IdentityId"), "Credentials": {
+                "AccessKeyId": "ASIAEXAMPLE", "SecretKey": "secret", "SessionToken": "token", "Expiration": 1893456000.0,
+            }}
+        else:
+            status, payload = 400, {"__type": "UnknownOperationException", "message": operation}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """
+    Runs a stand-in handler on a random local port, optionally over TLS with a
+    throwaway self-signed certificate created with the `openssl` command.
+    """
+
+    def __init__(self, handler=DeviceAdminStandIn, use_tls=True):
+        """
+        Initializes the server. Call `start()` or use it as a context manager.
+
+        Args:
+            handler (BaseHTTPRequestHandler): Request handler class.
+            use_tls (bool): Serve HTTPS. Falls back to HTTP when `openssl` is unavailable.
+        """
+        self.handler = handler
+        self.use_tls = use_tls and shutil.which("openssl") is not None
+        self.cert_path = None
+        self._server = None
+        self._temp_dir = None
+
+    @property
+    def base_url(self):
+        scheme = "https" if self.use_tls else "http"
+        return f"{scheme}://localhost:{self._server.server_address[1]}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        if self.use_tls:
+            self._temp_dir = tempfile.mkdtemp()
+            self.cert_path = os.path.join(self._temp_dir, "cert.pem")
+            key_path = os.path.join(self._temp_dir, "key.pem")
+            subprocess.run(
+                ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                 "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+                 "-keyout", key_path, "-out", self.cert_path],
+                check=True, capture_output=True
+            )
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.cert_path, key_path)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
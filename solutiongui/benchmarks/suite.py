@@ -0,0 +1,405 @@
+"""
+Benchmarks for startup and the hot paths. Each benchmark returns a dict of metrics;
+names ending in `_per_s` are throughputs (higher is better), everything else is a
+latency in milliseconds or a size in MB (lower is better). A benchmark whose dependencies are not
+installed returns {"skipped": "<reason>"}.
+"""
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import fakes
+from benchmarks.standin import CognitoStandIn, StandInServer
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_optional(module_name, attribute, **fake_modules):
+    """
+    Imports `module_name.attribute`, returning (value, None) or (None, reason). Modules
+    in `fake_modules` stand in for missing dependencies during the import; anything the
+    module prints while importing is kept out of the benchmark output.
+    """
+    captured = io.StringIO()
+    try:
+        with fakes.fake_missing_modules(**fake_modules) as faked, \
+                contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+            module = __import__(module_name, fromlist=[attribute])
+        if faked:
+            logging.info(f"Benchmarking {module_name} with fake {', '.join(faked)}.")
+        return getattr(module, attribute), None
+    except ImportError as e:
+        return None, f"{module_name} unavailable: {e}"
+    except SystemExit:
+        output = captured.getvalue().strip().splitlines()
+        return None, f"{module_name} exited during import: {output[-1] if output else 'missing dependencies'}"
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+@contextlib.contextmanager
+def _display():
+    """
+    Yields the X display to draw windows on: $DISPLAY when set, otherwise a private Xvfb
+    server when one is installed, otherwise None.
+    """
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        yield os.environ.get("DISPLAY", "native")
+        return
+    if shutil.which("Xvfb") is None:
+        yield None
+        return
+    read_fd, write_fd = os.pipe()
+    server = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd), "-nolisten", "tcp"], pass_fds=(write_fd,),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    try:
+        with os.fdopen(read_fd) as display_number:
+            display = f":{display_number.readline().strip()}"
+        os.environ["DISPLAY"] = display
+        yield display
+    finally:
+        os.environ.pop("DISPLAY", None)
+        server.terminate()
+        server.wait(10)
+
+
+def bench_cold_start(runs=3):
+    """
+    Import cost of each startup module in a fresh interpreter, the time from process
+    start to a parsed command line for the headless passcode tool, and the time from
+    process start to the first drawn window. The window is drawn on $DISPLAY or, when
+    no display is set, on a private Xvfb server; without either it is not measured.
+    """
+    import startup_report
+
+    metrics = {}
+    for module in startup_report.DEFAULT_MODULES:
+        result = startup_report.measure_import(module)
+        if result["ok"]:
+            metrics[f"import.{module}_ms"] = result["total_ms"]
+
+    script = os.path.join(PACKAGE_DIR, "gui", "get_passcode_v2.py")
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, script, "--batch", "--help"], capture_output=True, cwd=PACKAGE_DIR)
+        if result.returncode != 0:
+            break
+        timings.append((time.perf_counter() - started) * 1000)
+    else:
+        metrics["passcode_cli_ms"] = round(statistics.median(timings), 1)
+
+    with _display() as display:
+        if display is not None:
+            windows = [startup_report.measure_first_window() for _ in range(runs)]
+            if all(window["ok"] for window in windows):
+                metrics["first_window_ms"] = round(statistics.median(window["first_window_ms"] for window in windows), 1)
+            else:
+                logging.warning(f"First window not measured: {next(w['error'] for w in windows if not w['ok'])}")
+    return metrics
+
+
+def bench_security_keys_list(sizes=(10, 100, 500), rounds=20):
+    """
+    Latency of `update_security_keys_list` for N connected keys, with one key
+    changing between ticks.
+    """
+    update_security_keys_list, reason = _import_optional(
+        "gui.gui_helpers", "update_security_keys_list", customtkinter=fakes.make_fake_customtkinter()
+    )
+    if update_security_keys_list is None:
+        return {"skipped": reason}
+
+    metrics = {}
+    for size in sizes:
+        textbox = fakes.FakeTextbox()
+        keys = [f"Amazon ZUKEY 2 HID #{index}" for index in range(size)]
+        timings = []
+        for round_index in range(rounds):
+            keys[round_index % size] = f"Amazon ZUKEY 2 HID #{size + round_index}"
+            started = time.perf_counter()
+            update_security_keys_list(textbox, list(keys))
+            timings.append((time.perf_counter() - started) * 1000)
+        metrics[f"update_{size}_keys_ms"] = round(statistics.median(timings), 3)
+    return metrics
+
+
+def bench_passcode_lookup(lookups=200, workers=8):
+    """
+    Passcode lookup throughput and latency through `get_passcode` against a local
+    device-admin stand-in.
+    """
+    passcode_module, reason = _import_optional(
+        "gui", "get_passcode_v2", requests_aws4auth=fakes.make_fake_requests_aws4auth()
+    )
+    if passcode_module is None:
+        return {"skipped": reason}
+
+    helper = fakes.FakeMidwayHelper()
+    region = passcode_module.Region.us_east_1
+    account = passcode_module.device_admin_lambda_accounts[region]
+    original_endpoint = account["endpoint"]
+    latencies = []
+
+    def lookup(index):
+        started = time.perf_counter()
+        _, data = passcode_module.get_passcode(f"G030PM{index:010d}", region.value, helper)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if "error" in data:
+            raise RuntimeError(data["error"])
+
+    with StandInServer(use_tls=False) as server:
+        account["endpoint"] = server.base_url
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lookup, range(lookups)))
+            elapsed = time.perf_counter() - started
+        finally:
+            account["endpoint"] = original_endpoint
+
+    return {
+        "lookups_per_s": round(lookups / elapsed, 1),
+        "lookup_p50_ms": round(statistics.median(latencies), 3),
+        "lookup_p95_ms": round(_percentile(latencies, 0.95), 3),
+    }
+
+
+def bench_context_acquisition(acquisitions=200, launch_delay=0.05):
+    """
+    Time to get a BrowserContext from the browser pool: the first (cold) acquisition
+    launches a browser, later ones reuse it.
+    """
+    import browser_pool
+
+    original_api = browser_pool.playwright_api
+    browser_pool.playwright_api = fakes.FakePlaywrightApi(launch_delay=launch_delay)
+
+    async def run():
+        pool = browser_pool.BrowserPool(size=1, max_contexts=4)
+        started = time.perf_counter()
+        context = await pool.acquire_context()
+        cold_ms = (time.perf_counter() - started) * 1000
+        await pool.release_context(context)
+
+        timings = []
+        for _ in range(acquisitions):
+            started = time.perf_counter()
+            context = await pool.acquire_context()
+            timings.append((time.perf_counter() - started) * 1000)
+            await pool.release_context(context)
+        await pool.close()
+        return cold_ms, timings
+
+    try:
+        cold_ms, timings = asyncio.run(run())
+    finally:
+        browser_pool.playwright_api = original_api
+    return {
+        "cold_acquire_ms": round(cold_ms, 3),
+        "warm_acquire_p50_ms": round(statistics.median(timings), 3),
+    }
+
+
+def _build_log_handlers(log_path):
+    # Mirrors the pipeline installed by logger.setup_logging, minus the terminal stream.
+    import queue
+    from logger import BoundedQueueHandler, BoundedQueueListener, SizeAndTimeRotatingFileHandler, LOG_FORMAT
+
+    file_handler = SizeAndTimeRotatingFileHandler(log_path)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.Queue(maxsize=10000)
+    listener = BoundedQueueListener(log_queue, file_handler)
+    listener.start()
+
+    def close():
+        listener.stop()
+        file_handler.close()
+
+    return [BoundedQueueHandler(log_queue, overflow="block", block_timeout=1.0)], close
+
+
+def bench_log_handler(records=20000):
+    """
+    Caller-side cost of a log call and overall record throughput of the log handlers.
+    """
+    temp_dir = tempfile.mkdtemp()
+    log = logging.getLogger("benchmarks.logging")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    handlers, close = _build_log_handlers(os.path.join(temp_dir, "link_opener.log"))
+    for handler in handlers:
+        log.addHandler(handler)
+    try:
+        started = time.perf_counter()
+        for index in range(records):
+            log.info("Detected new security key - Vendor ID: 0x1949, Product ID: 0x%04x", index & 0xFFFF)
+        caller_elapsed = time.perf_counter() - started
+        close()
+        total_elapsed = time.perf_counter() - started
+    finally:
+        for handler in handlers:
+            log.removeHandler(handler)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return {
+        "log_call_ms": round(caller_elapsed / records * 1000, 5),
+        "records_per_s": round(records / total_elapsed, 1),
+    }
+
+
+def bench_template_match(rounds=10):
+    """
+    On-screen button lookup on a synthetic 1920x1080 screenshot: the brute-force approach
+    (read the template from disk, match every display scale at full resolution) against
+    TemplateMatcher's cached coarse-to-fine search and its remembered-region search.
+    """
+    try:
+        import cv2
+        import numpy  # noqa: F401
+    except ImportError as e:
+        return {"skipped": f"numpy/opencv unavailable: {e}"}
+    from template_matcher import DEFAULT_SCALES, TemplateMatcher, to_gray
+
+    temp_dir = tempfile.mkdtemp()
+    template = fakes.make_button_template()
+    template_path = os.path.join(temp_dir, "manage_button.png")
+    cv2.imwrite(template_path, cv2.cvtColor(template, cv2.COLOR_RGB2BGR))
+    screens = [fakes.make_synthetic_screen(template, (200 + 97 * index, 150 + 61 * index), scale=1.25, seed=index)
+               for index in range(rounds)]
+
+    def brute_force(screen):
+        gray = to_gray(screen)
+        template_gray = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+        best = None
+        for scale in DEFAULT_SCALES:
+            scaled = cv2.resize(template_gray, None, fx=scale, fy=scale)
+            _, score, _, location = cv2.minMaxLoc(cv2.matchTemplate(gray, scaled, cv2.TM_CCOEFF_NORMED))
+            if best is None or score > best[0]:
+                best = (score, location)
+        return best
+
+    try:
+        brute_timings, coarse_timings, hinted_timings = [], [], []
+        matcher = TemplateMatcher(template_dir=temp_dir)
+        matcher.load("manage_button.png")
+        for screen in screens:
+            started = time.perf_counter()
+            brute_force(screen)
+            brute_timings.append((time.perf_counter() - started) * 1000)
+
+            matcher.forget_hint("manage_button.png")
+            started = time.perf_counter()
+            found = matcher.find("manage_button.png", screen)
+            coarse_timings.append((time.perf_counter() - started) * 1000)
+            if found is None:
+                raise RuntimeError("Template not found on the synthetic screenshot.")
+
+            started = time.perf_counter()
+            matcher.find("manage_button.png", screen)
+            hinted_timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return {
+        "brute_force_ms": round(statistics.median(brute_timings), 3),
+        "coarse_to_fine_ms": round(statistics.median(coarse_timings), 3),
+        "hinted_ms": round(statistics.median(hinted_timings), 3),
+    }
+
+
+# Runs `prelude`, then prints the time taken by `setup` and the resident memory of the process in KB: VmRSS
+# on Linux (ru_maxrss survives exec there, so it would report the benchmark process),
+# the peak RSS on macOS, None on Windows.
+_FOOTPRINT_SNIPPET = """
+import json, sys, time
+exec(sys.argv[1])
+started = time.perf_counter()
+exec(sys.argv[2])
+elapsed = time.perf_counter() - started
+rss_kb = None
+try:
+    with open("/proc/self/status") as status:
+        rss_kb = next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+except OSError:
+    try:
+        import resource
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        pass
+print(json.dumps({"ms": elapsed * 1000, "rss_kb": rss_kb}))
+"""
+
+
+def _footprint(setup, prelude="pass", runs=3):
+    """
+    Runs `setup` after `prelude` in fresh interpreters and returns the median
+    (ms taken by `setup`, RSS in KB).
+    """
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", _FOOTPRINT_SNIPPET, prelude, setup],
+                                capture_output=True, text=True, cwd=PACKAGE_DIR, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    sizes = [sample["rss_kb"] for sample in samples]
+    return statistics.median(sample["ms"] for sample in samples), None if None in sizes else statistics.median(sizes)
+
+
+def bench_cognito_client(calls=50):
+    """
+    Cost of creating a Cognito Identity client in a fresh interpreter that has already
+    imported requests (as the passcode window has), built-in client against boto3's:
+    import time and resident memory on top of that interpreter. Also the GetId +
+    GetCredentialsForIdentity round trip of the built-in client against a local stand-in.
+    """
+    try:
+        import requests
+    except ImportError as e:
+        return {"skipped": f"requests unavailable: {e}"}
+    from cognito_client import CognitoIdentityClient, boto3_available
+
+    candidates = {"builtin": "import cognito_client; cognito_client.CognitoIdentityClient('us-east-1')"}
+    if boto3_available():
+        candidates["boto3"] = "import boto3; boto3.session.Session().client('cognito-identity', region_name='us-east-1')"
+    _, bare_kb = _footprint("pass", prelude="import requests")
+    metrics = {}
+    for name, setup in candidates.items():
+        elapsed_ms, rss_kb = _footprint(setup, prelude="import requests")
+        metrics[f"{name}.create_ms"] = round(elapsed_ms, 1)
+        if rss_kb is not None and bare_kb is not None:
+            metrics[f"{name}.rss_mb"] = round((rss_kb - bare_kb) / 1024, 1)
+
+    with StandInServer(handler=CognitoStandIn, use_tls=False) as server:
+        client = CognitoIdentityClient("us-east-1", session=requests.Session(), endpoint=server.base_url + "/")
+        logins = {"midway-auth.amazon.com": "jwt"}
+        timings = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            identity = client.get_id(AccountId="123456789012", IdentityPoolId="us-east-1:pool", Logins=logins)
+            client.get_credentials_for_identity(IdentityId=identity["IdentityId"], Logins=logins)
+            timings.append((time.perf_counter() - started) * 1000)
+    metrics["builtin.round_trip_ms"] = round(statistics.median(timings), 3)
+    return metrics
+
+
+BENCHMARKS = {
+    "cold_start": bench_cold_start,
+    "security_keys_list": bench_security_keys_list,
+    "passcode_lookup": bench_passcode_lookup,
+    "context_acquisition": bench_context_acquisition,
+    "log_handler": bench_log_handler,
+    "template_match": bench_template_match,
+    "cognito_client": bench_cognito_client,
+}
@@ -0,0 +1,362 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from lazy_import import lazy_import
+from config_store import get_config_store
+from timing import span
+
+playwright_api = lazy_import("playwright.async_api")
+
+BROWSER_TYPES = ("chromium", "firefox")
+
+
+def browser_settings(browser_type=None, headless=None):
+    """
+    Returns the browser type and headless flag to launch with. Arguments that are None
+    fall back to the values saved in the settings window.
+
+    Args:
+        browser_type (str): "chromium" or "firefox" (optional).
+        headless (bool): Whether to run headless (optional).
+
+    Returns:
+        tuple: (browser_type, headless)
+    """
+    store = get_config_store()
+    browser_type = browser_type or store.get("browser_type")
+    if browser_type not in BROWSER_TYPES:
+        logging.warning(f"Unsupported browser type '{browser_type}'; using chromium.")
+        browser_type = "chromium"
+    if headless is None:
+        headless = bool(store.get("headless_mode"))
+    return browser_type, headless
+
+
+def launch_options(browser_type="chromium", headless=False, channel="chrome", args=None):
+    """
+    Builds the keyword arguments for `<browser_type>.launch()`. The Chrome channel only
+    applies to Chromium, and `--start-maximized` only to a visible Chromium window.
+
+    Args:
+        browser_type (str): "chromium" or "firefox".
+        headless (bool): Whether to run headless.
+        channel (str): Chromium channel (ignored for Firefox).
+        args (list): Extra command line arguments (default: maximize visible Chromium windows).
+
+    Returns:
+        dict: Launch keyword arguments.
+    """
+    options = {"headless": headless}
+    if browser_type == "chromium":
+        if channel:
+            options["channel"] = channel
+        if args is None:
+            args = [] if headless else ["--start-maximized"]
+    if args:
+        options["args"] = args
+    return options
+
+
+class PoolMetrics:
+    """
+    Counters describing how the browser pool served its callers.
+    """
+
+    def __init__(self):
+        self.warm_hits = 0
+        self.cold_launches = 0
+        self.contexts_created = 0
+        self.contexts_recycled = 0
+        self.acquire_wait_seconds = 0.0
+
+    def as_dict(self):
+        """
+        Returns the metrics as a plain dictionary.
+
+        Returns:
+            dict: Snapshot of the pool counters.
+        """
+        return {
+            "warm_hits": self.warm_hits,
+            "cold_launches": self.cold_launches,
+            "contexts_created": self.contexts_created,
+            "contexts_recycled": self.contexts_recycled,
+            "acquire_wait_seconds": round(self.acquire_wait_seconds, 4),
+        }
+
+
+class BrowserPool:
+    """
+    Keeps one Playwright driver and a fixed number of launched browsers alive,
+    handing out fresh BrowserContexts so that a click costs a context creation
+    instead of a browser process launch.
+    """
+
+    def __init__(self, size=1, max_contexts=4, channel="chrome", headless=False, args=None, browser_type="chromium"):
+        """
+        Initializes the pool. Browsers are launched lazily on first acquire or by `start()`.
+
+        Args:
+            size (int): Number of browsers to keep launched.
+            max_contexts (int): Maximum number of contexts handed out at the same time.
+            channel (str): Browser channel to use for Chromium (default: Chrome).
+            headless (bool): Whether to run the browsers in headless mode.
+            args (list): Extra command line arguments (default: see `launch_options`).
+            browser_type (str): "chromium" or "firefox".
+        """
+        self.size = max(1, size)
+        self.max_contexts = max(1, max_contexts)
+        self.channel = channel
+        self.headless = headless
+        self.args = args
+        self.browser_type = browser_type
+        self.metrics = PoolMetrics()
+        self.loop = None
+        self._playwright = None
+        self._browsers = [None] * self.size
+        self._round_robin = itertools.cycle(range(self.size))
+        self._semaphore = None
+        self._launch_lock = None
+        self._owners = {}
+        self._closed = False
+        self._retiring = False
+
+    async def start(self):
+        """
+        Starts the Playwright driver and pre-launches every browser in the pool.
+        """
+        self._bind_loop()
+        for index in range(self.size):
+            await self._get_browser(index)
+        logging.info(f"Browser pool warmed with {self.size} browser(s).")
+
+    def _bind_loop(self):
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+            self._launch_lock = asyncio.Lock()
+
+    async def _get_browser(self, index):
+        """
+        Returns (browser, launched): the pooled browser at `index`, launching it if needed.
+        """
+        async with self._launch_lock:
+            browser = self._browsers[index]
+            if browser is not None and browser.is_connected():
+                return browser, False
+
+            if self._playwright is None:
+                self._playwright = await playwright_api.async_playwright().start()
+            browser_launcher = getattr(self._playwright, self.browser_type)
+            with span("browser.launch"):
+                browser = await browser_launcher.launch(
+                    **launch_options(self.browser_type, self.headless, self.channel, self.args)
+                )
+            self._browsers[index] = browser
+            self.metrics.cold_launches += 1
+            logging.info(
+                f"Browser pool launched {self.browser_type} browser {index} "
+                f"(channel={self.channel}, headless={self.headless})."
+            )
+            return browser, True
+
+    async def acquire_context(self, **context_options):
+        """
+        Hands out a fresh BrowserContext from one of the pooled browsers.
+
+        Args:
+            **context_options: Keyword arguments passed to `browser.new_context()`.
+
+        Returns:
+            BrowserContext: A new context. Return it with `release_context()`.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed.")
+        self._bind_loop()
+
+        wait_started = time.perf_counter()
+        await self._semaphore.acquire()
+        self.metrics.acquire_wait_seconds += time.perf_counter() - wait_started
+
+        try:
+            index = next(self._round_robin)
+            browser, launched = await self._get_browser(index)
+            context = await browser.new_context(**context_options)
+        except Exception:
+            self._semaphore.release()
+            raise
+
+        if not launched:
+            self.metrics.warm_hits += 1
+        self._owners[id(context)] = index
+        _context_pools[id(context)] = self
+        self.metrics.contexts_created += 1
+        return context
+
+    async def release_context(self, context):
+        """
+        Closes a context handed out by the pool and frees its slot.
+
+        Args:
+            context (BrowserContext): The context returned by `acquire_context()`.
+        """
+        if self._owners.pop(id(context), None) is None:
+            return
+        _context_pools.pop(id(context), None)
+        try:
+            await context.close()
+        except Exception:
+            logging.exception("Failed to close pooled browser context.")
+        finally:
+            self.metrics.contexts_recycled += 1
+            self._semaphore.release()
+        if self._retiring and not self._owners:
+            self._retiring = False
+            await self.close()
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """
+        Async context manager wrapping `acquire_context()` and `release_context()`.
+
+        Args:
+            **context_options: Keyword arguments passed to `browser.new_context()`.
+        """
+        context = await self.acquire_context(**context_options)
+        try:
+            yield context
+        finally:
+            await self.release_context(context)
+
+    async def retire(self):
+        """
+        Stops handing out contexts and closes the pool once every context still checked
+        out has been released, so pages in use are not closed under their callers.
+        """
+        self._closed = True
+        if self._owners:
+            self._retiring = True
+            logging.info(f"Browser pool retiring; {len(self._owners)} context(s) still in use.")
+        else:
+            await self.close()
+
+    async def close(self):
+        """
+        Closes every pooled browser and stops the Playwright driver.
+        """
+        self._closed = True
+        self._retiring = False
+        for index, browser in enumerate(self._browsers):
+            if browser is None:
+                continue
+            try:
+                await browser.close()
+            except Exception:
+                logging.exception(f"Failed to close pooled browser {index}.")
+            self._browsers[index] = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        logging.info(f"Browser pool closed. Metrics: {self.metrics.as_dict()}")
+
+
+_shared_pool = None
+# id(context) -> pool that handed the context out, so a context is released to its own
+# pool even after the shared pool has been replaced.
+_context_pools = {}
+# Retire tasks of replaced pools; the event loop only keeps weak references to tasks.
+_retire_tasks = set()
+
+
+def pool_size_settings(size=None, max_contexts=None):
+    """
+    Returns the pool size and context limit to use. Arguments that are None fall back to
+    the saved settings.
+
+    Returns:
+        tuple: (size, max_contexts)
+    """
+    store = get_config_store()
+    size = size or store.get("browser_pool_size")
+    max_contexts = max_contexts or store.get("browser_pool_max_contexts")
+    return max(1, int(size)), max(1, int(max_contexts))
+
+
+def get_browser_pool(size=None, max_contexts=None):
+    """
+    Returns the shared browser pool for the running event loop, creating it if needed.
+
+    Playwright objects are bound to the loop that created them, so a pool created
+    on a different loop is replaced and retired on its own loop. The pool is also
+    replaced when the browser type, headless or pool size settings have changed. A
+    replaced pool closes once its contexts have been released.
+
+    Args:
+        size (int): Number of browsers to keep launched (default: the saved setting).
+        max_contexts (int): Maximum concurrent contexts (default: the saved setting).
+
+    Returns:
+        BrowserPool: The shared pool.
+    """
+    global _shared_pool
+    loop = asyncio.get_running_loop()
+    browser_type, headless = browser_settings()
+    size, max_contexts = pool_size_settings(size, max_contexts)
+    settings = (browser_type, headless, size, max_contexts)
+    if _shared_pool is not None and not _shared_pool._closed:
+        if _shared_pool.loop is not None and _shared_pool.loop is not loop:
+            logging.info("Browser pool belongs to another event loop; replacing it.")
+            _retire_on_own_loop(_shared_pool)
+            _shared_pool = None
+        elif (_shared_pool.browser_type, _shared_pool.headless, _shared_pool.size,
+              _shared_pool.max_contexts) != settings:
+            logging.info(f"Browser settings changed to {browser_type} (headless={headless}, size={size}, "
+                         f"max_contexts={max_contexts}); replacing the browser pool.")
+            task = loop.create_task(_shared_pool.retire())
+            _retire_tasks.add(task)
+            task.add_done_callback(_retire_tasks.discard)
+            _shared_pool = None
+    if _shared_pool is None or _shared_pool._closed:
+        _shared_pool = BrowserPool(size=size, max_contexts=max_contexts, headless=headless, browser_type=browser_type)
+    return _shared_pool
+
+
+def _retire_on_own_loop(pool):
+    """
+    Retires a pool from outside the loop it is bound to. If that loop has already stopped,
+    its browsers and driver can no longer be closed cleanly, and a warning is logged.
+    """
+    if pool.loop.is_closed() or not pool.loop.is_running():
+        logging.warning("Browser pool's event loop has stopped; its browsers could not be closed.")
+        return
+    asyncio.run_coroutine_threadsafe(pool.retire(), pool.loop)
+
+
+async def release_pooled_context(context):
+    """
+    Returns a context to the pool that handed it out.
+
+    Args:
+        context (BrowserContext): A context from `BrowserPool.acquire_context()`.
+    """
+    pool = _context_pools.get(id(context))
+    if pool is None:
+        logging.warning("Released a browser context that no pool handed out; closing it.")
+        try:
+            await context.close()
+        except Exception:
+            logging.exception("Failed to close browser context.")
+        return
+    await pool.release_context(context)
+
+
+async def close_browser_pool():
+    """
+    Closes the shared browser pool if one exists.
+    """
+    global _shared_pool
+    if _shared_pool is not None:
+        await _shared_pool.close()
+        _shared_pool = None
@@ -0,0 +1,189 @@
+"""
+Minimal Cognito Identity client for the two calls the passcode lookup needs.
+
+`GetId` and `GetCredentialsForIdentity` with a Midway login are public operations of
+Cognito Identity: they take no SigV4 signature, only a JSON body and an `X-Amz-Target`
+header. Making them directly over a pooled `requests` session avoids importing boto3,
+which costs hundreds of milliseconds and tens of MB on first use.
+
+`CognitoIdentityClient` takes and returns the same keyword arguments and response
+shapes as boto3's "cognito-identity" client. If Cognito answers with something that is
+not a JSON service response, the client switches to boto3 (when installed) for the
+rest of its lifetime. Set SOLUTIONGUI_COGNITO_CLIENT=boto3 to always use boto3.
+
+Like boto3's standard retry mode, calls are retried with jittered backoff on connection
+errors, HTTP 5xx and Cognito's throttling and internal error codes.
+"""
+import datetime
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+
+import requests
+
+from retry_policy import RETRYABLE_ERROR_CODES, RetryPolicy, call_with_retry, is_retryable
+
+SERVICE_TARGET_PREFIX = "AWSCognitoIdentityService"
+CONTENT_TYPE = "application/x-amz-json-1.1"
+DEFAULT_TIMEOUT = 10
+
+
+class CognitoError(Exception):
+    """
+    Error response from Cognito Identity, e.g. NotAuthorizedException.
+
+    Attributes:
+        code (str): Error type without namespace.
+        response: HTTP response (has `status_code`).
+    """
+
+    def __init__(self, code, message, response=None):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.response = response
+
+
+class CognitoProtocolError(Exception):
+    """
+    Raised when a response cannot be understood as a Cognito Identity JSON response.
+
+    Attributes:
+        response: HTTP response (has `status_code`).
+    """
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+
+def cognito_endpoint(region_name):
+    return f"https://cognito-identity.{region_name}.amazonaws.com/"
+
+
+def boto3_available():
+    return importlib.util.find_spec("boto3") is not None
+
+
+def is_retryable_cognito_error(exception):
+    """
+    Returns True for failures worth retrying: those `retry_policy.is_retryable` accepts,
+    plus Cognito's throttling and internal errors, which may come with HTTP 400.
+    """
+    if isinstance(exception, CognitoError) and exception.code in RETRYABLE_ERROR_CODES:
+        return True
+    return is_retryable(exception)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=0.2, max_delay=2.0, deadline=20.0,
+                                   retryable=is_retryable_cognito_error)
+
+
+def _error_code(response, body):
+    code = body.get("__type") or response.headers.get("x-amzn-ErrorType") or "UnknownError"
+    # "com.amazonaws.cognito.identity.model#NotAuthorizedException" or "Code:http://..."
+    return code.split("#")[-1].split(":")[0]
+
+
+class CognitoIdentityClient:
+    """
+    Unsigned JSON client for Cognito Identity's GetId and GetCredentialsForIdentity.
+    """
+
+    def __init__(self, region_name, session=None, endpoint=None, timeout=DEFAULT_TIMEOUT, fallback=True,
+                 retry_policy=DEFAULT_RETRY_POLICY):
+        """
+        Initializes the client.
+
+        Args:
+            region_name (str): AWS region, e.g. "us-east-1".
+            session (requests.Session): Pooled session (default: a new requests session).
+            endpoint (str): Endpoint URL (default: the public regional endpoint).
+            timeout (float): Request timeout in seconds.
+            fallback (bool): Switch to boto3 after a response that is not valid JSON.
+            retry_policy (RetryPolicy): How transient failures are retried (None to never retry).
+        """
+        self.region_name = region_name
+        self.endpoint = endpoint or cognito_endpoint(region_name)
+        self.timeout = timeout
+        self.fallback = fallback
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+        if session is None:
+            session = requests.Session()
+        self.session = session
+        self._boto3_client = None
+        self._lock = threading.Lock()
+
+    def get_id(self, AccountId, IdentityPoolId, Logins):
+        """
+        Returns {"IdentityId": ...} for the login.
+        """
+        payload = {"AccountId": AccountId, "IdentityPoolId": IdentityPoolId, "Logins": Logins}
+        return self._call("GetId", "get_id", payload)
+
+    def get_credentials_for_identity(self, IdentityId, Logins):
+        """
+        Returns {"IdentityId": ..., "Credentials": {...}} with temporary credentials. As
+        with boto3, `Credentials["Expiration"]` is a timezone-aware datetime.
+        """
+        payload = {"IdentityId": IdentityId, "Logins": Logins}
+        response = self._call("GetCredentialsForIdentity", "get_credentials_for_identity", payload)
+        credentials = response.get("Credentials", {})
+        if isinstance(credentials.get("Expiration"), (int, float)):
+            credentials["Expiration"] = datetime.datetime.fromtimestamp(credentials["Expiration"], datetime.timezone.utc)
+        return response
+
+    def _call(self, operation, boto3_method, payload):
+        if self._boto3_client is not None:
+            return getattr(self._boto3_client, boto3_method)(**payload)
+        try:
+            return call_with_retry(lambda: self._post(operation, payload), self.retry_policy)
+        except CognitoProtocolError as e:
+            if not self.fallback or not boto3_available():
+                raise
+            logging.warning(f"Cognito {operation} returned an unexpected response ({e}); using boto3 instead.")
+            return getattr(self._get_boto3_client(), boto3_method)(**payload)
+
+    def _post(self, operation, payload):
+        response = self.session.post(
+            self.endpoint,
+            data=json.dumps(payload),
+            headers={"Content-Type": CONTENT_TYPE, "X-Amz-Target": f"{SERVICE_TARGET_PREFIX}.{operation}"},
+            timeout=self.timeout,
+        )
+        if not response.content and response.status_code < 400:
+            raise CognitoProtocolError(f"HTTP {response.status_code}, empty body", response)
+        try:
+            body = response.json() if response.content else {}
+        except ValueError:
+            raise CognitoProtocolError(f"HTTP {response.status_code}, body is not JSON", response)
+        if not isinstance(body, dict):
+            raise CognitoProtocolError(f"HTTP {response.status_code}, body is not a JSON object", response)
+        if response.status_code >= 400:
+            message = body.get("message") or body.get("Message") or f"HTTP {response.status_code}"
+            raise CognitoError(_error_code(response, body), message, response)
+        return body
+
+    def _get_boto3_client(self):
+        with self._lock:
+            if self._boto3_client is None:
+                boto3 = importlib.import_module("boto3")
+                self._boto3_client = boto3.session.Session().client("cognito-identity", region_name=self.region_name)
+            return self._boto3_client
+
+
+def create_cognito_client(region_name, session=None):
+    """
+    Returns a Cognito Identity client for the region: the built-in client, or boto3's when
+    SOLUTIONGUI_COGNITO_CLIENT=boto3.
+
+    Args:
+        region_name (str): AWS region.
+        session (requests.Session): Pooled session for the built-in client.
+    """
+    if os.environ.get("SOLUTIONGUI_COGNITO_CLIENT") == "boto3":
+        boto3 = importlib.import_module("boto3")
+        return boto3.session.Session().client("cognito-identity", region_name=region_name)
+    return CognitoIdentityClient(region_name, session=session)
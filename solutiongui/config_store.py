@@ -0,0 +1,280 @@
+"""
+Single owner of gui_config.json. Settings are served from memory; writes are debounced
+and persisted atomically (temporary file, then rename), merging with whatever another
+writer saved in the meantime so that neither side's keys are lost. Changes made to the
+file outside the app are picked up through its modification time.
+"""
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from config import CONFIG_FILE
+
+# Setting name -> (type, default). Keys on disk that are not listed here are preserved.
+SCHEMA = {
+    "geometry": (str, None),
+    "appearance_mode": (str, "dark"),
+    "vpn_url": (str, ""),
+    "browser_type": (str, "chromium"),
+    "headless_mode": (bool, False),
+    "browser_pool_size": (int, 1),
+    "browser_pool_max_contexts": (int, 4),
+    "route_profiles": (dict, None),
+    "timing_enabled": (bool, False),
+    "event_log_enabled": (bool, False),
+}
+
+
+class ConfigStore:
+    """
+    In-memory view of a JSON config file with debounced, atomic write-behind.
+    """
+
+    def __init__(self, path=CONFIG_FILE, schema=SCHEMA, debounce_seconds=0.5, mtime_check_interval=1.0,
+                 clock=time.monotonic):
+        """
+        Loads the file (if present) into memory.
+
+        Args:
+            path (str): JSON config file.
+            schema (dict): Setting name -> (type, default).
+            debounce_seconds (float): Delay between the last change and the write.
+            mtime_check_interval (float): Minimum seconds between checks for external edits.
+            clock (function): Monotonic time source.
+        """
+        self.path = path
+        self.schema = schema
+        self.debounce_seconds = debounce_seconds
+        self.mtime_check_interval = mtime_check_interval
+        self.clock = clock
+        self.writes = 0
+        self._values = {}
+        self._dirty = set()
+        self._mtime = None
+        self._next_mtime_check = 0.0
+        self._timer = None
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._values = self._read_file()
+
+    def _read_file(self):
+        try:
+            self._mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._mtime = None
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("top-level value is not an object")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to load {self.path}: {e}")
+            return {}
+        values = {}
+        for key, value in data.items():
+            try:
+                values[key] = self._validate(key, value)
+            except ValueError as e:
+                logging.warning(f"Ignoring {key} from {self.path}: {e}")
+        return values
+
+    def _validate(self, key, value):
+        if key not in self.schema or value is None:
+            return value
+        expected_type = self.schema[key][0]
+        if not isinstance(value, expected_type):
+            raise ValueError(f"expected {expected_type.__name__}, got {type(value).__name__}")
+        return value
+
+    def _check_external_change(self):
+        now = self.clock()
+        if now < self._next_mtime_check:
+            return
+        self._next_mtime_check = now + self.mtime_check_interval
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self.reload()
+
+    def get(self, key, default=None):
+        """
+        Returns a setting, falling back to the schema default.
+
+        Args:
+            key (str): Setting name.
+            default: Returned if the setting is unset and has no schema default.
+        """
+        with self._lock:
+            self._check_external_change()
+            if key in self._values:
+                return self._values[key]
+        if key in self.schema:
+            return self.schema[key][1]
+        return default
+
+    def all(self):
+        """
+        Returns all settings (schema defaults filled in) as a new dict.
+        """
+        with self._lock:
+            self._check_external_change()
+            settings = {key: default for key, (_, default) in self.schema.items()}
+            settings.update(self._values)
+            return settings
+
+    def _effective(self, key):
+        if key in self._values:
+            return self._values[key]
+        return self.schema[key][1] if key in self.schema else None
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, changes):
+        """
+        Changes settings in memory and schedules a debounced write.
+
+        Args:
+            changes (dict): Setting name -> new value.
+
+        Raises:
+            ValueError: If a value does not match the schema type.
+        """
+        validated = {key: self._validate(key, value) for key, value in changes.items()}
+        with self._lock:
+            changed = {key: value for key, value in validated.items() if self._effective(key) != value}
+            if not changed:
+                return
+            self._values.update(changed)
+            self._dirty.update(changed)
+            self._schedule_flush()
+        self._notify(changed)
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.debounce_seconds, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """
+        Writes pending changes now. The file is re-read first so keys written by another
+        process or store since the last load are kept. Readers are not blocked by the disk I/O.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                pending = {key: self._values[key] for key in self._dirty if key in self._values}
+
+            on_disk = self._read_file()
+            merged = dict(on_disk)
+            merged.update(pending)
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.path)}.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(merged, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+                mtime = os.stat(self.path).st_mtime_ns
+            except Exception:
+                logging.exception(f"Failed to write {self.path}.")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                return
+
+            with self._lock:
+                self._mtime = mtime
+                self.writes += 1
+                # Keys changed again while writing stay dirty for the next flush.
+                for key, value in pending.items():
+                    if self._values.get(key) == value:
+                        self._dirty.discard(key)
+                external = {key: value for key, value in on_disk.items()
+                            if key not in self._dirty and self._values.get(key) != value}
+                self._values.update(external)
+        if external:
+            self._notify(external)
+
+    def reload(self):
+        """
+        Re-reads the file, keeping unsaved changes, and notifies subscribers of external edits.
+        """
+        with self._lock:
+            on_disk = self._read_file()
+            merged = dict(on_disk)
+            merged.update({key: self._values[key] for key in self._dirty if key in self._values})
+            changed = {key: merged.get(key) for key in set(merged) | set(self._values)
+                       if merged.get(key) != self._values.get(key)}
+            self._values = merged
+        if changed:
+            logging.info(f"{self.path} changed on disk: {', '.join(sorted(changed))}")
+            self._notify(changed)
+
+    def subscribe(self, callback, keys=None):
+        """
+        Registers `callback(changes)` for setting changes, where `changes` maps names to new
+        values. It runs on the thread that made the change.
+
+        Args:
+            callback (function): Called with the changed settings.
+            keys (iterable): Only notify for these settings (default: all).
+
+        Returns:
+            function: Call it to unsubscribe.
+        """
+        entry = (callback, frozenset(keys) if keys is not None else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+
+    def _notify(self, changes):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, keys in subscribers:
+            relevant = changes if keys is None else {key: value for key, value in changes.items() if key in keys}
+            if not relevant:
+                continue
+            try:
+                callback(relevant)
+            except Exception:
+                logging.exception("Config subscriber failed.")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_config_store():
+    """
+    Returns the shared store for CONFIG_FILE; pending changes are written at exit.
+
+    Returns:
+        ConfigStore: The shared store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConfigStore()
+            atexit.register(_store.flush)
+        return _store
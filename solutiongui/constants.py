@@ -9,6 +9,6 @@ KNOWN_SECURITY_KEYS = [
     {'name': 'YubiKey 5 NFC', 'idVendor': 0x1050, 'idProduct': 0x0407},
     {'name': 'Google Titan Security Key', 'idVendor': 0x18d1, 'idProduct': 0x5020},
     {'name': 'Feitian ePass', 'idVendor': 0x1040, 'idProduct': 0x0856},
-    {'name': 'ZUKEY 2 HID', 'idVendor': 0x18d1, 'idProduct': 0x0000},
-    # Add more known keys as needed
+    {'name': 'Amazon ZUKEY 2 HID', 'idVendor': 0x1949, 'idProduct': 0x0429},
+    # Add more known keys as needed, or list them in security_keys.json (see key_registry.py)
 ] 
\ No newline at end of file
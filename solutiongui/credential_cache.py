@@ -0,0 +1,118 @@
+import datetime
+import logging
+import threading
+import time
+
+
+class CredentialCache:
+    """
+    Caches temporary AWS credentials per key (for example (account, identity pool))
+    until shortly before they expire, refreshing them in the background so that
+    callers keep getting valid credentials without waiting on Cognito.
+    """
+
+    def __init__(self, refresh_margin_seconds=300, default_ttl_seconds=3600):
+        """
+        Initializes the cache.
+
+        Args:
+            refresh_margin_seconds (int): Start a background refresh this many seconds before expiry.
+            default_ttl_seconds (int): Lifetime assumed when the issuer returns no expiration.
+        """
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._refreshing = set()
+
+    def get(self, key, issue):
+        """
+        Returns cached credentials for `key`, issuing new ones when missing or expired.
+
+        Args:
+            key (tuple): Cache key, e.g. (aws_account_id, identity_pool_id).
+            issue (function): Called without arguments to obtain fresh credentials.
+                Must return (access_key_id, secret_key, session_token, expiration), where
+                expiration is a datetime, an epoch timestamp or None.
+
+        Returns:
+            tuple: (access_key_id, secret_key, session_token)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            credentials, expires_at = entry
+            if now < expires_at - self.refresh_margin_seconds:
+                self.hits += 1
+                return credentials
+            if now < expires_at:
+                self.hits += 1
+                self._refresh_in_background(key, issue)
+                return credentials
+
+        self.misses += 1
+        return self._refresh(key, issue)
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _refresh(self, key, issue):
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and time.time() < entry[1] - self.refresh_margin_seconds:
+                return entry[0]
+
+            access_key_id, secret_key, session_token, expiration = issue()
+            credentials = (access_key_id, secret_key, session_token)
+            expires_at = self._to_epoch(expiration)
+            with self._lock:
+                self._entries[key] = (credentials, expires_at)
+            self.refreshes += 1
+            logging.info(f"Issued credentials for {key} valid until {time.ctime(expires_at)}.")
+            return credentials
+
+    def _refresh_in_background(self, key, issue):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._refresh(key, issue)
+            except Exception as e:
+                logging.warning(f"Background credential refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _to_epoch(self, expiration):
+        if isinstance(expiration, datetime.datetime):
+            if expiration.tzinfo is None:
+                expiration = expiration.replace(tzinfo=datetime.timezone.utc)
+            return expiration.timestamp()
+        if isinstance(expiration, (int, float)):
+            return float(expiration)
+        return time.time() + self.default_ttl_seconds
+
+    def invalidate(self, key=None):
+        """
+        Drops cached credentials for one key, or for every key when `key` is None.
+
+        Args:
+            key (tuple): Cache key to drop (optional).
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -1,9 +1,301 @@
-import usb.core
-import usb.util
 import logging
-from constants import KNOWN_SECURITY_KEYS
-import hid  # 'hid' from pyhidapi
+import os
+import queue
+import selectors
+import sys
+import threading
+import time
+from collections import namedtuple
+from key_registry import get_key_registry
+from event_log import emit_event
+from lazy_import import lazy_import
 
-# Remove monitoring functions if they are now handled in Core.py
-# def detect_security_keys():
-    # ... existing code ... 
\ No newline at end of file
+# USB/HID bindings load on first enumeration rather than at application startup.
+usb_core = lazy_import("usb.core")
+usb_util = lazy_import("usb.util")
+hid = lazy_import("hid")  # 'hid' from pyhidapi
+pyudev = lazy_import("pyudev")
+
+# kind is "added" or "removed"; device is the hid.enumerate() dict; name is the known key name.
+DeviceEvent = namedtuple("DeviceEvent", ["kind", "device", "name", "timestamp"])
+
+
+def match_known_key(device):
+    """
+    Returns the name of the known security key matching an enumerated HID device.
+
+    Args:
+        device (dict): Device descriptor as returned by `hid.enumerate()`.
+
+    Returns:
+        str: The key name, or None if the device is not a known security key.
+    """
+    return get_key_registry().lookup(device)
+
+
+class HidPollingBackend:
+    """
+    Enumerates HID devices through hidapi. It has no change notifications, so the
+    monitor polls it at an adaptive interval; plug-in latency is at most the monitor's
+    `max_interval` plus the debounce time.
+    """
+    supports_notifications = False
+
+    def enumerate(self):
+        return hid.enumerate()
+
+    def wake(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class UdevBackend(HidPollingBackend):
+    """
+    Enumerates through hidapi but blocks on udev netlink events for the hidraw
+    subsystem, so an idle monitor does not wake up to poll.
+    """
+    supports_notifications = True
+
+    def __init__(self):
+        context = pyudev.Context()
+        self.monitor = pyudev.Monitor.from_netlink(context)
+        self.monitor.filter_by(subsystem="hidraw")
+        self.monitor.start()
+        # A self-pipe lets `wake()` interrupt a blocked wait when the monitor stops.
+        self._wake_read, self._wake_write = os.pipe()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.monitor.fileno(), selectors.EVENT_READ)
+        self._selector.register(self._wake_read, selectors.EVENT_READ)
+
+    def wait_for_change(self, timeout):
+        """
+        Blocks until a hidraw device is added or removed, the timeout expires or `wake()` is called.
+
+        Args:
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            bool: True if a udev event arrived.
+        """
+        ready = [key.fileobj for key, _ in self._selector.select(timeout)]
+        if self._wake_read in ready:
+            os.read(self._wake_read, 64)
+        changed = False
+        # Drain events that arrived together so one burst causes one enumeration.
+        while self.monitor.poll(timeout=0) is not None:
+            changed = True
+        return changed
+
+    def wake(self):
+        os.write(self._wake_write, b"\0")
+
+    def close(self):
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+
+def default_backend():
+    """
+    Returns the udev backend on Linux when pyudev is available (it is listed in
+    requirements.txt for Linux), otherwise hidapi polling.
+
+    Returns:
+        HidPollingBackend: The enumeration backend.
+    """
+    try:
+        return UdevBackend()
+    except Exception as e:
+        # udev is expected on Linux; elsewhere polling is the normal mode.
+        log = logging.warning if sys.platform.startswith("linux") else logging.info
+        log(f"OS device notifications unavailable ({e}); polling HID devices instead.")
+        return HidPollingBackend()
+
+
+class SecurityKeyMonitor:
+    """
+    Watches for security keys being plugged in or removed and publishes DeviceEvents
+    on a queue. Enumeration results are diffed by device path and debounced, so a
+    flapping device produces no events until it has been stable for `debounce_seconds`.
+    """
+
+    def __init__(self, backend=None, events=None, matcher=match_known_key, debounce_seconds=0.05,
+                 min_interval=0.1, max_interval=0.5, idle_timeout=5.0, clock=time.monotonic,
+                 descriptor_cache=None):
+        """
+        Initializes the monitor. Call `start()` to run it on a background thread.
+
+        Args:
+            backend: Enumeration backend (default: `default_backend()`).
+            events (queue.Queue): Queue receiving DeviceEvents (default: a new queue).
+            matcher (function): Returns a key name for security keys, None for other devices.
+            debounce_seconds (float): How long a change must persist before it is published.
+            min_interval (float): Polling interval right after a change (polling backends).
+            max_interval (float): Polling interval once devices are idle (polling backends),
+                and so the longest delay before a plugged-in key is noticed.
+            idle_timeout (float): Longest wait on OS notifications before rechecking the stop flag.
+            clock (function): Monotonic time source.
+            descriptor_cache (DescriptorCache): Pruned to the enumerated paths after each scan
+                (default: the shared registry's cache when using `match_known_key`).
+        """
+        self.backend = backend
+        self.events = events if events is not None else queue.Queue()
+        self.matcher = matcher
+        self.debounce_seconds = debounce_seconds
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        if descriptor_cache is None and matcher is match_known_key:
+            descriptor_cache = get_key_registry().descriptor_cache
+        self.descriptor_cache = descriptor_cache
+        self.scans = 0
+        self.changed = False
+        self._stable = {}
+        self._pending = {}
+        self._interval = min_interval
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """
+        Returns the debounced set of connected security keys.
+
+        Returns:
+            dict: {device path: (key name, device descriptor)}
+        """
+        with self._lock:
+            return dict(self._stable)
+
+    def scan(self, now=None):
+        """
+        Enumerates devices once, updates the debounce state and publishes settled changes.
+
+        Args:
+            now (float): Current time from `clock` (optional).
+
+        Returns:
+            float: Seconds until the earliest pending change settles, or None if none is pending.
+        """
+        now = self.clock() if now is None else now
+        self.scans += 1
+        current = {}
+        devices = self.backend.enumerate()
+        for device in devices:
+            name = self.matcher(device)
+            if name:
+                current[device.get('path')] = (name, device)
+        if self.descriptor_cache is not None:
+            self.descriptor_cache.prune(device.get('path') for device in devices)
+
+        with self._lock:
+            for path, entry in current.items():
+                if path not in self._stable and path not in self._pending:
+                    self._pending[path] = ("added", now, entry)
+            for path, entry in self._stable.items():
+                if path not in current and path not in self._pending:
+                    self._pending[path] = ("removed", now, entry)
+            # A change that reverted inside the debounce window is dropped.
+            for path in list(self._pending):
+                kind = self._pending[path][0]
+                if (kind == "added") != (path in current):
+                    del self._pending[path]
+
+            settled = []
+            next_deadline = None
+            for path, (kind, since, entry) in list(self._pending.items()):
+                if now - since >= self.debounce_seconds:
+                    del self._pending[path]
+                    if kind == "added":
+                        self._stable[path] = entry
+                    else:
+                        self._stable.pop(path, None)
+                    settled.append(DeviceEvent(kind, entry[1], entry[0], now))
+                else:
+                    remaining = since + self.debounce_seconds - now
+                    next_deadline = remaining if next_deadline is None else min(next_deadline, remaining)
+
+            self.changed = bool(settled) or next_deadline is not None
+
+        for event in settled:
+            self._publish(event)
+        return next_deadline
+
+    def _publish(self, event):
+        vendor_id = event.device.get('vendor_id', 0)
+        product_id = event.device.get('product_id', 0)
+        if event.kind == "added":
+            logging.info(f"Detected new security key - Vendor ID: 0x{vendor_id:04x}, Product ID: 0x{product_id:04x}")
+        else:
+            logging.info(f"Security key removed - Vendor ID: 0x{vendor_id:04x}, Product ID: 0x{product_id:04x}")
+        emit_event(
+            f"key_{event.kind}", vendor_id=f"0x{vendor_id:04x}", product_id=f"0x{product_id:04x}",
+            name=event.name, serial_number=event.device.get('serial_number')
+        )
+        self.events.put(event)
+
+    def _next_wait(self, pending_deadline):
+        if self.backend.supports_notifications:
+            wait = self.idle_timeout
+        else:
+            # Poll quickly right after a change, then back off while nothing happens.
+            self._interval = self.min_interval if self.changed else min(self.max_interval, self._interval * 2)
+            wait = self._interval
+        if pending_deadline is not None:
+            wait = min(wait, pending_deadline)
+        return wait
+
+    def _scan_safely(self):
+        # An enumeration error must not end the monitor; the next scan tries again.
+        try:
+            return self.scan()
+        except Exception as e:
+            logging.exception(f"Error enumerating HID devices: {e}")
+            return None
+
+    def _run(self):
+        pending_deadline = self._scan_safely()
+        wait = self._next_wait(pending_deadline)
+        while not self._stop_event.is_set():
+            if self.backend.supports_notifications:
+                notified = self.backend.wait_for_change(wait)
+                if self._stop_event.is_set():
+                    break
+                if not notified and pending_deadline is None:
+                    continue
+            elif self._stop_event.wait(wait):
+                break
+            pending_deadline = self._scan_safely()
+            wait = self._next_wait(pending_deadline)
+
+    def start(self):
+        """
+        Starts monitoring on a background thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self.backend is None:
+            self.backend = default_backend()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="security-key-monitor", daemon=True)
+        self._thread.start()
+        logging.info(f"Security key monitor started ({type(self.backend).__name__}).")
+
+    def stop(self, timeout=None):
+        """
+        Stops the monitoring thread.
+
+        Args:
+            timeout (float): Seconds to wait for the thread (default: idle timeout plus one second).
+        """
+        if self._thread is None:
+            return
+        logging.info("Waiting for monitoring thread to stop...")
+        self._stop_event.set()
+        self.backend.wake()
+        self._thread.join(self.idle_timeout + 1 if timeout is None else timeout)
+        self._thread = None
+        self.backend.close()
@@ -0,0 +1,245 @@
+"""
+Diagnostics mode for the browser automation flows.
+
+A run records a Playwright trace (DOM snapshots and screenshots), a HAR file with
+network timings (without bodies) and the duration of every `log_debug_step` step into
+one directory. Recording happens inside the browser, so the flow makes no extra
+round-trips while it runs. When the run finishes, the directory is zipped on a
+background thread into DIAGNOSTICS_DIR/<flow>_<timestamp>.zip and the oldest bundles
+beyond the retention limit are deleted.
+"""
+import contextvars
+import datetime
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+
+DIAGNOSTICS_DIR = "diagnostics"
+DEFAULT_RETENTION = 20
+DEFAULT_MAX_TOTAL_BYTES = 200 * 1024 * 1024
+TRACE_FILE = "trace.zip"
+HAR_FILE = "network.har"
+STEPS_FILE = "steps.json"
+
+_current_run = contextvars.ContextVar("diagnostics_run", default=None)
+
+
+class DiagnosticsRun:
+    """
+    Artifacts of one automation run.
+    """
+
+    def __init__(self, flow, root=DIAGNOSTICS_DIR, retention=DEFAULT_RETENTION,
+                 max_total_bytes=DEFAULT_MAX_TOTAL_BYTES, clock=time.perf_counter):
+        """
+        Creates the run directory.
+
+        Args:
+            flow (str): Name of the flow, used in the bundle name.
+            root (str): Directory holding the bundles.
+            retention (int): Number of bundles to keep.
+            max_total_bytes (int): Maximum combined size of the kept bundles.
+            clock (function): Monotonic time source in seconds.
+        """
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")
+        self.flow = flow
+        self.root = root
+        self.name = f"{flow}_{timestamp}"
+        self.run_dir = os.path.join(root, self.name)
+        self.retention = retention
+        self.max_total_bytes = max_total_bytes
+        self.clock = clock
+        self.started = clock()
+        self.steps = []
+        self.bundle_path = None
+        self._tracing = False
+        self._compress_thread = None
+        os.makedirs(self.run_dir, exist_ok=True)
+
+    def path(self, file_name):
+        return os.path.join(self.run_dir, file_name)
+
+    def context_options(self):
+        """
+        Returns the `browser.new_context()` options that record the HAR file. Bodies are
+        omitted to keep the bundle small; the HAR is written when the context closes.
+
+        Returns:
+            dict: Context options.
+        """
+        return {"record_har_path": self.path(HAR_FILE), "record_har_content": "omit"}
+
+    async def attach(self, context):
+        """
+        Starts tracing on a browser context.
+
+        Args:
+            context (BrowserContext): Context the flow runs in.
+        """
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True)
+            self._tracing = True
+        except Exception:
+            logging.exception("Failed to start diagnostics tracing.")
+
+    async def detach(self, context):
+        """
+        Stops tracing and saves the trace. Call it before the context is closed.
+
+        Args:
+            context (BrowserContext): Context passed to `attach()`.
+        """
+        if not self._tracing:
+            return
+        self._tracing = False
+        try:
+            await context.tracing.stop(path=self.path(TRACE_FILE))
+        except Exception:
+            logging.exception("Failed to save diagnostics trace.")
+
+    def step(self, number, message):
+        """
+        Records the start of a step; the previous step ends here.
+
+        Args:
+            number (int): Step number.
+            message (str): Description of the step.
+        """
+        elapsed_ms = round((self.clock() - self.started) * 1000, 1)
+        if self.steps and self.steps[-1]["duration_ms"] is None:
+            self.steps[-1]["duration_ms"] = round(elapsed_ms - self.steps[-1]["started_ms"], 1)
+        self.steps.append({"step": number, "message": message, "started_ms": elapsed_ms, "duration_ms": None})
+
+    def finish(self, outcome="success"):
+        """
+        Writes the step timings and compresses the run in the background. Call it after
+        the context has been closed so the HAR file is complete.
+
+        Args:
+            outcome (str): Outcome of the flow.
+
+        Returns:
+            threading.Thread: The compression thread.
+        """
+        self.step(None, "finished")
+        summary = {
+            "flow": self.flow,
+            "outcome": outcome,
+            "total_ms": self.steps[-1]["started_ms"],
+            "steps": self.steps[:-1],
+        }
+        try:
+            with open(self.path(STEPS_FILE), "w") as f:
+                json.dump(summary, f, indent=2)
+        except OSError:
+            logging.exception("Failed to write diagnostics step timings.")
+        self._compress_thread = threading.Thread(target=self._compress, name="diagnostics-zip", daemon=True)
+        self._compress_thread.start()
+        return self._compress_thread
+
+    def _compress(self):
+        bundle_path = os.path.join(self.root, f"{self.name}.zip")
+        temp_path = bundle_path + ".tmp"
+        try:
+            with zipfile.ZipFile(temp_path, "w") as bundle:
+                for file_name in sorted(os.listdir(self.run_dir)):
+                    # The trace is already a zip; storing it avoids compressing it twice.
+                    method = zipfile.ZIP_STORED if file_name.endswith(".zip") else zipfile.ZIP_DEFLATED
+                    bundle.write(self.path(file_name), file_name, compress_type=method)
+            os.replace(temp_path, bundle_path)
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            self.bundle_path = bundle_path
+            logging.info(f"Diagnostics bundle saved: {bundle_path}")
+        except Exception:
+            logging.exception(f"Failed to compress diagnostics run {self.run_dir}.")
+            return
+        enforce_retention(self.root, self.retention, self.max_total_bytes)
+
+    def wait(self, timeout=None):
+        """
+        Waits for the background compression to finish.
+        """
+        if self._compress_thread is not None:
+            self._compress_thread.join(timeout)
+
+
+def enforce_retention(root=DIAGNOSTICS_DIR, retention=DEFAULT_RETENTION, max_total_bytes=DEFAULT_MAX_TOTAL_BYTES):
+    """
+    Deletes the oldest bundles beyond `retention` or `max_total_bytes`.
+
+    Args:
+        root (str): Directory holding the bundles.
+        retention (int): Number of bundles to keep.
+        max_total_bytes (int): Maximum combined size of the kept bundles.
+
+    Returns:
+        list: Paths of the deleted bundles.
+    """
+    try:
+        bundles = [os.path.join(root, name) for name in os.listdir(root) if name.endswith(".zip")]
+    except OSError:
+        return []
+    bundles.sort(key=os.path.getmtime, reverse=True)
+    deleted = []
+    total = 0
+    for index, bundle in enumerate(bundles):
+        total += os.path.getsize(bundle)
+        if index >= retention or (index > 0 and total > max_total_bytes):
+            try:
+                os.remove(bundle)
+                deleted.append(bundle)
+            except OSError:
+                logging.exception(f"Failed to delete old diagnostics bundle {bundle}.")
+    if deleted:
+        logging.info(f"Deleted {len(deleted)} old diagnostics bundle(s).")
+    return deleted
+
+
+def start_run(flow, **kwargs):
+    """
+    Starts a diagnostics run and makes it the current run of this task, so
+    `record_step` and `current_run` find it.
+
+    Args:
+        flow (str): Name of the flow.
+        **kwargs: Keyword arguments for DiagnosticsRun.
+
+    Returns:
+        DiagnosticsRun: The new run.
+    """
+    run = DiagnosticsRun(flow, **kwargs)
+    _current_run.set(run)
+    return run
+
+
+def current_run():
+    """
+    Returns the diagnostics run of the current task, or None.
+    """
+    return _current_run.get()
+
+
+def end_run(run, outcome="success"):
+    """
+    Finishes a run started with `start_run` and clears it from the current task.
+
+    Args:
+        run (DiagnosticsRun): The run.
+        outcome (str): Outcome of the flow.
+    """
+    if _current_run.get() is run:
+        _current_run.set(None)
+    run.finish(outcome)
+
+
+def record_step(number, message):
+    """
+    Records a step in the current run; does nothing when diagnostics are off.
+    """
+    run = _current_run.get()
+    if run is not None:
+        run.step(number, message)
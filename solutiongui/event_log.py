@@ -0,0 +1,208 @@
+"""
+Optional structured event log. Each event is one JSON line carrying its type, outcome,
+duration and identifying fields (device ids, serial, region, ...), written to one file
+per UTC day under the event log directory:
+
+    {"ts": 1760745600.123, "type": "passcode_lookup", "outcome": "failure", "duration_ms": 812.4,
+     "serial": "G030PM0000000001", "region": "us-east-1", "error": "HTTPError"}
+
+Events are handed to a background writer through a bounded queue, so emitting one never
+waits on disk; when the queue is full the event is dropped and counted. `emit_event` is
+a no-op until `enable_event_log` has been called, which the app does at startup when the
+event_log_enabled setting is on or SOLUTIONGUI_EVENT_LOG=1 is set. Use `event_query.py`
+to search the files.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+EVENT_LOG_DIR = "event_log"
+EVENT_FILE_SUFFIX = ".jsonl"
+
+_writer = None
+_lock = threading.Lock()
+_atexit_registered = False
+
+
+def event_file_name(timestamp):
+    """
+    Returns the name of the file holding events from the UTC day of `timestamp`.
+
+    Args:
+        timestamp (float): Epoch seconds.
+
+    Returns:
+        str: File name such as "2026-10-18.jsonl".
+    """
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp)) + EVENT_FILE_SUFFIX
+
+
+class EventWriter:
+    """
+    Background thread appending event lines to the file for each event's UTC day.
+    Files are never renamed, so an index built over them stays valid.
+    """
+
+    def __init__(self, log_dir, queue_size=10000):
+        self.log_dir = log_dir
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.written = 0
+        self._dropped_lock = threading.Lock()
+        self._file_name = None
+        self._stream = None
+        os.makedirs(log_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, timestamp, line):
+        try:
+            self.queue.put_nowait((timestamp, line))
+        except queue.Full:
+            # put() is called from every emitting thread.
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+                # Flush once the queue is drained, so a burst becomes one write and
+                # event_query still sees complete lines while the app is running.
+                if self.queue.empty():
+                    self._stream.flush()
+            except Exception:
+                logging.exception("Failed to write structured event.")
+        self._close_stream()
+
+    def _write(self, timestamp, line):
+        file_name = event_file_name(timestamp)
+        if file_name != self._file_name:
+            self._close_stream()
+            self._stream = open(os.path.join(self.log_dir, file_name), "a", encoding="utf-8")
+            self._file_name = file_name
+        self._stream.write(line + "\n")
+        self.written += 1
+
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+            self._file_name = None
+
+    def close(self, timeout=5):
+        """
+        Writes out queued events and stops the thread.
+        """
+        self.queue.put(None)
+        self._thread.join(timeout)
+        if self.dropped:
+            logging.warning(f"Structured event log dropped {self.dropped} event(s) because its queue was full.")
+
+
+def enable_event_log(log_dir=EVENT_LOG_DIR, queue_size=10000):
+    """
+    Starts writing events to `log_dir`. Calling it again while enabled does nothing.
+
+    Args:
+        log_dir (str): Directory for the daily event files.
+        queue_size (int): Maximum events waiting to be written.
+    """
+    global _writer, _atexit_registered
+    with _lock:
+        if _writer is None:
+            _writer = EventWriter(log_dir, queue_size)
+            logging.info(f"Structured event log enabled: {os.path.abspath(log_dir)}")
+            if not _atexit_registered:
+                # The writer thread is a daemon; write out what is queued before exit.
+                atexit.register(disable_event_log)
+                _atexit_registered = True
+
+
+def disable_event_log():
+    """
+    Writes out queued events and stops the event log.
+    """
+    global _writer
+    with _lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+
+def is_event_log_enabled():
+    return _writer is not None
+
+
+def apply_event_log_setting(enabled):
+    """
+    Turns the event log on or off to match the saved setting. SOLUTIONGUI_EVENT_LOG=1
+    keeps it on regardless.
+
+    Args:
+        enabled (bool): Value of the event_log_enabled setting.
+    """
+    if enabled or os.environ.get("SOLUTIONGUI_EVENT_LOG") == "1":
+        enable_event_log()
+    else:
+        disable_event_log()
+
+
+def emit_event(event_type, outcome=None, duration_ms=None, **fields):
+    """
+    Records a structured event.
+
+    Args:
+        event_type (str): Event type, e.g. "passcode_lookup" or "key_added".
+        outcome (str): "success", "failure", "timeout", ... (optional).
+        duration_ms (float): How long the operation took (optional).
+        **fields: Additional JSON-serializable fields.
+    """
+    writer = _writer
+    if writer is None:
+        return
+    timestamp = time.time()
+    event = {"ts": round(timestamp, 3), "type": event_type}
+    if outcome is not None:
+        event["outcome"] = outcome
+    if duration_ms is not None:
+        event["duration_ms"] = round(duration_ms, 1)
+    event.update(fields)
+    writer.put(timestamp, json.dumps(event, default=str, separators=(",", ":")))
+
+
+class timed_event:
+    """
+    Context manager that emits an event with the block's duration. The outcome is
+    "success" unless the block raises ("failure", with the exception type as "error")
+    or sets `fields["outcome"]` itself.
+
+        with timed_event("link_open", name=name) as fields:
+            ...
+            fields["title"] = page_title
+    """
+
+    def __init__(self, event_type, **fields):
+        self.event_type = event_type
+        self.fields = fields
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self.fields
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self.started) * 1000
+        if exc_type is not None:
+            self.fields.setdefault("outcome", "failure")
+            self.fields.setdefault("error", exc_type.__name__)
+        outcome = self.fields.pop("outcome", "success")
+        emit_event(self.event_type, outcome=outcome, duration_ms=duration_ms, **self.fields)
+        return False
@@ -0,0 +1,254 @@
+"""
+Indexes and queries the structured event log written by event_log.py.
+
+The index (index.json in the event log directory) splits every daily file into blocks
+of `block_size` lines and records each block's byte range, time range and the values of
+a few low-cardinality fields (type, outcome, region). A query only reads the blocks whose
+time range and field values can match, so it does not scan months of events. The index
+is brought up to date incrementally before each query.
+
+Usage (from the solutiongui directory):
+    python event_query.py --type passcode_lookup --outcome failure --where region=us-east-1 --since 7d
+    python event_query.py --type key_added --since 2026-10-01 --count
+    python event_query.py --reindex
+"""
+import argparse
+import calendar
+import json
+import os
+import re
+import sys
+import time
+from event_log import EVENT_LOG_DIR, EVENT_FILE_SUFFIX
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+DEFAULT_BLOCK_SIZE = 256
+DAY_SECONDS = 24 * 3600
+# Fields whose values are recorded per block as "field=value" terms.
+INDEXED_FIELDS = ("type", "outcome", "region")
+
+
+def _day_start(file_name):
+    return calendar.timegm(time.strptime(file_name[:-len(EVENT_FILE_SUFFIX)], "%Y-%m-%d"))
+
+
+def _index_blocks(path, start_offset, block_size):
+    """
+    Reads complete lines from `start_offset` and groups them into blocks.
+
+    Returns:
+        tuple: (blocks, offset after the last complete line)
+    """
+    blocks = []
+    block = None
+    offset = start_offset
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Partially written line; index it next time.
+            if block is None:
+                block = [offset, 0, None, None, 0, set()]
+            try:
+                event = json.loads(line)
+                ts = float(event["ts"])
+                block[2] = ts if block[2] is None else min(block[2], ts)
+                block[3] = ts if block[3] is None else max(block[3], ts)
+                for field in INDEXED_FIELDS:
+                    if field in event:
+                        block[5].add(f"{field}={event[field]}")
+            except (ValueError, KeyError, TypeError):
+                pass
+            offset += len(line)
+            block[1] = offset - block[0]
+            block[4] += 1
+            if block[4] == block_size:
+                blocks.append(block)
+                block = None
+    if block is not None:
+        blocks.append(block)
+    return [[b[0], b[1], b[2], b[3], b[4], sorted(b[5])] for b in blocks], offset
+
+
+def load_index(log_dir=EVENT_LOG_DIR):
+    path = os.path.join(log_dir, INDEX_FILE)
+    try:
+        with open(path, "r") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "block_size": DEFAULT_BLOCK_SIZE, "files": {}}
+
+
+def build_index(log_dir=EVENT_LOG_DIR, block_size=None, rebuild=False):
+    """
+    Brings the index up to date with the event files and saves it.
+
+    Files only ever grow, so a file is re-read from the start of its last (possibly
+    incomplete) block. A file that shrank is re-indexed from scratch.
+
+    Args:
+        log_dir (str): Event log directory.
+        block_size (int): Lines per block (default: the existing index's size).
+        rebuild (bool): Discard the existing index.
+
+    Returns:
+        dict: The index.
+    """
+    index = {"version": INDEX_VERSION, "block_size": DEFAULT_BLOCK_SIZE, "files": {}} if rebuild else load_index(log_dir)
+    if block_size and block_size != index["block_size"]:
+        index = {"version": INDEX_VERSION, "block_size": block_size, "files": {}}
+    if not os.path.isdir(log_dir):
+        return index
+
+    changed = False
+    present = set()
+    for file_name in sorted(os.listdir(log_dir)):
+        if not file_name.endswith(EVENT_FILE_SUFFIX):
+            continue
+        present.add(file_name)
+        path = os.path.join(log_dir, file_name)
+        size = os.path.getsize(path)
+        entry = index["files"].get(file_name)
+        if entry is not None and entry["size"] == size:
+            continue
+        if entry is None or size < entry["size"]:
+            entry = {"size": 0, "blocks": []}
+        blocks = entry["blocks"]
+        # Reopen the last block if it was not full.
+        if blocks and blocks[-1][4] < index["block_size"]:
+            start = blocks.pop()[0]
+        else:
+            start = blocks[-1][0] + blocks[-1][1] if blocks else 0
+        new_blocks, end = _index_blocks(path, start, index["block_size"])
+        blocks.extend(new_blocks)
+        entry["size"] = end
+        index["files"][file_name] = entry
+        changed = True
+
+    for file_name in list(index["files"]):
+        if file_name not in present:
+            del index["files"][file_name]
+            changed = True
+
+    if changed:
+        temp_path = os.path.join(log_dir, INDEX_FILE + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temp_path, os.path.join(log_dir, INDEX_FILE))
+    return index
+
+
+def query(log_dir=EVENT_LOG_DIR, event_type=None, since=None, until=None, outcome=None, where=None, index=None):
+    """
+    Yields events matching all given filters, oldest first.
+
+    Args:
+        log_dir (str): Event log directory.
+        event_type (str): Event type to match (optional).
+        since (float): Earliest epoch timestamp (optional).
+        until (float): Latest epoch timestamp (optional).
+        outcome (str): Outcome to match (optional).
+        where (dict): Field values to match, compared as strings (optional).
+        index (dict): Index to use (default: `build_index(log_dir)`).
+
+    Yields:
+        dict: Matching events.
+    """
+    index = index if index is not None else build_index(log_dir)
+    where = where or {}
+    conditions = dict(where)
+    if event_type is not None:
+        conditions["type"] = event_type
+    if outcome is not None:
+        conditions["outcome"] = outcome
+    required_terms = [f"{field}={value}" for field, value in conditions.items() if field in INDEXED_FIELDS]
+    for file_name in sorted(index["files"]):
+        day_start = _day_start(file_name)
+        if since is not None and day_start + DAY_SECONDS <= since:
+            continue
+        if until is not None and day_start > until:
+            continue
+        with open(os.path.join(log_dir, file_name), "rb") as f:
+            for offset, length, min_ts, max_ts, _, terms in index["files"][file_name]["blocks"]:
+                if any(term not in terms for term in required_terms):
+                    continue
+                if since is not None and max_ts is not None and max_ts < since:
+                    continue
+                if until is not None and min_ts is not None and min_ts > until:
+                    continue
+                f.seek(offset)
+                for line in f.read(length).splitlines():
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event_type is not None and event.get("type") != event_type:
+                        continue
+                    if outcome is not None and event.get("outcome") != outcome:
+                        continue
+                    ts = event.get("ts", 0)
+                    if (since is not None and ts < since) or (until is not None and ts > until):
+                        continue
+                    if any(str(event.get(key)) != value for key, value in where.items()):
+                        continue
+                    yield event
+
+
+def parse_time(value, now=None):
+    """
+    Parses a relative time ("30m", "12h", "7d") or a UTC date/time ("2026-10-01",
+    "2026-10-01T08:00:00") into epoch seconds.
+    """
+    now = time.time() if now is None else now
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", value)
+    if match:
+        unit = {"s": 1, "m": 60, "h": 3600, "d": DAY_SECONDS, "w": 7 * DAY_SECONDS}[match.group(2)]
+        return now - float(match.group(1)) * unit
+    for pattern in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return calendar.timegm(time.strptime(value, pattern))
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Invalid time '{value}'. Use e.g. 7d, 12h or 2026-10-01.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the structured event log.")
+    parser.add_argument("--dir", default=EVENT_LOG_DIR, help="Event log directory.")
+    parser.add_argument("--type", dest="event_type", help="Event type, e.g. passcode_lookup.")
+    parser.add_argument("--outcome", help="Outcome, e.g. failure.")
+    parser.add_argument("--since", type=parse_time, help="Start time: 7d, 12h, 2026-10-01, ...")
+    parser.add_argument("--until", type=parse_time, help="End time, same formats as --since.")
+    parser.add_argument("--where", nargs="+", default=[], metavar="FIELD=VALUE", help="Field filters.")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matches.")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild the index from scratch.")
+    args = parser.parse_args(argv)
+
+    where = {}
+    for condition in args.where:
+        key, separator, value = condition.partition("=")
+        if not separator:
+            parser.error(f"Invalid --where condition '{condition}'. Use FIELD=VALUE.")
+        where[key] = value
+
+    started = time.perf_counter()
+    index = build_index(args.dir, rebuild=args.reindex)
+    matches = query(args.dir, args.event_type, args.since, args.until, args.outcome, where, index=index)
+    count = 0
+    for event in matches:
+        count += 1
+        if not args.count:
+            print(json.dumps(event))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if args.count:
+        print(count)
+    print(f"{count} event(s) in {elapsed_ms:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,43 @@
 import argparse
+import csv
+import importlib.util
+import json
 import multiprocessing
 import os
 import re
-import traceback
+import sys
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
+from multiprocessing.managers import BaseManager
 from typing import Optional
 import threading
 
+# Running this file directly puts gui/ on sys.path; the shared modules live one level up
+# and are imported by their bare names like everywhere else in the application.
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+
 try:
-    import boto3
+    # requests_aws4auth is only checked here; it is imported on first lookup. boto3 is optional.
+    if importlib.util.find_spec("requests_aws4auth") is None:
+        raise ImportError("No module named 'requests_aws4auth'", name="requests_aws4auth")
     import requests
-    from requests_aws4auth import AWS4Auth
     from requests import Response
-    import customtkinter as ctk
-except ImportError:
-    print(
-        "Run `pip install boto3 requests requests-aws4auth customtkinter` to install the missing packages"
-    )
-    print(traceback.format_exc())
+except ImportError as e:
+    print(f"Missing package '{e.name}'. Run `pip install requests requests-aws4auth` to install it.")
     exit(1)
 
+from credential_cache import CredentialCache
+from http_pool import get_session_pool, get_signer_cache
+from retry_policy import RetryPolicy, call_with_retry, get_circuit_breaker
+from cognito_client import cognito_endpoint, create_cognito_client
+from event_log import timed_event
+from timing import RollingHistogram, span, timed
+from passcode_client import PasscodeClient
+
 audience = "cognito.amazon.com"
 windows = "nt"
 
@@ -65,21 +82,8 @@ device_admin_lambda_accounts = {
 }
 
 
-def retry(f, times):
-    """
-    Attempts to execute function f up to a specified number of times. Mitigates timeouts due to lambda stack cold start.
-
-    :param f: function to execute
-    :param times: number of attempts for function execution
-    :return: result of executing function f
-    """
-    try:
-        return f()
-    except Exception as e:
-        if times == 0:
-            raise e
-        else:
-            return retry(f, times - 1)
+# Mitigates timeouts due to lambda stack cold start without retrying client errors.
+passcode_retry_policy = RetryPolicy(max_attempts=4, base_delay=0.5, max_delay=4.0, deadline=60.0)
 
 
 def first_or_none(iterable, predicate):
@@ -90,15 +94,37 @@ class MidwayAuthHelper:
     def __init__(self):
         self.cookies = self._get_cookies()
         self.jwt = self._get_midway_token(self.cookies, audience)
+        self.credential_cache = CredentialCache()
+        self._cognito_clients = {}
+        self._cognito_clients_lock = threading.Lock()
 
     def get_creds(self, aws_account_id, identity_pool_id) -> "tuple[str, str, str]":
+        """
+        Returns temporary credentials for the identity pool, reusing cached ones until
+        shortly before they expire.
+        """
+        return self.credential_cache.get(
+            (aws_account_id, identity_pool_id),
+            lambda: self._fetch_creds(aws_account_id, identity_pool_id),
+        )
+
+    def _fetch_creds(self, aws_account_id, identity_pool_id):
         cognito_id = self._get_cognito_id_for_jwt(
             aws_account_id,
             identity_pool_id,
             self.jwt,
         )
-        access, secret, session = self._issue_creds_for_cognito_id(cognito_id, self.jwt)
-        return access, secret, session
+        return self._issue_creds_for_cognito_id(cognito_id, self.jwt, identity_pool_id)
+
+    def _get_cognito_client(self, identity_pool_id: str):
+        region_name = identity_pool_id.split(":", 1)[0]
+        with self._cognito_clients_lock:
+            client = self._cognito_clients.get(region_name)
+            if client is None:
+                session = get_session_pool().get(cognito_endpoint(region_name))
+                client = create_cognito_client(region_name, session=session)
+                self._cognito_clients[region_name] = client
+            return client
 
     def _get_cookies(self) -> "dict[str, str]":
         cookies = {}
@@ -126,7 +152,7 @@ class MidwayAuthHelper:
             "redirect_uri": audience_url,
             "nonce": uuid.uuid4().hex,
         }
-        response = requests.get(
+        response = get_session_pool().get(midway_url).get(
             midway_url, params=params, cookies=cookies, headers=headers
         )
         try:
@@ -138,7 +164,7 @@ class MidwayAuthHelper:
     def _get_cognito_id_for_jwt(
             self, aws_account: str, cognito_pool_id: str, jwt: str
     ) -> str:
-        identity_response = boto3.client("cognito-identity").get_id(
+        identity_response = self._get_cognito_client(cognito_pool_id).get_id(
             AccountId=aws_account,
             IdentityPoolId=cognito_pool_id,
             Logins={"midway-auth.amazon.com": jwt},
@@ -147,10 +173,10 @@ class MidwayAuthHelper:
         return identity_response["IdentityId"]
 
     def _issue_creds_for_cognito_id(
-            self, cognito_id: str, jwt: str
-    ) -> "tuple[str, str, str]":
-        credentials_response = boto3.client(
-            "cognito-identity"
+            self, cognito_id: str, jwt: str, identity_pool_id: str
+    ) -> "tuple[str, str, str, object]":
+        credentials_response = self._get_cognito_client(
+            identity_pool_id
         ).get_credentials_for_identity(
             IdentityId=cognito_id, Logins={"midway-auth.amazon.com": jwt}
         )
@@ -158,34 +184,44 @@ class MidwayAuthHelper:
         access_key_id = credentials["AccessKeyId"]
         secret_key = credentials["SecretKey"]
         session_token = credentials["SessionToken"]
-        return access_key_id, secret_key, session_token
+        return access_key_id, secret_key, session_token, credentials.get("Expiration")
 
 
+@timed("passcode.lookup")
 def get_passcode(serial_number: str, region_string, midway_helper):
     region = Region(region_string)
-    boto3.setup_default_session(region_name=region.value)
-    try:
-        access, secret, session = midway_helper.get_creds(
-            device_admin_lambda_accounts[region]["aws_account_id"],
-            device_admin_lambda_accounts[region]["identity_pool_id"]
-        )
-        aws_auth = AWS4Auth(
-            access,
-            secret,
-            region.value,
-            "execute-api",
-            session_token=session,
-        )
-        url = f"{device_admin_lambda_accounts[region]['endpoint']}/devices/{serial_number}/passcode"
-
-        def get() -> Response:
-            response = requests.get(url, auth=aws_auth, timeout=30)
-            response.raise_for_status()
-            return response
-
-        return region, retry(get, 3).json()
-    except Exception as e:
-        return region, {"error": str(e)}
+    with timed_event("passcode_lookup", serial=serial_number, region=region.value) as event:
+        try:
+            with span("passcode.credentials"):
+                access, secret, session = midway_helper.get_creds(
+                    device_admin_lambda_accounts[region]["aws_account_id"],
+                    device_admin_lambda_accounts[region]["identity_pool_id"]
+                )
+            aws_auth = get_signer_cache().get(
+                access,
+                secret,
+                session,
+                region.value,
+                "execute-api",
+            )
+            url = f"{device_admin_lambda_accounts[region]['endpoint']}/devices/{serial_number}/passcode"
+            http_session = get_session_pool().get(url)
+
+            def get() -> Response:
+                response = http_session.get(url, auth=aws_auth, timeout=30)
+                response.raise_for_status()
+                return response
+
+            breaker = get_circuit_breaker(device_admin_lambda_accounts[region]["endpoint"])
+            with span("passcode.request"):
+                return region, call_with_retry(get, passcode_retry_policy, breaker).json()
+        except Exception as e:
+            event["outcome"] = "failure"
+            event["error"] = type(e).__name__
+            status_code = getattr(getattr(e, "response", None), "status_code", None)
+            if status_code is not None:
+                event["status_code"] = status_code
+            return region, {"error": str(e)}
 
 
 def parse_sn(sn: str) -> Optional[str]:
@@ -198,89 +234,264 @@ def parse_sn(sn: str) -> Optional[str]:
         return groups[0]
 
 
-class PasscodeApp(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-        self.title("Passcode Retriever")
-        self.geometry("400x300")
-        self.resizable(False, False)
-
-        # Serial Number Input
-        self.serial_label = ctk.CTkLabel(self, text="Device Serial Number:")
-        self.serial_label.pack(pady=(20, 5))
-        self.serial_entry = ctk.CTkEntry(self, width=300)
-        self.serial_entry.pack(pady=5)
-
-        # Region Selection
-        self.region_label = ctk.CTkLabel(self, text="Select Region:")
-        self.region_label.pack(pady=(20, 5))
-        self.region_var = ctk.StringVar(value="us-east-1")
-        regions = [region.value for region in Region]
-        self.region_dropdown = ctk.CTkOptionMenu(self, values=regions, variable=self.region_var)
-        self.region_dropdown.pack(pady=5)
-
-        # Submit Button
-        self.submit_button = ctk.CTkButton(self, text="Get Passcode", command=self.fetch_passcode)
-        self.submit_button.pack(pady=(20, 10))
-
-        # Result Display
-        self.result_label = ctk.CTkLabel(self, text="", text_color="green")
-        self.result_label.pack(pady=5)
-
-        # Error Display
-        self.error_label = ctk.CTkLabel(self, text="", text_color="red")
-        self.error_label.pack(pady=5)
-
-        # Initialize MidwayAuthHelper
-        self.midway_helper = MidwayAuthHelper()
-
-    def fetch_passcode(self):
-        serial_number = self.serial_entry.get().strip()
-        region = self.region_var.get()
-
-        if not serial_number:
-            self.error_label.configure(text="Please enter a serial number.")
-            self.result_label.configure(text="")
-            return
-
-        parsed_sn = parse_sn(serial_number)
-        if not parsed_sn:
-            self.error_label.configure(text="Invalid serial number format.")
-            self.result_label.configure(text="")
-            return
-
-        self.error_label.configure(text="")
-        self.result_label.configure(text="Fetching passcode...")
-
-        # Run in a separate thread to avoid blocking the GUI
-        threading.Thread(target=self.retrieve_passcode, args=(parsed_sn, region), daemon=True).start()
-
-    def retrieve_passcode(self, serial_number, region):
-        region_enum = next((r for r in Region if r.value == region), None)
-        if not region_enum:
-            self.update_result("Selected region is invalid.", error=True)
-            return
-
-        region, data = get_passcode(serial_number, region, self.midway_helper)
-
-        if "error" in data:
-            self.update_result(f"Error: {data['error']}", error=True)
-        else:
-            if "desired" in data and data["reported"] != data["desired"]:
-                message = f"Current passcode: {data['reported']}\nUpcoming passcode: {data['desired']}"
-            else:
-                message = f"Passcode: {data['reported']}"
-            self.update_result(message, error=False)
-
-    def update_result(self, message, error=False):
-        if error:
-            self.error_label.configure(text=message)
-            self.result_label.configure(text="")
+def parse_serial_list(text: str) -> "list[str]":
+    """
+    Extracts serial numbers from pasted text or CSV content.
+
+    Cells are split on newlines, commas, semicolons, tabs and spaces, normalised through
+    `parse_sn` and de-duplicated in their original order. Cells without a digit, such as
+    a CSV header, are skipped.
+    """
+    serials = []
+    seen = set()
+    for row in csv.reader(text.splitlines()):
+        for cell in row:
+            for token in re.split(r"[;\s]+", cell.strip()):
+                if not token or not any(ch.isdigit() for ch in token):
+                    continue
+                serial = parse_sn(token)
+                if serial and serial not in seen:
+                    seen.add(serial)
+                    serials.append(serial)
+    return serials
+
+
+def describe_passcode(data: dict) -> "tuple[str, str]":
+    """
+    Returns the (current, upcoming) passcodes from a device-admin response. Upcoming is
+    empty when no rotation is pending.
+    """
+    current = data.get("reported", "")
+    desired = data.get("desired")
+    upcoming = desired if desired is not None and desired != current else ""
+    return current, upcoming
+
+
+def discover_region(serial_number: str, midway_helper, max_workers: int = len(Region), client=None):
+    """
+    Queries every device-admin region in parallel and returns the first successful
+    (region, data) pair without waiting for the other regions. If no region knows the
+    device, the last error is returned.
+    Lookups go through `client` (a PasscodeClient) when given.
+    """
+    lookup = get_passcode if client is None else client.get
+    last_result = (None, {"error": "Device not found in any region."})
+    # Not a `with` block: leaving it would wait for the slowest region even after a success.
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [
+            executor.submit(lookup, serial_number, region.value, midway_helper)
+            for region in device_admin_lambda_accounts
+        ]
+        for future in as_completed(futures):
+            region, data = future.result()
+            if "error" not in data:
+                return region, data
+            last_result = (region, data)
+    finally:
+        # Lookups still running finish in the background; their results are discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return last_result
+
+
+def fetch_passcodes_bulk(serial_numbers, region_string, midway_helper, max_workers=8, on_result=None, cancel_event=None,
+                         client=None):
+    """
+    Fans passcode lookups for many devices out over a bounded thread pool.
+
+    :param serial_numbers: normalised serial numbers to look up
+    :param region_string: region value, or None/"auto" to discover the region per device
+    :param midway_helper: MidwayAuthHelper shared by all workers
+    :param max_workers: maximum number of concurrent lookups
+    :param on_result: called with (serial_number, region, data) as each lookup completes
+    :param cancel_event: threading.Event that stops lookups not yet started
+    :param client: PasscodeClient shared with other lookups (optional)
+    :return: list of (serial_number, region, data) in completion order
+    """
+    auto_region = region_string in (None, "", "auto")
+
+    def lookup(serial_number):
+        if cancel_event is not None and cancel_event.is_set():
+            return serial_number, None, {"error": "Cancelled."}
+        if auto_region:
+            region, data = discover_region(serial_number, midway_helper, client=client)
+        elif client is not None:
+            region, data = client.get(serial_number, region_string, midway_helper)
         else:
-            self.result_label.configure(text=message)
-            self.error_label.configure(text="")
+            region, data = get_passcode(serial_number, region_string, midway_helper)
+        return serial_number, region, data
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(lookup, serial_number) for serial_number in serial_numbers]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(*result)
+    return results
+
+
+# --- Headless batch mode -------------------------------------------------------------
+
+_shared_midway_helper = None
+_worker_midway_helper = None
+_worker_client = None
+
+
+def get_shared_midway_helper():
+    """
+    Returns the MidwayAuthHelper of the credential manager process, creating it on first use.
+    """
+    global _shared_midway_helper
+    if _shared_midway_helper is None:
+        _shared_midway_helper = MidwayAuthHelper()
+    return _shared_midway_helper
+
+
+class CredentialManager(BaseManager):
+    """
+    Serves one MidwayAuthHelper, and with it one credential cache, to every worker
+    process, so a batch authenticates with Midway and Cognito once per region instead
+    of once per worker.
+    """
+
+
+CredentialManager.register("MidwayAuthHelper", callable=get_shared_midway_helper, exposed=("get_creds",))
+
+
+def _init_batch_worker(midway_helper):
+    global _worker_midway_helper, _worker_client
+    _worker_midway_helper = midway_helper
+    _worker_client = PasscodeClient(get_passcode)
+
+
+def _batch_lookup(job):
+    serial_number, region_string = job
+    started = time.perf_counter()
+    if region_string in (None, "", "auto"):
+        region, data = discover_region(serial_number, _worker_midway_helper, client=_worker_client)
+    else:
+        region, data = _worker_client.get(serial_number, region_string, _worker_midway_helper)
+    return serial_number, region, data, time.perf_counter() - started
+
+
+def batch_record(serial_number, region, data, seconds) -> dict:
+    """
+    Returns the JSON-lines record of one lookup.
+    """
+    record = {"serial": serial_number, "region": str(region) if region else None}
+    if "error" in data:
+        record["error"] = data["error"]
+    else:
+        record["current"], record["upcoming"] = describe_passcode(data)
+    record["latency_ms"] = round(seconds * 1000, 1)
+    return record
+
+
+def run_batch(serial_numbers, region_string, workers, output=None):
+    """
+    Looks up passcodes in a pool of worker processes and writes one JSON line per device
+    to `output` as the results arrive.
+
+    Args:
+        serial_numbers (list): Normalised serial numbers.
+        region_string (str): Region value, or "auto" to discover the region per device.
+        workers (int): Number of worker processes.
+        output: Text stream for the JSON lines (default: stdout).
+
+    Returns:
+        dict: Batch summary (devices, failed, wall_s, per_second and latency percentiles).
+    """
+    output = output or sys.stdout
+    latencies = RollingHistogram(window=max(1, len(serial_numbers)))
+    failed = 0
+    started = time.perf_counter()
+    with CredentialManager() as manager:
+        midway_helper = manager.MidwayAuthHelper()
+        with multiprocessing.Pool(processes=workers, initializer=_init_batch_worker, initargs=(midway_helper,)) as pool:
+            jobs = [(serial_number, region_string) for serial_number in serial_numbers]
+            for serial_number, region, data, seconds in pool.imap_unordered(_batch_lookup, jobs):
+                latencies.add(seconds)
+                failed += "error" in data
+                output.write(json.dumps(batch_record(serial_number, region, data, seconds)) + "\n")
+                output.flush()
+    wall = time.perf_counter() - started
+    summary = {
+        "devices": len(serial_numbers),
+        "failed": failed,
+        "workers": workers,
+        "wall_s": round(wall, 2),
+        "per_second": round(len(serial_numbers) / wall, 2) if wall > 0 else None,
+    }
+    summary.update({key: value for key, value in latencies.percentiles().items() if key != "count"})
+    return summary
+
+
+def run_gui():
+    """
+    Opens the passcode window. Tk is only imported here, so batch mode runs without it.
+
+    Returns:
+        int: 0 when the window was closed, 1 if the GUI packages are missing.
+    """
+    # When this file is run as a script, let the window module share this module
+    # instead of importing a second copy of it.
+    sys.modules.setdefault("gui.get_passcode_v2", sys.modules[__name__])
+    try:
+        from gui.passcode_window import PasscodeApp
+    except ImportError as e:
+        print(f"Missing package '{e.name}'. Run `pip install customtkinter` to install it.", file=sys.stderr)
+        return 1
+    PasscodeApp().mainloop()
+    return 0
+
+
+def main(argv=None):
+    """
+    Entry point. With --batch, reads serial numbers from the arguments, a file or stdin
+    and prints one JSON line per device, followed by a throughput summary on stderr.
+    Without it, opens the passcode window.
+
+    Returns:
+        int: 0 if every lookup succeeded, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Retrieve device passcodes.")
+    parser.add_argument("--batch", action="store_true", help="Run headless instead of opening the window.")
+    parser.add_argument("serials", nargs="*", help="Serial numbers (default: read from --file or stdin).")
+    parser.add_argument("-f", "--file", help="Text or CSV file with serial numbers ('-' for stdin).")
+    parser.add_argument("-r", "--region", default="auto", choices=["auto"] + [region.value for region in Region],
+                        help="Device-admin region (default: discover it per device).")
+    parser.add_argument("-w", "--workers", type=int, default=min(8, os.cpu_count() or 1),
+                        help="Worker processes.")
+    args = parser.parse_args(argv)
+    if not args.batch:
+        if args.serials or args.file:
+            parser.error("serial numbers and --file require --batch")
+        return run_gui()
+
+    if args.serials:
+        text = "\n".join(args.serials)
+    elif args.file and args.file != "-":
+        with open(args.file, "r", newline="") as file:
+            text = file.read()
+    else:
+        text = sys.stdin.read()
+    serial_numbers = parse_serial_list(text)
+    if not serial_numbers:
+        print("No valid serial numbers found.", file=sys.stderr)
+        return 1
+
+    summary = run_batch(serial_numbers, args.region, max(1, min(args.workers, len(serial_numbers))))
+    print(
+        f"{summary['devices']} devices, {summary['failed']} failed in {summary['wall_s']} s "
+        f"({summary['per_second']}/s, workers={summary['workers']}); latency p50={summary['p50_ms']} ms "
+        f"p95={summary['p95_ms']} ms p99={summary['p99_ms']} ms max={summary['max_ms']} ms",
+        file=sys.stderr,
+    )
+    return 1 if summary["failed"] else 0
 
 
 if __name__ == "__main__":
-    app = PasscodeApp()
-    app.mainloop()
+    multiprocessing.freeze_support()
+    sys.exit(main())
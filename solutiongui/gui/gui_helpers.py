@@ -1,6 +1,7 @@
 import customtkinter as ctk
 import logging
 from . import manage_zukey  # Changed to relative import
+from .key_list_model import get_list_view
 # Add more GUI-related imports if necessary
 
 def create_window_controls(root, on_closing_callback, on_minimize_callback):
@@ -147,25 +148,22 @@ def create_security_keys_list(root, on_key_double_click):
     # Bind double-click event to the callback function
     security_keys_list.bind("<Double-Button-1>", lambda event: on_key_double_click(security_keys_list))
 
+    # Repaint snapshots submitted from the monitor thread
+    get_list_view(security_keys_list).start()
+
     return security_keys_list
 
 def update_security_keys_list(security_keys_list, keys):
     """
-    Updates the security keys list view with the current connected keys.
+    Updates the security keys list view with the current connected keys. Only rows that
+    changed since the last update are inserted or removed. Must be called on the Tk thread;
+    from the monitor thread use `get_list_view(security_keys_list).submit(keys)` instead.
 
     Args:
         security_keys_list (ctk.CTkTextbox): The textbox widget to update.
         keys (list): List of connected security keys.
     """
-    try:
-        security_keys_list.configure(state="normal")
-        security_keys_list.delete("1.0", "end")  # Clear the list
-        for key in keys:
-            security_keys_list.insert("end", f"{key}\n")  # Add each key
-        security_keys_list.configure(state="disabled")
-        security_keys_list.see("end")  # Scroll to the bottom
-    except Exception as e:
-        logging.exception("Failed to update security keys list.")
+    get_list_view(security_keys_list).render(keys)
 
 def set_window_size(root, width=768, height=958):
     """
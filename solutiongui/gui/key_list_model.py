@@ -0,0 +1,228 @@
+"""
+Keyed model for the "Connected Security Keys" list. Each monitor snapshot is diffed
+against what is on screen and only the removed and inserted rows are touched, so a
+bench full of keys does not flicker or lose its scroll position on every tick.
+"""
+import logging
+import queue
+
+
+def _keyed(items):
+    """
+    Normalizes a snapshot to a list of (key, label) pairs. Plain strings are keyed by
+    the label plus its occurrence number, so several keys with the same name stay distinct.
+    """
+    keyed = []
+    seen = {}
+    for item in items:
+        if isinstance(item, tuple):
+            keyed.append(item)
+            continue
+        occurrence = seen.get(item, 0)
+        seen[item] = occurrence + 1
+        keyed.append(((item, occurrence), item))
+    return keyed
+
+
+class KeyedListModel:
+    """
+    Tracks the rows currently displayed and computes the edits that turn them into a new snapshot.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.labels = {}
+
+    def diff(self, items):
+        """
+        Computes the edits between the current rows and a new snapshot and applies them to the model.
+
+        Args:
+            items (list): Key labels, or (key, label) pairs.
+
+        Returns:
+            list: ("remove", index) and ("insert", index, label) operations, to be applied in order.
+        """
+        target = _keyed(items)
+        target_labels = dict(target)
+        operations = []
+
+        # Removals bottom-up so earlier indexes stay valid.
+        for index in range(len(self.keys) - 1, -1, -1):
+            key = self.keys[index]
+            if target_labels.get(key) != self.labels[key]:
+                operations.append(("remove", index))
+                del self.keys[index]
+                del self.labels[key]
+
+        for index, (key, label) in enumerate(target):
+            if index < len(self.keys) and self.keys[index] == key:
+                continue
+            if key in self.labels:
+                # A surviving row moved: take it out and reinsert it here.
+                old_index = self.keys.index(key)
+                operations.append(("remove", old_index))
+                del self.keys[old_index]
+            operations.append(("insert", index, label))
+            self.keys.insert(index, key)
+            self.labels[key] = label
+        return operations
+
+
+class TextboxAdapter:
+    """
+    Applies row edits to a CTkTextbox, where row N is text line N + 1.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+
+    def apply(self, operations):
+        self.widget.configure(state="normal")
+        try:
+            for operation in operations:
+                if operation[0] == "remove":
+                    index = operation[1]
+                    self.widget.delete(f"{index + 1}.0", f"{index + 2}.0")
+                else:
+                    _, index, label = operation
+                    self.widget.insert(f"{index + 1}.0", f"{label}\n")
+        finally:
+            self.widget.configure(state="disabled")
+
+    def clear(self):
+        self.widget.configure(state="normal")
+        self.widget.delete("1.0", "end")
+        self.widget.configure(state="disabled")
+
+
+class ListboxAdapter:
+    """
+    Applies row edits to a listbox, which takes integer row indexes rather than "line.column".
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+
+    def apply(self, operations):
+        for operation in operations:
+            if operation[0] == "remove":
+                self.widget.delete(operation[1])
+            else:
+                _, index, label = operation
+                self.widget.insert(index, label)
+
+    def clear(self):
+        self.widget.delete(0, "end")
+
+
+def adapter_for(widget):
+    """
+    Returns the adapter matching a list widget: listboxes have `curselection`, textboxes do not.
+
+    Args:
+        widget: A CTkTextbox or a listbox widget.
+
+    Returns:
+        TextboxAdapter or ListboxAdapter: The adapter.
+    """
+    if hasattr(widget, "curselection"):
+        return ListboxAdapter(widget)
+    return TextboxAdapter(widget)
+
+
+class SecurityKeysListView:
+    """
+    Renders key snapshots into a list widget. `submit()` may be called from any thread;
+    snapshots are queued and an `after()` pump on the Tk thread repaints at most once per
+    frame with the latest one.
+    """
+
+    def __init__(self, widget, tk_root=None, frame_ms=33):
+        """
+        Args:
+            widget: The CTkTextbox or listbox showing the keys.
+            tk_root: Tk widget whose `after()` drives the pump (default: `widget`).
+            frame_ms (int): Pump interval in milliseconds.
+        """
+        self.widget = widget
+        self.tk_root = tk_root or widget
+        self.frame_ms = frame_ms
+        self.model = KeyedListModel()
+        self.adapter = adapter_for(widget)
+        self.repaints = 0
+        self._snapshots = queue.Queue()
+        self._running = False
+
+    def render(self, items):
+        """
+        Applies a snapshot immediately. Must be called on the Tk thread.
+
+        Args:
+            items (list): Key labels, or (key, label) pairs.
+        """
+        operations = self.model.diff(items)
+        if not operations:
+            return
+        try:
+            self.adapter.apply(operations)
+            self.repaints += 1
+        except Exception as e:
+            logging.exception(f"Failed to update security keys list: {e}")
+            # The widget no longer matches the model: start over from an empty list.
+            self.model = KeyedListModel()
+            try:
+                self.adapter.clear()
+                self.adapter.apply(self.model.diff(items))
+            except Exception:
+                logging.exception("Failed to rebuild security keys list.")
+
+    def submit(self, items):
+        """
+        Queues a snapshot from any thread.
+
+        Args:
+            items (list): Key labels, or (key, label) pairs.
+        """
+        self._snapshots.put(list(items))
+
+    def start(self):
+        """
+        Starts the `after()` pump. Must be called on the Tk thread.
+        """
+        if not self._running:
+            self._running = True
+            self.tk_root.after(self.frame_ms, self._pump)
+
+    def stop(self):
+        self._running = False
+
+    def _pump(self):
+        if not self._running:
+            return
+        latest = None
+        while True:
+            try:
+                latest = self._snapshots.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None:
+            self.render(latest)
+        self.tk_root.after(self.frame_ms, self._pump)
+
+
+def get_list_view(widget):
+    """
+    Returns the list view attached to a widget, creating it on first use.
+
+    Args:
+        widget: The CTkTextbox or listbox showing the keys.
+
+    Returns:
+        SecurityKeysListView: The view.
+    """
+    view = getattr(widget, "_security_keys_view", None)
+    if view is None:
+        view = SecurityKeysListView(widget)
+        widget._security_keys_view = view
+    return view
@@ -1,5 +1,6 @@
 import customtkinter as ctk
 from Core import QuickLinksApp  # Ensure QuickLinksApp is imported correctly
+from gui.key_list_model import get_list_view
 
 def set_window_size(root, width_ratio=0.6, height_ratio=0.6):
     """
@@ -191,21 +192,21 @@ def create_security_keys_list(root, on_key_double_click):
     # Bind the double-click event to the callback function
     security_keys_list.bind("<Double-Button-1>", lambda event: on_key_double_click(security_keys_list))
 
+    # Repaint snapshots submitted from the monitor thread
+    get_list_view(security_keys_list).start()
+
     return security_keys_list
 
 def update_security_keys_list(security_keys_list, keys):
     """
-    Updates the security keys list view with the current connected keys.
+    Updates the security keys list view with the current connected keys, applying only
+    the rows that changed. Works for both listbox and textbox widgets.
 
     Args:
-        security_keys_list (ctk.CTkTextbox): The textbox widget to update.
+        security_keys_list (CTkListbox): The listbox widget to update.
         keys (list): List of connected security keys.
     """
-    security_keys_list.configure(state="normal")
-    security_keys_list.delete("1.0", "end")
-    for key in keys:
-        security_keys_list.insert("end", f"{key}\n")
-    security_keys_list.configure(state="disabled")
+    get_list_view(security_keys_list).render(keys)
 
 def on_key_double_click(security_keys_list):
     """
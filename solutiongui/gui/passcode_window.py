@@ -0,0 +1,285 @@
+import csv
+import queue
+import threading
+
+import customtkinter as ctk
+from tkinter import filedialog, ttk
+
+from gui.get_passcode_v2 import (
+    MidwayAuthHelper,
+    PasscodeClient,
+    Region,
+    describe_passcode,
+    fetch_passcodes_bulk,
+    get_passcode,
+    parse_serial_list,
+    parse_sn,
+)
+
+
+class PasscodeApp(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        self.title("Passcode Retriever")
+        self.geometry("400x350")
+        self.resizable(False, False)
+
+        # Serial Number Input
+        self.serial_label = ctk.CTkLabel(self, text="Device Serial Number:")
+        self.serial_label.pack(pady=(20, 5))
+        self.serial_entry = ctk.CTkEntry(self, width=300)
+        self.serial_entry.pack(pady=5)
+
+        # Region Selection
+        self.region_label = ctk.CTkLabel(self, text="Select Region:")
+        self.region_label.pack(pady=(20, 5))
+        self.region_var = ctk.StringVar(value="us-east-1")
+        regions = [region.value for region in Region]
+        self.region_dropdown = ctk.CTkOptionMenu(self, values=regions, variable=self.region_var)
+        self.region_dropdown.pack(pady=5)
+
+        # Submit Button
+        self.submit_button = ctk.CTkButton(self, text="Get Passcode", command=self.fetch_passcode)
+        self.submit_button.pack(pady=(20, 10))
+
+        # Bulk Mode Button
+        self.bulk_button = ctk.CTkButton(self, text="Bulk Mode", command=self.open_bulk_window)
+        self.bulk_button.pack(pady=(0, 10))
+
+        # Result Display
+        self.result_label = ctk.CTkLabel(self, text="", text_color="green")
+        self.result_label.pack(pady=5)
+
+        # Error Display
+        self.error_label = ctk.CTkLabel(self, text="", text_color="red")
+        self.error_label.pack(pady=5)
+
+        # Duplicate clicks and repeated lookups of the same device share one request
+        self.passcode_client = PasscodeClient(get_passcode)
+
+        # Initialize MidwayAuthHelper in the background once the window has been drawn
+        self.midway_helper = None
+        self.midway_error = None
+        self.midway_ready = threading.Event()
+        self.after_idle(self.start_midway_auth)
+
+    def start_midway_auth(self):
+        def authenticate():
+            try:
+                self.midway_helper = MidwayAuthHelper()
+            except SystemExit:
+                # _get_cookies exits when the Midway cookie is missing; keep the window usable.
+                self.midway_error = "Midway token not found. Please run 'mwinit --aea' and restart."
+            except Exception as e:
+                self.midway_error = str(e)
+            finally:
+                self.midway_ready.set()
+            if self.midway_error:
+                self.update_result(f"Authentication failed: {self.midway_error}", error=True)
+
+        threading.Thread(target=authenticate, daemon=True).start()
+
+    def wait_for_midway_helper(self):
+        self.midway_ready.wait()
+        if self.midway_helper is None:
+            raise RuntimeError(f"Authentication failed: {self.midway_error}")
+        return self.midway_helper
+
+    def fetch_passcode(self):
+        serial_number = self.serial_entry.get().strip()
+        region = self.region_var.get()
+
+        if not serial_number:
+            self.error_label.configure(text="Please enter a serial number.")
+            self.result_label.configure(text="")
+            return
+
+        parsed_sn = parse_sn(serial_number)
+        if not parsed_sn:
+            self.error_label.configure(text="Invalid serial number format.")
+            self.result_label.configure(text="")
+            return
+
+        self.error_label.configure(text="")
+        self.result_label.configure(text="Fetching passcode...")
+
+        # Run in a separate thread to avoid blocking the GUI
+        threading.Thread(target=self.retrieve_passcode, args=(parsed_sn, region), daemon=True).start()
+
+    def retrieve_passcode(self, serial_number, region):
+        region_enum = next((r for r in Region if r.value == region), None)
+        if not region_enum:
+            self.update_result("Selected region is invalid.", error=True)
+            return
+
+        try:
+            midway_helper = self.wait_for_midway_helper()
+        except RuntimeError as e:
+            self.update_result(str(e), error=True)
+            return
+
+        region, data = self.passcode_client.get(serial_number, region, midway_helper)
+
+        if "error" in data:
+            self.update_result(f"Error: {data['error']}", error=True)
+        else:
+            if "desired" in data and data["reported"] != data["desired"]:
+                message = f"Current passcode: {data['reported']}\nUpcoming passcode: {data['desired']}"
+            else:
+                message = f"Passcode: {data['reported']}"
+            self.update_result(message, error=False)
+
+    def update_result(self, message, error=False):
+        if error:
+            self.error_label.configure(text=message)
+            self.result_label.configure(text="")
+        else:
+            self.result_label.configure(text=message)
+            self.error_label.configure(text="")
+
+    def open_bulk_window(self):
+        BulkPasscodeWindow(self, self.wait_for_midway_helper, self.passcode_client)
+
+
+class BulkPasscodeWindow(ctk.CTkToplevel):
+    columns = ("serial", "region", "current", "upcoming", "error")
+
+    def __init__(self, parent, get_midway_helper, passcode_client=None):
+        super().__init__(parent)
+        self.title("Bulk Passcode Retriever")
+        self.geometry("760x560")
+        self.get_midway_helper = get_midway_helper
+        self.passcode_client = passcode_client
+        self.results = []
+        self.result_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(3, weight=1)
+
+        # Serial Numbers Input
+        input_label = ctk.CTkLabel(self, text="Serial numbers (one per line, or load a CSV):")
+        input_label.grid(row=0, column=0, padx=10, pady=(10, 5), sticky="w")
+        self.serials_textbox = ctk.CTkTextbox(self, height=120)
+        self.serials_textbox.grid(row=1, column=0, padx=10, pady=5, sticky="ew")
+
+        # Controls
+        controls = ctk.CTkFrame(self)
+        controls.grid(row=2, column=0, padx=10, pady=5, sticky="ew")
+        self.load_button = ctk.CTkButton(controls, text="Load CSV", width=90, command=self.load_csv)
+        self.load_button.pack(side="left", padx=5, pady=5)
+        self.region_var = ctk.StringVar(value="auto")
+        regions = ["auto"] + [region.value for region in Region]
+        self.region_dropdown = ctk.CTkOptionMenu(controls, values=regions, variable=self.region_var, width=140)
+        self.region_dropdown.pack(side="left", padx=5, pady=5)
+        self.workers_var = ctk.StringVar(value="8")
+        self.workers_entry = ctk.CTkEntry(controls, textvariable=self.workers_var, width=40)
+        self.workers_entry.pack(side="left", padx=5, pady=5)
+        workers_label = ctk.CTkLabel(controls, text="workers")
+        workers_label.pack(side="left", padx=(0, 5), pady=5)
+        self.start_button = ctk.CTkButton(controls, text="Get Passcodes", width=110, command=self.start)
+        self.start_button.pack(side="left", padx=5, pady=5)
+        self.cancel_button = ctk.CTkButton(controls, text="Cancel", width=70, command=self.cancel_event.set)
+        self.cancel_button.pack(side="left", padx=5, pady=5)
+        self.export_button = ctk.CTkButton(controls, text="Export CSV", width=90, command=self.export_csv)
+        self.export_button.pack(side="left", padx=5, pady=5)
+
+        # Results Table
+        self.table = ttk.Treeview(self, columns=self.columns, show="headings")
+        for column in self.columns:
+            self.table.heading(column, text=column.title())
+            self.table.column(column, width=120 if column != "error" else 220)
+        self.table.grid(row=3, column=0, padx=10, pady=5, sticky="nsew")
+
+        # Status Display
+        self.status_label = ctk.CTkLabel(self, text="", anchor="w")
+        self.status_label.grid(row=4, column=0, padx=10, pady=(0, 10), sticky="ew")
+
+    def load_csv(self):
+        path = filedialog.askopenfilename(parent=self, filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        with open(path, "r", newline="") as file:
+            self.serials_textbox.delete("1.0", "end")
+            self.serials_textbox.insert("1.0", file.read())
+
+    def start(self):
+        serial_numbers = parse_serial_list(self.serials_textbox.get("1.0", "end"))
+        if not serial_numbers:
+            self.status_label.configure(text="No valid serial numbers found.")
+            return
+        try:
+            max_workers = max(1, int(self.workers_var.get()))
+        except ValueError:
+            max_workers = 8
+
+        self.results = []
+        self.table.delete(*self.table.get_children())
+        self.cancel_event.clear()
+        self.start_button.configure(state="disabled")
+        self.total = len(serial_numbers)
+        self.status_label.configure(text=f"Fetching {self.total} passcodes...")
+
+        def run():
+            try:
+                midway_helper = self.get_midway_helper()
+            except RuntimeError as e:
+                for serial_number in serial_numbers:
+                    self.result_queue.put((serial_number, None, {"error": str(e)}))
+                self.result_queue.put(None)
+                return
+            fetch_passcodes_bulk(
+                serial_numbers,
+                self.region_var.get(),
+                midway_helper,
+                max_workers=max_workers,
+                on_result=lambda *result: self.result_queue.put(result),
+                cancel_event=self.cancel_event,
+                client=self.passcode_client,
+            )
+            self.result_queue.put(None)
+
+        threading.Thread(target=run, daemon=True).start()
+        self.after(100, self.drain_results)
+
+    def drain_results(self):
+        finished = False
+        while True:
+            try:
+                result = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+            if result is None:
+                finished = True
+                break
+            self.add_result(*result)
+
+        failures = sum(1 for _, _, data in self.results if "error" in data)
+        if finished:
+            self.start_button.configure(state="normal")
+            self.status_label.configure(text=f"Done: {len(self.results)} devices, {failures} failed.")
+        else:
+            self.status_label.configure(text=f"{len(self.results)}/{self.total} done, {failures} failed...")
+            self.after(100, self.drain_results)
+
+    def add_result(self, serial_number, region, data):
+        self.results.append((serial_number, region, data))
+        if "error" in data:
+            row = (serial_number, str(region or ""), "", "", data["error"])
+        else:
+            current, upcoming = describe_passcode(data)
+            row = (serial_number, str(region), current, upcoming, "")
+        self.table.insert("", "end", values=row)
+
+    def export_csv(self):
+        if not self.results:
+            self.status_label.configure(text="Nothing to export yet.")
+            return
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.columns)
+            for item in self.table.get_children():
+                writer.writerow(self.table.item(item, "values"))
+        self.status_label.configure(text=f"Exported {len(self.results)} rows to {path}")
@@ -0,0 +1,138 @@
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool:
+    """
+    Keeps one keep-alive `requests.Session` per endpoint (scheme and host) so that
+    repeated calls reuse TCP and TLS connections instead of handshaking every time.
+    """
+
+    def __init__(self, pool_connections=4, pool_maxsize=16):
+        """
+        Initializes the pool.
+
+        Args:
+            pool_connections (int): Number of host connection pools cached per session.
+            pool_maxsize (int): Maximum keep-alive connections per host, i.e. the number of
+                threads that can use one endpoint concurrently without opening new sockets.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """
+        Returns the shared session for the endpoint of `url`.
+
+        Args:
+            url (str): Any URL on the endpoint.
+
+        Returns:
+            requests.Session: The pooled session.
+        """
+        parsed = urlparse(url)
+        endpoint = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            session = self._sessions.get(endpoint)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[endpoint] = session
+                logging.debug(f"Created pooled HTTP session for {endpoint}.")
+            return session
+
+    def close(self):
+        """
+        Closes every pooled session and its connections.
+        """
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            session.close()
+
+
+class SignerCache:
+    """
+    Reuses SigV4 signers for as long as the credentials they were built from are
+    in use. When credentials rotate, the signer for the old ones is dropped.
+    """
+
+    def __init__(self, factory=None):
+        """
+        Initializes the cache.
+
+        Args:
+            factory (function): Builds a signer from (access, secret, region, service,
+                session_token=...). Defaults to `requests_aws4auth.AWS4Auth`.
+        """
+        if factory is None:
+            from requests_aws4auth import AWS4Auth
+            factory = AWS4Auth
+        self.factory = factory
+        self._signers = {}
+        self._lock = threading.Lock()
+
+    def get(self, access_key_id, secret_key, session_token, region, service="execute-api"):
+        """
+        Returns a signer for the credentials, building one only when they changed.
+
+        Args:
+            access_key_id (str): AWS access key id.
+            secret_key (str): AWS secret key.
+            session_token (str): AWS session token.
+            region (str): Region the requests are signed for.
+            service (str): Service name the requests are signed for.
+
+        Returns:
+            AWS4Auth: Signer usable as the `auth=` argument of requests.
+        """
+        scope = (region, service)
+        credentials = (access_key_id, secret_key, session_token)
+        with self._lock:
+            entry = self._signers.get(scope)
+            if entry is not None and entry[0] == credentials:
+                return entry[1]
+            signer = self.factory(access_key_id, secret_key, region, service, session_token=session_token)
+            self._signers[scope] = (credentials, signer)
+            return signer
+
+
+_session_pool = None
+_signer_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_session_pool():
+    """
+    Returns the shared HTTP session pool.
+
+    Returns:
+        SessionPool: The shared pool.
+    """
+    global _session_pool
+    with _shared_lock:
+        if _session_pool is None:
+            _session_pool = SessionPool()
+        return _session_pool
+
+
+def get_signer_cache():
+    """
+    Returns the shared SigV4 signer cache.
+
+    Returns:
+        SignerCache: The shared cache.
+    """
+    global _signer_cache
+    with _shared_lock:
+        if _signer_cache is None:
+            _signer_cache = SignerCache()
+        return _signer_cache
@@ -0,0 +1,241 @@
+"""
+Registry of known security keys. Enumerated HID devices are matched with a frozen
+hash index on (idVendor, idProduct); devices not in the index fall back to serial
+number prefixes and then to the FIDO usage page. Extra definitions can be added
+without code changes through a JSON data file:
+
+    [
+        {"name": "Example Key", "idVendor": "0x1234", "idProduct": "0x5678"},
+        {"name": "Example Key (serial)", "serial_prefixes": ["EXK"]}
+    ]
+"""
+import json
+import logging
+import os
+import threading
+import types
+from collections import namedtuple
+from constants import KNOWN_SECURITY_KEYS
+from lazy_import import lazy_import
+
+hid = lazy_import("hid")
+
+FIDO_USAGE_PAGE = 0xF1D0
+DEFAULT_DEFINITIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "security_keys.json")
+
+KeyDefinition = namedtuple("KeyDefinition", ["name", "idVendor", "idProduct", "serial_prefixes"])
+# Product strings read from a device; cached per device path.
+Descriptor = namedtuple("Descriptor", ["manufacturer", "product", "serial_number"])
+
+
+def _parse_id(value):
+    if value is None or isinstance(value, int):
+        return value
+    return int(str(value), 0)
+
+
+def load_definitions(path=DEFAULT_DEFINITIONS_FILE):
+    """
+    Loads extra key definitions from a JSON data file.
+
+    Args:
+        path (str): Path to the JSON file. A missing file yields no definitions.
+
+    Returns:
+        list: KeyDefinition entries.
+    """
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as f:
+            entries = json.load(f)
+    except Exception as e:
+        logging.exception(f"Error loading security key definitions from {path}: {e}")
+        return []
+    definitions = []
+    for entry in entries:
+        try:
+            definitions.append(KeyDefinition(
+                entry["name"],
+                _parse_id(entry.get("idVendor")),
+                _parse_id(entry.get("idProduct")),
+                tuple(entry.get("serial_prefixes", ())),
+            ))
+        except (KeyError, ValueError, TypeError) as e:
+            logging.info(f"Skipping invalid security key definition {entry!r}: {e}")
+    return definitions
+
+
+def _from_constants(keys):
+    return [
+        KeyDefinition(key['name'], key.get('idVendor'), key.get('idProduct'), tuple(key.get('serial_prefixes', ())))
+        for key in keys
+    ]
+
+
+class DescriptorCache:
+    """
+    Caches product strings read from devices by device path, so repeated scans do
+    not reopen a device that is still connected.
+    """
+
+    def __init__(self, reader=None):
+        """
+        Args:
+            reader (function): Returns a Descriptor for a device path (default: reads it through hidapi).
+        """
+        self.reader = reader or read_descriptor
+        self.reads = 0
+        self._descriptors = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Returns the cached descriptor for a device path, reading it on first use.
+
+        Args:
+            path (bytes): HID device path.
+
+        Returns:
+            Descriptor: The device strings, or None if the device could not be read.
+        """
+        with self._lock:
+            if path in self._descriptors:
+                return self._descriptors[path]
+        self.reads += 1
+        try:
+            descriptor = self.reader(path)
+        except Exception as e:
+            logging.info(f"Could not read HID descriptor for {path!r}: {e}")
+            descriptor = None
+        with self._lock:
+            self._descriptors[path] = descriptor
+        return descriptor
+
+    def prune(self, connected_paths):
+        """
+        Drops entries for devices that are no longer connected. Paths can be reused
+        by a different device after unplugging, so stale entries must not survive.
+
+        Args:
+            connected_paths (iterable): Paths of the currently connected devices.
+        """
+        connected_paths = set(connected_paths)
+        with self._lock:
+            for path in list(self._descriptors):
+                if path not in connected_paths:
+                    del self._descriptors[path]
+
+
+def read_descriptor(path):
+    """
+    Opens a HID device and reads its manufacturer, product and serial number strings.
+
+    Args:
+        path (bytes): HID device path.
+
+    Returns:
+        Descriptor: The device strings.
+    """
+    device = hid.device()
+    device.open_path(path)
+    try:
+        return Descriptor(device.get_manufacturer_string(), device.get_product_string(), device.get_serial_number_string())
+    finally:
+        device.close()
+
+
+class SecurityKeyRegistry:
+    """
+    Matches enumerated HID devices to known security keys.
+    """
+
+    def __init__(self, definitions, descriptor_cache=None):
+        """
+        Builds the lookup indexes. When two definitions share an (idVendor, idProduct)
+        pair the first one wins and the conflict is logged.
+
+        Args:
+            definitions (list): KeyDefinition entries.
+            descriptor_cache (DescriptorCache): Cache for strings missing from enumeration results.
+        """
+        index = {}
+        serial_prefixes = []
+        for definition in definitions:
+            if definition.idVendor is not None and definition.idProduct is not None:
+                ids = (definition.idVendor, definition.idProduct)
+                if ids in index:
+                    logging.info(
+                        f"Conflicting security key definitions for 0x{ids[0]:04x}:0x{ids[1]:04x}: "
+                        f"keeping '{index[ids].name}', ignoring '{definition.name}'."
+                    )
+                    continue
+                index[ids] = definition
+            for prefix in definition.serial_prefixes:
+                serial_prefixes.append((prefix, definition))
+        self.index = types.MappingProxyType(index)
+        # Longest prefix first so a more specific definition wins.
+        self.serial_prefixes = tuple(sorted(serial_prefixes, key=lambda item: len(item[0]), reverse=True))
+        self.descriptor_cache = descriptor_cache or DescriptorCache()
+
+    def lookup(self, device):
+        """
+        Returns the name of the security key matching an enumerated HID device.
+
+        Args:
+            device (dict): Device descriptor as returned by `hid.enumerate()`.
+
+        Returns:
+            str: The key name, or None if the device is not a security key.
+        """
+        definition = self.index.get((device.get('vendor_id'), device.get('product_id')))
+        if definition is not None:
+            return definition.name
+
+        serial = device.get('serial_number')
+        if serial is None and self.serial_prefixes and device.get('path') is not None:
+            descriptor = self.descriptor_cache.get(device['path'])
+            serial = descriptor.serial_number if descriptor else None
+        if serial:
+            for prefix, definition in self.serial_prefixes:
+                if serial.startswith(prefix):
+                    return definition.name
+
+        if device.get('usage_page') == FIDO_USAGE_PAGE:
+            return self.product_string(device) or "FIDO Security Key"
+        return None
+
+    def product_string(self, device):
+        """
+        Returns the product string of a device, reading it only when enumeration did not provide it.
+
+        Args:
+            device (dict): Device descriptor as returned by `hid.enumerate()`.
+
+        Returns:
+            str: The product string, or None.
+        """
+        if device.get('product_string'):
+            return device['product_string']
+        if device.get('path') is None:
+            return None
+        descriptor = self.descriptor_cache.get(device['path'])
+        return descriptor.product if descriptor else None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_key_registry():
+    """
+    Returns the shared registry built from KNOWN_SECURITY_KEYS plus the definitions data file.
+
+    Returns:
+        SecurityKeyRegistry: The shared registry.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SecurityKeyRegistry(_from_constants(KNOWN_SECURITY_KEYS) + load_definitions())
+        return _registry
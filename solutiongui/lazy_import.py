@@ -0,0 +1,58 @@
+import importlib
+import logging
+import threading
+import time
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module placeholder that imports the real module on first attribute access, so
+    heavy dependencies cost nothing until the feature using them is first used.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    logging.debug(f"Lazily imported {self.__name__} in {(time.perf_counter() - started) * 1000:.1f} ms.")
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self):
+        """
+        bool: True once the real module has been imported.
+        """
+        return self.__dict__["_lazy_module"] is not None
+
+
+def lazy_import(name):
+    """
+    Returns a placeholder for `name` that is imported on first use.
+
+    Missing optional dependencies therefore raise ImportError at first use instead of
+    at application startup.
+
+    Args:
+        name (str): Dotted module name, e.g. "playwright.async_api".
+
+    Returns:
+        LazyModule: The placeholder.
+    """
+    return LazyModule(name)
@@ -1,11 +1,280 @@
+"""
+Application logging. Log calls only put the record on a bounded queue; a
+QueueListener thread does the file, terminal and GUI textbox output, so the monitor,
+Playwright and passcode threads never wait on I/O or on Tk.
+"""
+import atexit
+import collections
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.DEBUG,  # Capture all debug messages
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('link_opener.log'),
-            logging.StreamHandler()  # Output logs to the terminal
-        ]
-    ) 
\ No newline at end of file
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_FILE = 'link_opener.log'
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue. When the queue is full the overflow policy decides
+    what is lost: "drop_oldest" discards the oldest queued record, "drop_newest" discards
+    the new one and "block" waits up to `block_timeout`. Records at `block_level` or above
+    always wait up to `block_timeout` rather than being dropped. The number of dropped
+    records is reported in a warning once the queue has room again.
+    """
+
+    def __init__(self, log_queue, overflow="drop_oldest", block_timeout=0.1, block_level=logging.ERROR):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}'. Expected one of {OVERFLOW_POLICIES}.")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.block_level = block_level
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Merge args into the message on the calling thread, since they may be mutated after
+        # the call returns, but leave timestamp and level formatting to the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.dropped:
+            self._report_drops()
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow == "block" or record.levelno >= self.block_level:
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+                return
+            except queue.Full:
+                pass
+        elif self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self._count_drop()
+                self.queue.put_nowait(record)
+                return
+            except (queue.Empty, queue.Full):
+                pass
+        self._count_drop()
+
+    def _count_drop(self):
+        with self._drop_lock:
+            self.dropped += 1
+
+    def _report_drops(self):
+        with self._drop_lock:
+            dropped, self.dropped = self.dropped, 0
+        if not dropped:
+            return
+        record = logging.LogRecord(
+            "logger", logging.WARNING, __file__, 0,
+            f"Log queue full: dropped {dropped} log record(s).", None, None
+        )
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += dropped
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener whose stop sentinel waits for room in a bounded queue instead of failing.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that also rolls the file over once it is `max_age_seconds` old.
+    """
+
+    def __init__(self, filename, max_bytes=5 * 1024 * 1024, backup_count=5, max_age_seconds=None, **kwargs):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, **kwargs)
+        self.max_age_seconds = max_age_seconds
+        self.rollover_at = time.time() + max_age_seconds if max_age_seconds else None
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.max_age_seconds:
+            self.rollover_at = time.time() + self.max_age_seconds
+
+
+class TextBoxHandler(logging.Handler):
+    """
+    Buffers formatted records and writes them into a Tk textbox in one insert per frame.
+    `emit` runs on the listener thread and only appends to the buffer; the widget is
+    touched exclusively by the `after()` pump on the Tk thread.
+    """
+
+    def __init__(self, textbox, frame_ms=50, max_buffered=1000, max_lines=2000):
+        """
+        Args:
+            textbox (ctk.CTkTextbox): Widget receiving the log lines.
+            frame_ms (int): Flush interval in milliseconds.
+            max_buffered (int): Records kept between flushes; older ones are discarded.
+            max_lines (int): Lines kept in the widget; older ones are trimmed.
+        """
+        super().__init__()
+        self.textbox = textbox
+        self.frame_ms = frame_ms
+        self.max_lines = max_lines
+        self.buffer = collections.deque(maxlen=max_buffered)
+        self._running = False
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def start(self):
+        """
+        Starts the flush pump. Must be called on the Tk thread.
+        """
+        if not self._running:
+            self._running = True
+            self.textbox.after(self.frame_ms, self._flush)
+
+    def stop(self):
+        self._running = False
+
+    def _flush(self):
+        if not self._running:
+            return
+        lines = []
+        while self.buffer:
+            lines.append(self.buffer.popleft())
+        if lines:
+            try:
+                self.textbox.configure(state="normal")
+                self.textbox.insert("end", "\n".join(lines) + "\n")
+                line_count = int(self.textbox.index("end-1c").split(".")[0])
+                if line_count > self.max_lines:
+                    self.textbox.delete("1.0", f"{line_count - self.max_lines}.0")
+                self.textbox.configure(state="disabled")
+                self.textbox.see("end")
+            except Exception:
+                # The widget has been destroyed; stop writing to it.
+                self._running = False
+                return
+        self.textbox.after(self.frame_ms, self._flush)
+
+
+def setup_logging(log_file=LOG_FILE, level=logging.DEBUG, queue_size=10000, overflow="drop_oldest",
+                  max_bytes=5 * 1024 * 1024, backup_count=5, max_age_seconds=None):
+    """
+    Routes root logger output through a bounded queue to a rotating log file and the terminal.
+    Calling it again returns the running listener.
+
+    Args:
+        log_file (str): Log file path.
+        level (int): Root logger level.
+        queue_size (int): Maximum records waiting to be written.
+        overflow (str): Overflow policy, see BoundedQueueHandler.
+        max_bytes (int): Rotate the log file once it reaches this size.
+        backup_count (int): Number of rotated files to keep.
+        max_age_seconds (float): Also rotate the log file after this many seconds (optional).
+
+    Returns:
+        logging.handlers.QueueListener: The listener writing the records.
+    """
+    global _listener
+    with _listener_lock:
+        root = logging.getLogger()
+        for handler in root.handlers:
+            if isinstance(handler, BoundedQueueHandler) and getattr(handler, "listener", None):
+                _listener = handler.listener
+                return _listener
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = SizeAndTimeRotatingFileHandler(log_file, max_bytes, backup_count, max_age_seconds)
+        stream_handler = logging.StreamHandler()  # Output logs to the terminal
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(maxsize=queue_size)
+        queue_handler = BoundedQueueHandler(log_queue, overflow=overflow)
+        _listener = BoundedQueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+        queue_handler.listener = _listener
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def add_textbox_handler(textbox, level=logging.INFO, frame_ms=50):
+    """
+    Mirrors log output into a GUI textbox. Must be called on the Tk thread after `setup_logging`.
+
+    Args:
+        textbox (ctk.CTkTextbox): Widget receiving the log lines.
+        level (int): Minimum level shown in the widget.
+        frame_ms (int): Flush interval in milliseconds.
+
+    Returns:
+        TextBoxHandler: The handler; call `remove_textbox_handler` before destroying the widget.
+    """
+    listener = setup_logging()
+    handler = TextBoxHandler(textbox, frame_ms=frame_ms)
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener.handlers = listener.handlers + (handler,)
+    handler.start()
+    logging.info("TextBoxHandler added to logger.")
+    return handler
+
+
+def remove_textbox_handler(handler):
+    """
+    Detaches a handler returned by `add_textbox_handler`.
+
+    Args:
+        handler (TextBoxHandler): The handler to remove.
+    """
+    handler.stop()
+    if _listener is not None:
+        _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+
+
+def shutdown_logging():
+    """
+    Writes out queued records and stops the listener thread.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, BoundedQueueHandler):
+                root.removeHandler(handler)
+        if _listener._thread is not None:
+            _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -1,8 +1,11 @@
 # notification_manager.py
 
-from plyer import notification
 import logging
-from win10toast import ToastNotifier
+from lazy_import import lazy_import
+
+# Notification backends load when the first notification is shown.
+plyer = lazy_import("plyer")
+win10toast = lazy_import("win10toast")
 
 def show_notification(title, message, app_icon=None, timeout=5):
     """
@@ -15,7 +18,7 @@ def show_notification(title, message, app_icon=None, timeout=5):
         timeout (int, optional): Duration in seconds for which the notification is displayed. Defaults to 5.
     """
     try:
-        notification.notify(
+        plyer.notification.notify(
             title=title,
             message=message,
             app_icon=app_icon,
@@ -23,7 +26,7 @@ def show_notification(title, message, app_icon=None, timeout=5):
         )
     except NotImplementedError:
         try:
-            toaster = ToastNotifier()
+            toaster = win10toast.ToastNotifier()
             toaster.show_toast(title, message, duration=timeout, threaded=True)
         except Exception as e:
             logging.error(f"Failed to show notification: {e}")
@@ -0,0 +1,216 @@
+"""
+Batch headless mode: runs many page tasks (title checks, report fetches, link health
+checks) concurrently in one headless browser, each in its own context, with a
+concurrency limit and a per-task timeout. Pages load with their link's route profile
+(see route_profiles.py). A batch takes about as long as its slowest pages rather than
+the sum of all of them.
+
+Usage (from the solutiongui directory):
+    python page_tasks.py --concurrency 8 --timeout 30
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections import namedtuple
+from constants import LINKS
+from browser_pool import BrowserPool, browser_settings
+from automation_loop import get_automation_loop
+from event_log import emit_event
+from route_profiles import navigate
+
+SUCCESS = "success"
+FAILURE = "failure"
+TIMEOUT = "timeout"
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT_MS = 30000
+
+
+async def page_title(page, response):
+    """
+    Default task action: returns the page title.
+    """
+    return await page.title()
+
+
+async def page_content_length(page, response):
+    """
+    Task action for report fetches: returns the size of the rendered HTML.
+    """
+    return len(await page.content())
+
+
+# `action(page, response)` runs after navigation; its return value is the result's `value`.
+PageTask = namedtuple("PageTask", ["name", "url", "action"], defaults=(page_title,))
+PageTaskResult = namedtuple("PageTaskResult", ["name", "url", "outcome", "status", "value", "error", "duration_ms"])
+
+
+class BatchReport:
+    """
+    Aggregated results of a batch.
+    """
+
+    def __init__(self, results, wall_ms):
+        self.results = results
+        self.wall_ms = wall_ms
+
+    @property
+    def failed(self):
+        return [result for result in self.results if result.outcome != SUCCESS]
+
+    def summary(self):
+        """
+        Returns the batch totals. `speedup` compares the summed task durations with
+        the wall time of the batch.
+
+        Returns:
+            dict: Batch totals.
+        """
+        outcomes = [result.outcome for result in self.results]
+        total_ms = sum(result.duration_ms for result in self.results)
+        return {
+            "tasks": len(self.results),
+            "succeeded": outcomes.count(SUCCESS),
+            "failed": outcomes.count(FAILURE),
+            "timed_out": outcomes.count(TIMEOUT),
+            "wall_ms": round(self.wall_ms, 1),
+            "slowest_ms": round(max((result.duration_ms for result in self.results), default=0.0), 1),
+            "sum_ms": round(total_ms, 1),
+            "speedup": round(total_ms / self.wall_ms, 2) if self.wall_ms else 0.0,
+        }
+
+
+def _is_timeout(error):
+    # Playwright raises its own TimeoutError class; match it by name so this module
+    # does not import Playwright.
+    return isinstance(error, asyncio.TimeoutError) or type(error).__name__ == "TimeoutError"
+
+
+async def _run_task(pool, task, timeout_ms):
+    async with pool.context() as context:
+        # The timeout starts once a context slot is free, so queued tasks are not penalised.
+        started = time.perf_counter()
+        status = value = error = None
+
+        async def navigate_and_run():
+            nonlocal status
+            page = await context.new_page()
+            response, _ = await navigate(page, task.url, task.name, timeout_ms)
+            status = response.status if response is not None else None
+            return await task.action(page, response)
+
+        try:
+            value = await asyncio.wait_for(navigate_and_run(), timeout_ms / 1000)
+            outcome = FAILURE if status is not None and status >= 400 else SUCCESS
+            if outcome == FAILURE:
+                error = f"HTTP {status}"
+        except Exception as e:
+            outcome = TIMEOUT if _is_timeout(e) else FAILURE
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        duration_ms = (time.perf_counter() - started) * 1000
+
+    result = PageTaskResult(task.name, task.url, outcome, status, value, error, duration_ms)
+    if outcome == SUCCESS:
+        logging.info(f"Page task {task.name} succeeded in {duration_ms:.0f} ms (status {status}).")
+    else:
+        logging.warning(f"Page task {task.name} {outcome}: {error}")
+    emit_event("page_task", outcome=outcome, duration_ms=duration_ms, name=task.name, url=task.url, status=status)
+    return result
+
+
+async def async_run_page_tasks(tasks, concurrency=DEFAULT_CONCURRENCY, timeout_ms=DEFAULT_TIMEOUT_MS,
+                               browser_type=None, pool=None):
+    """
+    Runs page tasks concurrently in a headless browser.
+
+    Args:
+        tasks (list): PageTask entries.
+        concurrency (int): Maximum number of pages open at the same time.
+        timeout_ms (int): Timeout per task (navigation plus action) in milliseconds.
+        browser_type (str): "chromium" or "firefox" (default: the saved setting).
+        pool (BrowserPool): Pool to use (default: a dedicated headless pool, closed afterwards).
+
+    Returns:
+        BatchReport: Results in task order.
+    """
+    owns_pool = pool is None
+    if owns_pool:
+        browser_type, _ = browser_settings(browser_type)
+        pool = BrowserPool(size=1, max_contexts=concurrency, headless=True, browser_type=browser_type)
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(_run_task(pool, task, timeout_ms) for task in tasks))
+    finally:
+        if owns_pool:
+            await pool.close()
+    report = BatchReport(list(results), (time.perf_counter() - started) * 1000)
+    summary = report.summary()
+    logging.info(f"Page batch finished: {summary}")
+    emit_event("page_batch", outcome=SUCCESS if not report.failed else FAILURE,
+               duration_ms=report.wall_ms, **{key: value for key, value in summary.items() if key != "wall_ms"})
+    return report
+
+
+def link_health_tasks(links=None):
+    """
+    Builds title-check tasks for every entry in LINKS (or the given name -> URL mapping).
+
+    Returns:
+        list: PageTask entries.
+    """
+    links = LINKS if links is None else links
+    return [PageTask(name, url) for name, url in links.items()]
+
+
+def run_page_tasks(tasks, timeout=None, **kwargs):
+    """
+    Runs `async_run_page_tasks` on the shared automation loop and waits for the report.
+
+    Args:
+        tasks (list): PageTask entries.
+        timeout (float): Maximum seconds to wait for the whole batch (optional).
+        **kwargs: Keyword arguments for `async_run_page_tasks`.
+
+    Returns:
+        BatchReport: The batch results.
+    """
+    future = get_automation_loop().submit(async_run_page_tasks, tasks, block=True, **kwargs)
+    return future.result(timeout)
+
+
+def check_links(links=None, **kwargs):
+    """
+    Health-checks every dashboard link in parallel.
+
+    Args:
+        links (dict): Name -> URL mapping (default: LINKS).
+        **kwargs: Keyword arguments for `async_run_page_tasks`.
+
+    Returns:
+        BatchReport: The batch results.
+    """
+    return run_page_tasks(link_health_tasks(links), **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Health-check every link in LINKS with a headless browser.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Pages open at once.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_MS / 1000, help="Seconds per page.")
+    parser.add_argument("--browser", choices=["chromium", "firefox"], help="Browser (default: saved setting).")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(async_run_page_tasks(
+        link_health_tasks(), concurrency=args.concurrency, timeout_ms=int(args.timeout * 1000),
+        browser_type=args.browser,
+    ))
+    for result in report.results:
+        detail = result.value if result.outcome == SUCCESS else result.error
+        print(f"{result.outcome:8} {result.duration_ms:8.0f} ms  {result.name}: {detail}")
+    print(report.summary(), file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Passcode lookups with request coalescing and a short-lived result cache.
+
+Lookups for the same (serial, region) that arrive while one is already running wait
+for that lookup instead of starting their own Midway -> Cognito -> device-admin chain,
+so a double-clicked "Get Passcode" or two techs asking for the same device cost one
+request. Successful results are then reused for a few seconds.
+
+Only settled passcodes are cached: when the device-admin response has a `desired`
+passcode that differs from `reported`, a rotation is pending and the device may switch
+to the new passcode at any moment, so the result is returned but any cached entry for
+the device is dropped. Errors are never cached.
+"""
+import logging
+import threading
+import time
+
+DEFAULT_TTL_SECONDS = 30.0
+
+
+def rotation_pending(data):
+    """
+    Returns True if a device-admin response announces a passcode that is not active yet.
+
+    Args:
+        data (dict): Response with `reported` and optionally `desired`.
+    """
+    desired = data.get("desired")
+    return desired is not None and desired != data.get("reported")
+
+
+def is_cacheable(data):
+    """
+    Returns True if a lookup result may be served from the cache.
+    """
+    return isinstance(data, dict) and "error" not in data and "reported" in data and not rotation_pending(data)
+
+
+class _Flight:
+    """
+    A lookup in progress; followers wait on `done` and read `result` or `error`.
+    """
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class PasscodeClient:
+    """
+    Coalesces concurrent lookups per (serial, region) and caches settled results.
+    """
+
+    def __init__(self, fetch, ttl_seconds=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        """
+        Initializes the client.
+
+        Args:
+            fetch (function): Performs one lookup, called as `fetch(serial, region, *args)`;
+                must return (region, data) like `get_passcode`.
+            ttl_seconds (float): How long a settled result is reused (0 disables the cache).
+            clock (function): Monotonic time source.
+        """
+        self.fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._entries = {}
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(serial_number, region):
+        return serial_number, str(region)
+
+    def get(self, serial_number, region, *args):
+        """
+        Returns the passcode of a device, from the cache, from a lookup already in
+        flight for the same device, or from a new lookup.
+
+        Args:
+            serial_number (str): Normalised serial number.
+            region: Region value or enum member.
+            *args: Passed on to `fetch` (e.g. the MidwayAuthHelper).
+
+        Returns:
+            tuple: (region, data) as returned by `fetch`.
+        """
+        key = self._key(serial_number, region)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if self.clock() < expires_at:
+                    self.hits += 1
+                    return result
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self.fetch(serial_number, region, *args)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None:
+                    self._store(key, flight.result)
+            flight.done.set()
+            if flight.followers:
+                logging.info(f"Passcode lookup for {serial_number} in {region} served {flight.followers} "
+                             f"duplicate request(s).")
+        return flight.result
+
+    def _store(self, key, result):
+        data = result[1] if isinstance(result, tuple) and len(result) == 2 else None
+        if self.ttl_seconds > 0 and is_cacheable(data):
+            self._entries[key] = (result, self.clock() + self.ttl_seconds)
+        elif self._entries.pop(key, None) is not None and isinstance(data, dict) and rotation_pending(data):
+            self.dropped += 1
+            logging.info(f"Passcode rotation pending for {key[0]} in {key[1]}; dropped the cached passcode.")
+
+    def invalidate(self, serial_number=None, region=None):
+        """
+        Drops cached results for one device, or all of them when `serial_number` is None.
+
+        Args:
+            serial_number (str): Serial number to drop (optional).
+            region: Region to drop; None drops the device in every region.
+        """
+        with self._lock:
+            if serial_number is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                if key[0] == serial_number and (region is None or key[1] == str(region)):
+                    del self._entries[key]
+
+    def stats(self):
+        """
+        Returns:
+            dict: Cache hits, misses (lookups started), coalesced requests, entries dropped
+            because a rotation became pending, and the number of cached entries.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "entries": len(self._entries),
+            }
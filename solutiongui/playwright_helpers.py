@@ -1,24 +1,31 @@
 import asyncio
 import logging
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from browser_pool import browser_settings, launch_options
+from timing import span
 
-async def open_page(url, timeout=60000):
+async def open_page(url, timeout=60000, browser_type=None, headless=None):
     """
     Opens a URL using Playwright and returns the page object.
 
     Args:
         url (str): The URL to open.
         timeout (int): The timeout for page loading in milliseconds.
+        browser_type (str): "chromium" or "firefox" (default: the saved setting).
+        headless (bool): Whether to run headless (default: the saved setting).
 
     Returns:
         tuple: (page, context, browser, playwright)
     """
     try:
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(channel="chrome", headless=False, args=["--start-maximized"])
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto(url, timeout=timeout)
+        browser_type, headless = browser_settings(browser_type, headless)
+        with span("open_page.launch"):
+            playwright = await async_playwright().start()
+            browser = await getattr(playwright, browser_type).launch(**launch_options(browser_type, headless))
+            context = await browser.new_context()
+            page = await context.new_page()
+        with span("open_page.goto"):
+            await page.goto(url, timeout=timeout)
         logging.info(f"Opened URL: {url}")
         return page, context, browser, playwright
     except PlaywrightTimeoutError:
@@ -0,0 +1,325 @@
+import logging
+import random
+import threading
+import time
+
+# Exception class names treated as transient, matched anywhere in the exception's MRO so
+# that requests, botocore and Playwright errors are recognised without importing them.
+RETRYABLE_ERROR_NAMES = {
+    "TimeoutError",
+    "Timeout",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "ConnectionError",
+    "ConnectionResetError",
+    "EndpointConnectionError",
+}
+RETRYABLE_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "ServiceUnavailable",
+    "InternalErrorException",
+}
+# Browser network errors (Chromium "net::ERR_*", Firefox "NS_ERROR_*") that Playwright
+# raises as its generic `Error`; only the message tells them apart.
+RETRYABLE_NETWORK_ERRORS = (
+    "net::ERR_CONNECTION_RESET",
+    "net::ERR_CONNECTION_CLOSED",
+    "net::ERR_CONNECTION_ABORTED",
+    "net::ERR_CONNECTION_TIMED_OUT",
+    "net::ERR_TIMED_OUT",
+    "net::ERR_EMPTY_RESPONSE",
+    "net::ERR_NETWORK_CHANGED",
+    "NS_ERROR_NET_RESET",
+    "NS_ERROR_NET_INTERRUPT",
+    "NS_ERROR_NET_TIMEOUT",
+)
+
+
+class RetryableError(Exception):
+    """
+    Raise (or subclass) to mark a failure as transient.
+    """
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an endpoint whose circuit breaker is open.
+    """
+
+
+def is_retryable(exception):
+    """
+    Decides whether a failure is transient: timeouts, connection errors (including browser
+    network errors such as net::ERR_CONNECTION_RESET), HTTP 5xx and 429, and AWS throttling
+    errors. Client errors such as HTTP 4xx are not retried.
+
+    Args:
+        exception (Exception): The failure to classify.
+
+    Returns:
+        bool: True if the call may succeed when retried.
+    """
+    if isinstance(exception, RetryableError):
+        return True
+    if isinstance(exception, CircuitOpenError):
+        return False
+
+    response = getattr(exception, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if status_code is not None:
+        return status_code >= 500 or status_code == 429
+    if isinstance(response, dict):
+        error_code = response.get("Error", {}).get("Code")
+        status_code = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if error_code in RETRYABLE_ERROR_CODES:
+            return True
+        if status_code is not None:
+            return status_code >= 500 or status_code == 429
+
+    if any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(exception).__mro__):
+        return True
+    return is_retryable_network_error(exception)
+
+
+def is_retryable_network_error(exception):
+    """
+    Returns True only for browser network errors such as net::ERR_CONNECTION_RESET. Used
+    for page navigation, where a timeout has already spent the whole navigation timeout
+    and retrying it would double the wait.
+    """
+    message = str(exception)
+    return any(error in message for error in RETRYABLE_NETWORK_ERRORS)
+
+
+class RetryPolicy:
+    """
+    Describes how a call is retried: attempt limit, exponential backoff with full
+    jitter, total deadline and which errors qualify.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.2, max_delay=5.0, deadline=30.0, retryable=is_retryable):
+        """
+        Initializes the policy.
+
+        Args:
+            max_attempts (int): Total attempts including the first one.
+            base_delay (float): Backoff before the second attempt, in seconds.
+            max_delay (float): Upper bound of a single backoff, in seconds.
+            deadline (float): Total time budget for all attempts and backoffs, in seconds.
+            retryable (function): Returns True for exceptions worth retrying.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retryable = retryable
+
+    def backoff(self, attempt):
+        """
+        Returns the jittered delay before the next attempt.
+
+        Args:
+            attempt (int): Number of attempts made so far (1 after the first failure).
+
+        Returns:
+            float: Delay in seconds, uniformly drawn from [0, min(max_delay, base_delay * 2**(attempt - 1))].
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Stops calling an endpoint after repeated transient failures, then lets a single
+    trial call through once `reset_timeout` has passed.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Initializes the breaker in the closed state.
+
+        Args:
+            failure_threshold (int): Consecutive transient failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a trial call.
+            clock (function): Monotonic time source.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Returns True if a call may be made now.
+        """
+        with self._lock:
+            if self.state == "open" and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return self.state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_abandoned(self):
+        """
+        Records a call that ended without an outcome (cancelled or interrupted). A
+        half-open trial goes back to open with its original timestamp, so the next
+        `allow()` grants a new trial instead of blocking calls for good.
+        """
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logging.warning(f"Circuit opened after {self.failures} consecutive failures.")
+                self.state = "open"
+                self.opened_at = self.clock()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(key, **breaker_options):
+    """
+    Returns the shared circuit breaker for an endpoint, creating it on first use.
+
+    Args:
+        key (str): Endpoint identifier, e.g. the base URL.
+        **breaker_options: Arguments for a newly created `CircuitBreaker`.
+
+    Returns:
+        CircuitBreaker: The breaker for `key`.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(**breaker_options)
+            _breakers[key] = breaker
+        return breaker
+
+
+def _next_delay(policy, attempt, exception, started, clock):
+    """
+    Returns the backoff before the next attempt, or None if the failure must be raised.
+    """
+    if attempt >= policy.max_attempts or not policy.retryable(exception):
+        return None
+    delay = policy.backoff(attempt)
+    if clock() + delay - started >= policy.deadline:
+        return None
+    return delay
+
+
+def call_with_retry(func, policy=None, breaker=None, sleep=time.sleep, clock=time.monotonic):
+    """
+    Calls `func` until it succeeds or the policy gives up.
+
+    Args:
+        func (function): Called without arguments.
+        policy (RetryPolicy): Retry policy (default: `RetryPolicy()`).
+        breaker (CircuitBreaker): Breaker guarding the endpoint (optional).
+        sleep (function): Used to wait between attempts.
+        clock (function): Monotonic time source for the deadline.
+
+    Returns:
+        The result of `func`.
+
+    Raises:
+        CircuitOpenError: If the breaker is open.
+        Exception: The last failure when it is not retryable or the budget is exhausted.
+    """
+    policy = policy or RetryPolicy()
+    started = clock()
+    attempt = 0
+    while True:
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("Circuit breaker is open; endpoint temporarily skipped.")
+        attempt += 1
+        try:
+            result = func()
+        except Exception as e:
+            if breaker is not None:
+                # A non-transient failure still means the endpoint answered.
+                if policy.retryable(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            delay = _next_delay(policy, attempt, e, started, clock)
+            if delay is None:
+                raise
+            logging.debug(f"Attempt {attempt} failed ({type(e).__name__}: {e}); retrying in {delay:.2f}s.")
+            sleep(delay)
+        except BaseException:
+            # KeyboardInterrupt (or cancellation) says nothing about the endpoint.
+            if breaker is not None:
+                breaker.record_abandoned()
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+
+async def async_call_with_retry(coro_fn, policy=None, breaker=None, clock=time.monotonic):
+    """
+    Awaits `coro_fn()` until it succeeds or the policy gives up.
+
+    Args:
+        coro_fn (function): Coroutine function called without arguments.
+        policy (RetryPolicy): Retry policy (default: `RetryPolicy()`).
+        breaker (CircuitBreaker): Breaker guarding the endpoint (optional).
+        clock (function): Monotonic time source for the deadline.
+
+    Returns:
+        The result of `coro_fn()`.
+
+    Raises:
+        CircuitOpenError: If the breaker is open.
+        Exception: The last failure when it is not retryable or the budget is exhausted.
+    """
+    # Imported here so that sync callers such as cognito_client do not pay for asyncio.
+    import asyncio
+
+    policy = policy or RetryPolicy()
+    started = clock()
+    attempt = 0
+    while True:
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("Circuit breaker is open; endpoint temporarily skipped.")
+        attempt += 1
+        try:
+            result = await coro_fn()
+        except Exception as e:
+            if breaker is not None:
+                # A non-transient failure still means the endpoint answered.
+                if policy.retryable(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            delay = _next_delay(policy, attempt, e, started, clock)
+            if delay is None:
+                raise
+            logging.debug(f"Attempt {attempt} failed ({type(e).__name__}: {e}); retrying in {delay:.2f}s.")
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Cancellation (or KeyboardInterrupt) says nothing about the endpoint.
+            if breaker is not None:
+                breaker.record_abandoned()
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
@@ -0,0 +1,314 @@
+"""
+Request interception profiles for Playwright navigations.
+
+The automation only reads a few DOM elements (`#user_name`, `#password`, `#verify_btn`)
+or the page title, so most of what a page downloads is wasted. A profile decides which
+requests a page may make:
+
+    minimal    block images, media, fonts and requests to third-party hosts
+    full       allow everything
+    allowlist  allow only the first-party host and the `allow` host patterns
+
+Each link in LINKS gets a profile and a readiness condition (a selector, a URL pattern
+or a load state) that replaces waiting for network idle. Both can be overridden per link
+with the `route_profiles` setting, e.g.:
+
+    {"TICKETS LINK": {"profile": "allowlist", "allow": ["*.amazon.dev"], "ready": {"selector": "#list"}}}
+
+Bytes saved are estimated from the average size of loaded responses of the same
+resource type; time saved is measured against earlier `full` navigations of the link.
+"""
+import fnmatch
+import logging
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlparse
+from config_store import get_config_store
+from event_log import emit_event
+from timing import span
+
+HEAVY_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+RouteProfile = namedtuple("RouteProfile", ["name", "blocked_types", "block_third_party", "allowed_hosts"])
+# Exactly one of `selector`, `url` (glob) or `load_state` is set.
+ReadyCondition = namedtuple("ReadyCondition", ["selector", "url", "load_state"], defaults=(None, None, None))
+
+MINIMAL = RouteProfile("minimal", HEAVY_RESOURCE_TYPES, True, ())
+FULL = RouteProfile("full", frozenset(), False, ())
+PROFILES = {profile.name: profile for profile in (MINIMAL, FULL)}
+
+DOM_READY = ReadyCondition(load_state="domcontentloaded")
+PAGE_LOADED = ReadyCondition(load_state="load")
+
+# Link name -> settings; links not listed use DEFAULT_LINK_SETTINGS.
+DEFAULT_LINK_SETTINGS = {"profile": "minimal", "ready": {"load_state": "domcontentloaded"}}
+LINK_SETTINGS = {
+    # Reports are screenshotted in testing mode, so they load completely.
+    "REPORTS": {"profile": "full", "ready": {"load_state": "load"}},
+}
+
+
+def site_of(host):
+    """
+    Returns the last two labels of a host name (e.g. "amazon.com" for
+    "midway-auth.amazon.com"), used to tell first-party from third-party requests.
+
+    This is not a public-suffix lookup: under multi-part suffixes such as "co.uk" every
+    site collapses to the suffix ("amazon.co.uk" and "example.co.uk" both give "co.uk").
+    The linked tools live under .com and .dev; use the allowlist profile for others.
+    """
+    labels = (host or "").lower().rstrip(".").split(".")
+    return ".".join(labels[-2:])
+
+
+def allowlist_profile(hosts):
+    """
+    Builds a profile that only allows the first-party site and hosts matching `hosts`.
+
+    Args:
+        hosts (list): Host glob patterns such as "*.amazon.dev".
+
+    Returns:
+        RouteProfile: The profile.
+    """
+    return RouteProfile("allowlist", frozenset(), True, tuple(host.lower() for host in hosts))
+
+
+def is_allowed(profile, request_url, resource_type, first_party_site):
+    """
+    Decides whether a request may proceed under a profile.
+
+    Args:
+        profile (RouteProfile): Active profile.
+        request_url (str): URL of the request.
+        resource_type (str): Playwright resource type ("document", "image", ...).
+        first_party_site (str): `site_of()` the page's host.
+
+    Returns:
+        bool: True to let the request through.
+    """
+    if resource_type == "document":
+        return True
+    if resource_type in profile.blocked_types:
+        return False
+    if not profile.block_third_party:
+        return True
+    host = (urlparse(request_url).hostname or "").lower()
+    if not host or site_of(host) == first_party_site:
+        return True
+    return any(fnmatch.fnmatch(host, pattern) for pattern in profile.allowed_hosts)
+
+
+def _parse_ready(ready):
+    if not ready:
+        return DOM_READY
+    if isinstance(ready, ReadyCondition):
+        return ready
+    return ReadyCondition(ready.get("selector"), ready.get("url"), ready.get("load_state"))
+
+
+def link_settings(name):
+    """
+    Returns the profile and readiness condition for a link, applying the
+    `route_profiles` setting over the defaults.
+
+    Args:
+        name (str): Link name from LINKS (None for ad-hoc URLs).
+
+    Returns:
+        tuple: (RouteProfile, ReadyCondition)
+    """
+    settings = dict(DEFAULT_LINK_SETTINGS)
+    settings.update(LINK_SETTINGS.get(name, {}))
+    overrides = get_config_store().get("route_profiles") or {}
+    settings.update(overrides.get(name, {}))
+
+    profile_name = settings.get("profile", "minimal")
+    if profile_name == "allowlist":
+        profile = allowlist_profile(settings.get("allow", []))
+    elif profile_name in PROFILES:
+        profile = PROFILES[profile_name]
+    else:
+        logging.warning(f"Unknown route profile '{profile_name}' for {name}; using minimal.")
+        profile = MINIMAL
+    return profile, _parse_ready(settings.get("ready"))
+
+
+class NavigationStats:
+    """
+    Request counters for one navigation.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.requests = 0
+        self.blocked = 0
+        self.blocked_types = {}
+        self.bytes_loaded = 0
+        self.duration_ms = None
+        self.bytes_saved = None
+        self.ms_saved = None
+
+    def as_dict(self):
+        return {
+            "profile": self.profile.name,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "bytes_loaded": self.bytes_loaded,
+            "bytes_saved": self.bytes_saved,
+            "ms_saved": self.ms_saved,
+        }
+
+
+class SavingsTracker:
+    """
+    Learns what blocking saves: the average response size per resource type, and the
+    average duration of `full` navigations per link.
+    """
+
+    def __init__(self, smoothing=0.2):
+        self.smoothing = smoothing
+        self._type_bytes = {}
+        self._full_ms = {}
+        self._lock = threading.Lock()
+
+    def _average(self, table, key, value):
+        previous = table.get(key)
+        table[key] = value if previous is None else previous + self.smoothing * (value - previous)
+
+    def record_response(self, resource_type, size):
+        with self._lock:
+            self._average(self._type_bytes, resource_type, size)
+
+    def finish(self, name, stats):
+        """
+        Fills in the estimated savings of a finished navigation.
+
+        Args:
+            name (str): Link name (or URL) the navigation belongs to.
+            stats (NavigationStats): The navigation's counters.
+        """
+        with self._lock:
+            if stats.profile is FULL:
+                self._average(self._full_ms, name, stats.duration_ms)
+                stats.bytes_saved = stats.ms_saved = 0
+                return
+            stats.bytes_saved = int(sum(self._type_bytes.get(resource_type, 0) * count
+                                        for resource_type, count in stats.blocked_types.items()))
+            baseline = self._full_ms.get(name)
+            stats.ms_saved = round(baseline - stats.duration_ms, 1) if baseline is not None else None
+
+
+_tracker = SavingsTracker()
+
+
+async def apply_profile(page, profile, url, stats, tracker=None):
+    """
+    Installs the profile's request interception on a page and counts its traffic.
+
+    Args:
+        page: Playwright page instance.
+        profile (RouteProfile): Profile to apply.
+        url (str): URL the page is about to open. Its site is first-party, as is the site
+            of the document a request belongs to, so a page that redirects to another site
+            (e.g. to the Midway login) keeps its own scripts and XHR.
+        stats (NavigationStats): Counters to update.
+        tracker (SavingsTracker): Response size statistics (default: shared tracker).
+    """
+    tracker = tracker or _tracker
+    start_site = site_of(urlparse(url).hostname)
+
+    def first_party_sites(request):
+        try:
+            frame_url = request.frame.url
+        except Exception:
+            # Service worker requests have no frame.
+            return (start_site,)
+        frame_site = site_of(urlparse(frame_url).hostname)
+        return (start_site, frame_site) if frame_site and frame_site != start_site else (start_site,)
+
+    def on_request(request):
+        stats.requests += 1
+
+    def on_response(response):
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            size = 0
+        stats.bytes_loaded += size
+        tracker.record_response(response.request.resource_type, size)
+
+    page.on("request", on_request)
+    page.on("response", on_response)
+    if profile is FULL:
+        return
+
+    async def handle(route):
+        request = route.request
+        if any(is_allowed(profile, request.url, request.resource_type, site) for site in first_party_sites(request)):
+            await route.continue_()
+        else:
+            stats.blocked += 1
+            stats.blocked_types[request.resource_type] = stats.blocked_types.get(request.resource_type, 0) + 1
+            await route.abort("blockedbyclient")
+
+    await page.route("**/*", handle)
+
+
+async def wait_until_ready(page, ready, timeout=60000):
+    """
+    Waits for a readiness condition instead of network idle.
+
+    Args:
+        page: Playwright page instance.
+        ready (ReadyCondition): Condition to wait for.
+        timeout (int): Timeout in milliseconds.
+    """
+    if ready.selector:
+        await page.wait_for_selector(ready.selector, state="attached", timeout=timeout)
+    elif ready.url:
+        await page.wait_for_url(ready.url, wait_until="commit", timeout=timeout)
+    elif ready.load_state:
+        await page.wait_for_load_state(ready.load_state, timeout=timeout)
+
+
+async def navigate(page, url, name=None, timeout=60000, goto=None, tracker=None):
+    """
+    Opens a URL with the link's interception profile and readiness condition, then logs
+    and records what the profile saved.
+
+    Args:
+        page: Playwright page instance.
+        url (str): The URL to open.
+        name (str): Link name from LINKS, selecting the profile (optional).
+        timeout (int): Timeout for navigation and readiness in milliseconds.
+        goto (function): Async (page, url, timeout, wait_until) -> Response used to
+            navigate (default: `page.goto`).
+        tracker (SavingsTracker): Savings statistics (default: shared tracker).
+
+    Returns:
+        tuple: (Response, NavigationStats)
+    """
+    tracker = tracker or _tracker
+    profile, ready = link_settings(name)
+    stats = NavigationStats(profile)
+    await apply_profile(page, profile, url, stats, tracker)
+
+    started = time.perf_counter()
+    if goto is None:
+        response = await page.goto(url, timeout=timeout, wait_until="commit")
+    else:
+        response = await goto(page, url, timeout, "commit")
+    with span("page.wait_ready"):
+        await wait_until_ready(page, ready, timeout)
+    stats.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    tracker.finish(name or url, stats)
+    logging.info(
+        f"Loaded {name or url} in {stats.duration_ms:.0f} ms with the {profile.name} profile: "
+        f"{stats.blocked}/{stats.requests} request(s) blocked, {stats.bytes_loaded} bytes loaded, "
+        f"~{stats.bytes_saved} bytes and {stats.ms_saved} ms saved."
+    )
+    emit_event("navigation", duration_ms=stats.duration_ms, name=name, url=url, **stats.as_dict())
+    return response, stats
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from urllib.parse import urlparse
+
+DEFAULT_CACHE_DIR = ".session_cache"
+DEFAULT_TTL_SECONDS = 8 * 60 * 60
+LOGIN_URL_MARKERS = ("/login", "/signin")
+
+
+class StorageStateCache:
+    """
+    Caches Playwright storage state (cookies plus localStorage) per username so
+    that authenticated contexts can be recreated without repeating the login.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS, login_url_markers=LOGIN_URL_MARKERS):
+        """
+        Initializes the cache.
+
+        Args:
+            cache_dir (str): Directory holding one JSON file per username.
+            ttl_seconds (int): Maximum age of a cached session in seconds.
+            login_url_markers (tuple): URL fragments that identify a login page.
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.login_url_markers = login_url_markers
+
+    def _path(self, username):
+        digest = hashlib.sha256(username.lower().encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def load(self, username):
+        """
+        Returns the cached storage state for a username if it has not expired.
+
+        Args:
+            username (str): The username the session belongs to.
+
+        Returns:
+            dict: Storage state accepted by `browser.new_context(storage_state=...)`, or None.
+        """
+        if not username:
+            return None
+        path = self._path(username)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Discarding unreadable session cache entry: {e}")
+            self.invalidate(username)
+            return None
+
+        if entry.get("expires_at", 0) <= time.time():
+            logging.info(f"Cached session for {username} expired.")
+            self.invalidate(username)
+            return None
+        return entry.get("storage_state")
+
+    def save(self, username, storage_state):
+        """
+        Stores the storage state for a username.
+
+        The entry expires after `ttl_seconds` or when the first persistent cookie
+        expires, whichever comes first.
+
+        Args:
+            username (str): The username the session belongs to.
+            storage_state (dict): Result of `await context.storage_state()`.
+        """
+        if not username or not storage_state:
+            return
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        cookie_expiries = [
+            cookie["expires"] for cookie in storage_state.get("cookies", [])
+            if cookie.get("expires", -1) > now
+        ]
+        if cookie_expiries:
+            expires_at = min(expires_at, min(cookie_expiries))
+
+        entry = {"saved_at": now, "expires_at": expires_at, "storage_state": storage_state}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(username)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            logging.info(f"Cached session for {username} until {time.ctime(expires_at)}.")
+        except Exception as e:
+            logging.warning(f"Failed to cache session for {username}: {e}")
+
+    def invalidate(self, username):
+        """
+        Removes the cached session for a username.
+
+        Args:
+            username (str): The username the session belongs to.
+        """
+        if not username:
+            return
+        try:
+            os.remove(self._path(username))
+            logging.info(f"Invalidated cached session for {username}.")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Failed to invalidate cached session for {username}: {e}")
+
+    def is_login_redirect(self, url):
+        """
+        Checks whether a URL is a login page, meaning the cached session was rejected.
+
+        Args:
+            url (str): The URL the page ended up on.
+
+        Returns:
+            bool: True if the URL looks like a login page.
+        """
+        if not url:
+            return False
+        parsed = urlparse(url)
+        location = f"{parsed.netloc}{parsed.path}".lower()
+        return any(marker in location for marker in self.login_url_markers)
+
+
+_shared_cache = None
+
+
+def get_session_cache():
+    """
+    Returns the shared storage-state cache.
+
+    Returns:
+        StorageStateCache: The shared cache.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = StorageStateCache()
+    return _shared_cache
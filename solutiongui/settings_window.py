@@ -1,7 +1,8 @@
 import customtkinter as ctk
-import json
-import os
 import logging
+from config_store import get_config_store
+from timing import apply_timing_setting, format_table
+from event_log import apply_event_log_setting
 
 class SettingsWindow:
     def __init__(self, parent, on_settings_saved_callback):
@@ -16,9 +17,12 @@ class SettingsWindow:
         self.on_settings_saved_callback = on_settings_saved_callback
         self.window = ctk.CTkToplevel(parent)
         self.window.title("Settings")
-        self.window.geometry("400x300")
+        self.window.geometry("520x360")
         self.window.resizable(False, False)
 
+        # Load existing settings before the tabs read them
+        self.settings = self.load_settings()
+
         # Create tabs
         self.tabs = ctk.CTkTabview(self.window)
         self.tabs.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
@@ -28,6 +32,7 @@ class SettingsWindow:
         # Add tabs
         self.add_general_tab()
         self.add_playwright_tab()
+        self.add_timing_tab()
 
         # Save and Cancel buttons using grid
         button_frame = ctk.CTkFrame(self.window)
@@ -39,9 +44,6 @@ class SettingsWindow:
         self.cancel_button = ctk.CTkButton(button_frame, text="Cancel", command=self.window.destroy)
         self.cancel_button.grid(row=0, column=1, padx=5)
 
-        # Load existing settings
-        self.settings = self.load_settings()
-
     def add_general_tab(self):
         """
         Adds the General tab to the settings window.
@@ -96,31 +98,62 @@ class SettingsWindow:
         )
         headless_checkbox.pack(pady=5)
 
+    def add_timing_tab(self):
+        """
+        Adds the Timing tab, showing p50/p95/p99 durations of the automation steps.
+        """
+        self.timing_tab = self.tabs.add("Timing")
+
+        self.timing_enabled = ctk.BooleanVar(value=self.settings.get("timing_enabled", False))
+        timing_checkbox = ctk.CTkCheckBox(
+            self.timing_tab, text="Record step timings", variable=self.timing_enabled
+        )
+        timing_checkbox.pack(pady=5)
+
+        self.event_log_enabled = ctk.BooleanVar(value=self.settings.get("event_log_enabled", False))
+        event_log_checkbox = ctk.CTkCheckBox(
+            self.timing_tab, text="Write structured event log", variable=self.event_log_enabled
+        )
+        event_log_checkbox.pack(pady=5)
+
+        self.timing_textbox = ctk.CTkTextbox(self.timing_tab, height=160, font=("Courier", 11), wrap="none")
+        self.timing_textbox.pack(pady=5, fill="both", expand=True)
+
+        refresh_button = ctk.CTkButton(self.timing_tab, text="Refresh", command=self.refresh_timings)
+        refresh_button.pack(pady=5)
+        self.refresh_timings()
+
+    def refresh_timings(self):
+        """
+        Shows the current step timings in the Timing tab.
+        """
+        self.timing_textbox.configure(state="normal")
+        self.timing_textbox.delete("1.0", "end")
+        self.timing_textbox.insert("end", format_table())
+        self.timing_textbox.configure(state="disabled")
+
     def load_settings(self):
         """
-        Loads settings from a JSON file.
+        Returns the current settings from the shared config store.
         """
-        config_file = "gui_config.json"
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, "r") as f:
-                    settings = json.load(f)
-                return settings
-            except Exception as e:
-                logging.warning(f"Failed to load settings: {e}")
-        return {}
+        return get_config_store().all()
 
     def save_settings(self):
         """
-        Saves settings to the configuration file and notifies the parent.
+        Saves settings to the config store (written to disk shortly after) and notifies the parent.
         """
         try:
             updated_settings = {
                 "appearance_mode": self.appearance_mode.get(),
                 "vpn_url": self.vpn_url_entry.get(),
                 "browser_type": self.browser_type.get(),
-                "headless_mode": self.headless_mode.get()
+                "headless_mode": self.headless_mode.get(),
+                "timing_enabled": self.timing_enabled.get(),
+                "event_log_enabled": self.event_log_enabled.get()
             }
+            get_config_store().update(updated_settings)
+            apply_timing_setting(updated_settings["timing_enabled"])
+            apply_event_log_setting(updated_settings["event_log_enabled"])
             self.on_settings_saved_callback(updated_settings)
             self.window.destroy()
         except Exception as e:
@@ -13,6 +13,7 @@ setup(
         'plyer',
         'python-dotenv',
         'hidapi>=0.10.0',
+        'pyudev; sys_platform == "linux"',
         'win10toast>=0.9.0',
         'pywinauto>=0.6.8'
     ],
@@ -0,0 +1,182 @@
+"""
+Startup report: measures module import cost with `python -X importtime` and the
+time from process start to the first drawn window, and checks both against a budget.
+
+Usage (from the repository root or the solutiongui directory):
+    python solutiongui/startup_report.py
+    python solutiongui/startup_report.py --first-window --budget-ms 800
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(PACKAGE_DIR)
+
+DEFAULT_MODULES = [
+    "automation",
+    "device_monitor",
+    "notification_manager",
+    "tray_icon",
+    "gui.get_passcode_v2",
+]
+DEFAULT_WINDOW = "gui.passcode_window:PasscodeApp"
+DEFAULT_IMPORT_BUDGET_MS = 300
+DEFAULT_WINDOW_BUDGET_MS = 1500
+FIRST_WINDOW_MARKER = "FIRST_WINDOW"
+
+
+def _subprocess_env():
+    env = dict(os.environ)
+    paths = [PACKAGE_DIR, REPO_ROOT]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output.
+
+    Args:
+        stderr (str): Standard error of the interpreter run with `-X importtime`.
+
+    Returns:
+        list: (module name, self microseconds, cumulative microseconds) per imported module.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        entries.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return entries
+
+
+def measure_import(module, top=5):
+    """
+    Imports a module in a fresh interpreter and reports how long it took.
+
+    Args:
+        module (str): Module to import.
+        top (int): Number of slowest dependencies (by self time) to include.
+
+    Returns:
+        dict: {"module", "ok", "total_ms", "slowest", "error"}
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=PACKAGE_DIR, env=_subprocess_env()
+    )
+    entries = parse_importtime(result.stderr)
+    total_us = next((cumulative for name, _, cumulative in reversed(entries) if name == module), 0)
+    slowest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+    error = None
+    if result.returncode != 0:
+        error_lines = [
+            line for line in (result.stderr + result.stdout).splitlines()
+            if line.strip() and not line.startswith("import time:")
+        ]
+        error = error_lines[-1] if error_lines else f"exit code {result.returncode}"
+    return {
+        "module": module,
+        "ok": result.returncode == 0,
+        "total_ms": round(total_us / 1000, 1),
+        "slowest": [{"module": name, "self_ms": round(self_us / 1000, 1)} for name, self_us, _ in slowest],
+        "error": error,
+    }
+
+
+def measure_first_window(target=DEFAULT_WINDOW, timeout=60):
+    """
+    Starts a fresh interpreter, builds the window and measures the time until its first
+    frame has been drawn. Requires a display.
+
+    Args:
+        target (str): "module:Class" of a Tk window class constructible without arguments.
+        timeout (float): Seconds to wait for the window.
+
+    Returns:
+        dict: {"target", "ok", "first_window_ms", "error"}
+    """
+    module, class_name = target.split(":")
+    snippet = (
+        f"from {module} import {class_name}\n"
+        f"app = {class_name}()\n"
+        "app.update()\n"
+        f"print({FIRST_WINDOW_MARKER!r}, flush=True)\n"
+        "app.destroy()\n"
+    )
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", snippet], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, cwd=PACKAGE_DIR, env=_subprocess_env()
+    )
+    elapsed_ms = None
+    try:
+        for line in process.stdout:
+            if line.strip() == FIRST_WINDOW_MARKER:
+                elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+                break
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    stderr = process.stderr.read() if process.stderr else ""
+    return {
+        "target": target,
+        "ok": elapsed_ms is not None,
+        "first_window_ms": elapsed_ms,
+        "error": None if elapsed_ms is not None else (stderr.strip().splitlines() or ["no window"])[-1],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report startup import cost and time to first window.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import-time.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS, help="Per-module import budget.")
+    parser.add_argument("--first-window", action="store_true", help="Also measure time to first window (needs a display).")
+    parser.add_argument("--window", default=DEFAULT_WINDOW, help="module:Class of the window to measure.")
+    parser.add_argument("--window-budget-ms", type=float, default=DEFAULT_WINDOW_BUDGET_MS, help="Time-to-first-window budget.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    report = {"imports": [measure_import(module) for module in args.modules]}
+    if args.first_window:
+        report["first_window"] = measure_first_window(args.window)
+
+    over_budget = [entry for entry in report["imports"] if entry["ok"] and entry["total_ms"] > args.budget_ms]
+    window = report.get("first_window")
+    if window and window["ok"] and window["first_window_ms"] > args.window_budget_ms:
+        over_budget.append(window)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for entry in report["imports"]:
+            status = "FAILED" if not entry["ok"] else ("OVER" if entry in over_budget else "ok")
+            print(f"{entry['module']:<36} {entry['total_ms']:>8.1f} ms  {status}")
+            if not entry["ok"]:
+                print(f"    {entry['error']}")
+            for slow in entry["slowest"][:3]:
+                print(f"    {slow['module']:<32} {slow['self_ms']:>8.1f} ms self")
+        if window:
+            if window["ok"]:
+                status = "OVER" if window in over_budget else "ok"
+                print(f"first window ({window['target']}) {window['first_window_ms']:.1f} ms  {status}")
+            else:
+                print(f"first window ({window['target']}) FAILED: {window['error']}")
+
+    failed = [entry for entry in report["imports"] if not entry["ok"]]
+    if window and not window["ok"]:
+        failed.append(window)
+    return 1 if over_budget or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
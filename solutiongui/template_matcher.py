@@ -0,0 +1,355 @@
+"""
+Locates button images (accounts_button.png, security_key_button.png, ...) on screen.
+
+Templates are read from disk once and kept as a grayscale pyramid: one full-resolution
+copy per display scale (to cope with Windows DPI scaling) and a downscaled copy of each
+for the coarse search. A lookup first tries the region where the template was last
+found; otherwise it matches the downscaled templates against a downscaled screenshot
+and refines the best candidates at full resolution in a small window around them.
+Matching uses OpenCV's normalised cross-correlation on NumPy arrays.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+from lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+pyautogui = lazy_import("pyautogui")
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUTTON_TEMPLATES = (
+    "accounts_button.png",
+    "security_key_button.png",
+    "manage_button.png",
+    "sign_in_options_button.png",
+)
+DEFAULT_SCALES = (1.0, 1.25, 1.5, 0.8)
+DEFAULT_COARSE_FACTOR = 0.25
+DEFAULT_THRESHOLD = 0.8
+# Coarse templates smaller than this carry too little detail; such scales are searched
+# at full resolution instead.
+MIN_COARSE_SIZE = 8
+
+
+class Match(namedtuple("Match", ["name", "left", "top", "width", "height", "score", "scale"])):
+    """
+    A template found on screen, in screen pixels.
+    """
+    __slots__ = ()
+
+    @property
+    def center(self):
+        return self.left + self.width // 2, self.top + self.height // 2
+
+
+TemplateLevel = namedtuple("TemplateLevel", ["scale", "full", "coarse"])
+
+
+def to_gray(image, color_order="RGB"):
+    """
+    Converts a screenshot (PIL image or NumPy array) to a single-channel uint8 array.
+
+    Args:
+        image: H x W, H x W x 3 or H x W x 4 image.
+        color_order (str): "RGB" for PIL/pyautogui images, "BGR" for OpenCV images.
+
+    Returns:
+        numpy.ndarray: Grayscale image.
+    """
+    array = np.asarray(image)
+    if array.ndim == 2:
+        return array
+    if array.shape[2] == 4:
+        code = cv2.COLOR_RGBA2GRAY if color_order == "RGB" else cv2.COLOR_BGRA2GRAY
+    else:
+        code = cv2.COLOR_RGB2GRAY if color_order == "RGB" else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(array, code)
+
+
+def _resize(image, factor):
+    if factor == 1.0:
+        return image
+    interpolation = cv2.INTER_AREA if factor < 1.0 else cv2.INTER_LINEAR
+    return cv2.resize(image, None, fx=factor, fy=factor, interpolation=interpolation)
+
+
+def _best_match(image, template):
+    """
+    Returns (score, (x, y)) of the best match of `template` in `image`, or (-1, None)
+    if the template does not fit.
+    """
+    if image.shape[0] < template.shape[0] or image.shape[1] < template.shape[1]:
+        return -1.0, None
+    result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    _, score, _, location = cv2.minMaxLoc(result)
+    # A featureless image region yields NaN or inf scores.
+    return (score, location) if math.isfinite(score) else (-1.0, None)
+
+
+class MatcherStats:
+    """
+    Counts how lookups were resolved.
+    """
+
+    def __init__(self):
+        self.hint_hits = 0
+        self.coarse_hits = 0
+        self.full_hits = 0
+        self.misses = 0
+
+    def as_dict(self):
+        return {
+            "hint_hits": self.hint_hits,
+            "coarse_hits": self.coarse_hits,
+            "full_hits": self.full_hits,
+            "misses": self.misses,
+        }
+
+
+class TemplateMatcher:
+    """
+    Multi-scale template matcher with a template cache and remembered search regions.
+    """
+
+    def __init__(self, template_dir=TEMPLATE_DIR, scales=DEFAULT_SCALES, coarse_factor=DEFAULT_COARSE_FACTOR,
+                 threshold=DEFAULT_THRESHOLD, roi_margin=32, refine_candidates=2, exhaustive_fallback=False):
+        """
+        Initializes the matcher. Templates are loaded on first use or by `preload()`.
+
+        Args:
+            template_dir (str): Directory containing the template images.
+            scales (tuple): Display scales to search, most likely first.
+            coarse_factor (float): Downscale factor of the coarse search.
+            threshold (float): Minimum normalised correlation for a match.
+            roi_margin (int): Pixels added around the last hit when searching there first.
+            refine_candidates (int): Coarse candidates refined at full resolution.
+            exhaustive_fallback (bool): Search the whole screen at full resolution when
+                the coarse search finds nothing (slow, but finds very small templates).
+        """
+        self.template_dir = template_dir
+        self.scales = tuple(scales)
+        self.coarse_factor = coarse_factor
+        self.threshold = threshold
+        self.roi_margin = roi_margin
+        self.refine_candidates = refine_candidates
+        self.exhaustive_fallback = exhaustive_fallback
+        self.stats = MatcherStats()
+        self._pyramids = {}
+        self._hints = {}
+        self._lock = threading.Lock()
+
+    def add_template(self, name, image):
+        """
+        Builds and caches the pyramid of a template image.
+
+        Args:
+            name (str): Template name, e.g. "manage_button.png".
+            image: Template image (grayscale or RGB array).
+        """
+        gray = to_gray(image)
+        levels = []
+        for scale in self.scales:
+            full = _resize(gray, scale)
+            coarse = _resize(full, self.coarse_factor)
+            if min(coarse.shape[:2]) < MIN_COARSE_SIZE:
+                coarse = None
+            levels.append(TemplateLevel(scale, full, coarse))
+        with self._lock:
+            self._pyramids[name] = levels
+            self._hints.pop(name, None)
+
+    def load(self, name):
+        """
+        Returns the cached pyramid of a template, reading it from `template_dir` once.
+
+        Raises:
+            FileNotFoundError: If the template image cannot be read.
+        """
+        levels = self._pyramids.get(name)
+        if levels is None:
+            path = os.path.join(self.template_dir, name)
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                raise FileNotFoundError(f"Template image not found: {path}")
+            self.add_template(name, image)
+            levels = self._pyramids[name]
+        return levels
+
+    def preload(self, names=BUTTON_TEMPLATES):
+        """
+        Loads templates ahead of the first lookup. Missing files are logged and skipped.
+        """
+        for name in names:
+            try:
+                self.load(name)
+            except FileNotFoundError as e:
+                logging.warning(str(e))
+
+    def forget_hint(self, name):
+        with self._lock:
+            self._hints.pop(name, None)
+
+    def hint_region(self, name, screen_size=None):
+        """
+        Returns the region (left, top, width, height) around the last hit of `name`,
+        clipped to `screen_size` (width, height), or None.
+        """
+        hint = self._hints.get(name)
+        if hint is None:
+            return None
+        left = max(0, hint.left - self.roi_margin)
+        top = max(0, hint.top - self.roi_margin)
+        right = hint.left + hint.width + self.roi_margin
+        bottom = hint.top + hint.height + self.roi_margin
+        if screen_size is not None:
+            right = min(right, screen_size[0])
+            bottom = min(bottom, screen_size[1])
+        return left, top, right - left, bottom - top
+
+    def _level(self, name, scale):
+        for level in self.load(name):
+            if level.scale == scale:
+                return level
+        return None
+
+    def _remember(self, match):
+        with self._lock:
+            self._hints[match.name] = match
+
+    def find_in_region(self, name, region_image, offset=(0, 0)):
+        """
+        Matches the template at its last hit's scale inside a screen region.
+
+        Args:
+            name (str): Template name.
+            region_image: Grayscale or RGB image of the region.
+            offset (tuple): Screen position (left, top) of the region.
+
+        Returns:
+            Match: The match, or None.
+        """
+        hint = self._hints.get(name)
+        level = self._level(name, hint.scale if hint else self.scales[0])
+        score, location = _best_match(to_gray(region_image), level.full)
+        if location is None or score < self.threshold:
+            return None
+        height, width = level.full.shape[:2]
+        match = Match(name, offset[0] + location[0], offset[1] + location[1], width, height, score, level.scale)
+        self._remember(match)
+        return match
+
+    def find(self, name, screen, use_hint=True):
+        """
+        Finds a template in a screenshot.
+
+        Args:
+            name (str): Template name.
+            screen: Screenshot (grayscale or RGB array, or PIL image).
+            use_hint (bool): Try the region of the last hit first.
+
+        Returns:
+            Match: The best match at or above the threshold, or None.
+        """
+        levels = self.load(name)
+        gray = to_gray(screen)
+
+        if use_hint and name in self._hints:
+            left, top, width, height = self.hint_region(name, (gray.shape[1], gray.shape[0]))
+            match = self.find_in_region(name, gray[top:top + height, left:left + width], (left, top))
+            if match is not None:
+                self.stats.hint_hits += 1
+                return match
+
+        coarse_screen = _resize(gray, self.coarse_factor)
+        candidates = []
+        full_only = []
+        for level in levels:
+            if level.coarse is None:
+                full_only.append(level)
+                continue
+            score, location = _best_match(coarse_screen, level.coarse)
+            if location is not None:
+                candidates.append((score, level, location))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        best = None
+        # One coarse pixel spans 1/coarse_factor screen pixels, plus slack for rounding.
+        pad = int(math.ceil(1 / self.coarse_factor)) * 2 + 2
+        for _, level, (x, y) in candidates[:self.refine_candidates]:
+            height, width = level.full.shape[:2]
+            left = max(0, int(x / self.coarse_factor) - pad)
+            top = max(0, int(y / self.coarse_factor) - pad)
+            window = gray[top:top + height + 2 * pad, left:left + width + 2 * pad]
+            score, location = _best_match(window, level.full)
+            if location is not None and score >= self.threshold and (best is None or score > best.score):
+                best = Match(name, left + location[0], top + location[1], width, height, score, level.scale)
+        if best is not None:
+            self.stats.coarse_hits += 1
+            self._remember(best)
+            return best
+
+        if self.exhaustive_fallback:
+            full_only = levels
+        for level in full_only:
+            score, location = _best_match(gray, level.full)
+            if location is not None and score >= self.threshold and (best is None or score > best.score):
+                height, width = level.full.shape[:2]
+                best = Match(name, location[0], location[1], width, height, score, level.scale)
+        if best is not None:
+            self.stats.full_hits += 1
+            self._remember(best)
+            return best
+
+        self.stats.misses += 1
+        return None
+
+    def locate_on_screen(self, name):
+        """
+        Takes a screenshot and finds a template on it. When the template was found before,
+        only the region around that hit is captured first.
+
+        Args:
+            name (str): Template name, e.g. "manage_button.png".
+
+        Returns:
+            Match: The match, or None.
+        """
+        logging.info(f"Looking for {name} on the screen...")
+        started = time.perf_counter()
+        match = None
+        region = self.hint_region(name, tuple(pyautogui.size()))
+        if region is not None:
+            match = self.find_in_region(name, pyautogui.screenshot(region=region), region[:2])
+            if match is not None:
+                self.stats.hint_hits += 1
+        if match is None:
+            match = self.find(name, pyautogui.screenshot(), use_hint=False)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if match is None:
+            logging.info(f"{name} not found on the screen ({elapsed_ms:.0f} ms).")
+        else:
+            logging.info(f"Found {name} at {match.center} (score {match.score:.2f}, scale {match.scale}) "
+                         f"in {elapsed_ms:.0f} ms.")
+        return match
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_template_matcher():
+    """
+    Returns the shared matcher for the bundled button images.
+
+    Returns:
+        TemplateMatcher: The shared matcher.
+    """
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = TemplateMatcher()
+        return _matcher
@@ -0,0 +1,93 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import automation
+import automation_loop
+import config_store
+import event_log
+import timing
+from app_startup import start_background_services, stop_background_services
+from config_store import ConfigStore
+
+
+class FakeTkRoot:
+    def __init__(self):
+        self.scheduled = []
+        self.destroyed = False
+
+    def after(self, delay_ms, func):
+        self.scheduled.append(func)
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class TestStartBackgroundServices(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ConfigStore(os.path.join(self.temp_dir, "gui_config.json"), debounce_seconds=10)
+        self.log_dir = os.path.join(self.temp_dir, "event_log")
+        self.enable_event_log = event_log.enable_event_log
+        patches = [
+            mock.patch.object(config_store, "get_config_store", return_value=self.store),
+            mock.patch.object(automation, "warm_browser_pool"),
+            mock.patch.object(automation_loop, "_shared_loop", None),
+            mock.patch.object(event_log, "enable_event_log", side_effect=lambda: self.enable_event_log(self.log_dir)),
+            mock.patch.dict(os.environ, {"SOLUTIONGUI_EVENT_LOG": "", "SOLUTIONGUI_TIMING": ""}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        if automation_loop._shared_loop is not None:
+            automation_loop._shared_loop.stop()
+        event_log.disable_event_log()
+        timing.disable_timing()
+        shutil.rmtree(self.temp_dir)
+
+    def test_attaches_root_and_warms_pool(self):
+        root = FakeTkRoot()
+        start_background_services(root)
+        self.assertIs(automation_loop.current_automation_loop().tk_root, root)
+        automation.warm_browser_pool.assert_called_once_with()
+        self.assertFalse(event_log.is_event_log_enabled())
+        self.assertFalse(timing.is_timing_enabled())
+
+    def test_timing_setting(self):
+        self.store.update({"timing_enabled": True})
+        start_background_services(FakeTkRoot())
+        self.assertTrue(timing.is_timing_enabled())
+
+    def test_event_log_setting(self):
+        self.store.update({"event_log_enabled": True})
+        start_background_services(FakeTkRoot())
+        self.assertTrue(event_log.is_event_log_enabled())
+        self.assertTrue(os.path.isdir(self.log_dir))
+
+
+class TestStopBackgroundServices(unittest.TestCase):
+    def test_shuts_down_automation_then_destroys_root(self):
+        root = FakeTkRoot()
+        with mock.patch.object(automation, "shutdown_automation") as shutdown:
+            stop_background_services(root)
+        shutdown.assert_called_once_with()
+        self.assertTrue(root.destroyed)
+
+    def test_root_is_destroyed_even_if_shutdown_fails(self):
+        root = FakeTkRoot()
+        with mock.patch.object(automation, "shutdown_automation", side_effect=RuntimeError("boom")):
+            with self.assertLogs(level="ERROR"):
+                stop_background_services(root)
+        self.assertTrue(root.destroyed)
+
+
+if __name__ == '__main__':
+    unittest.main()
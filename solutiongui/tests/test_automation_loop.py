@@ -0,0 +1,173 @@
+import sys
+import os
+import asyncio
+import queue
+import threading
+import time
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import automation_loop
+from automation_loop import AutomationLoop, current_automation_loop, get_automation_loop
+
+
+class FakeTkRoot:
+    """
+    Records `after()` calls so the test can drive the Tk callback pump by hand.
+    """
+
+    def __init__(self):
+        self.scheduled = []
+        self.thread_ids = []
+
+    def after(self, delay_ms, func):
+        self.scheduled.append(func)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for func in scheduled:
+            self.thread_ids.append(threading.get_ident())
+            func()
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestAutomationLoop(unittest.TestCase):
+    def setUp(self):
+        self.loop = AutomationLoop(max_pending=2)
+        self.loop.start()
+
+    def tearDown(self):
+        self.loop.stop()
+
+    def test_submit_returns_result(self):
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        self.assertEqual(self.loop.submit(add, 2, 3).result(timeout=5), 5)
+
+    def test_runs_concurrently_on_one_loop(self):
+        loops = []
+        gate = threading.Event()
+
+        async def record():
+            loops.append(asyncio.get_running_loop())
+            while not gate.is_set():
+                await asyncio.sleep(0.01)
+
+        futures = [self.loop.submit(record) for _ in range(2)]
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertIs(loops[0], loops[1])
+
+    def test_back_pressure(self):
+        gate = threading.Event()
+
+        async def wait_for_gate():
+            while not gate.is_set():
+                await asyncio.sleep(0.01)
+
+        futures = [self.loop.submit(wait_for_gate) for _ in range(2)]
+        with self.assertRaises(queue.Full):
+            self.loop.submit(wait_for_gate)
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertTrue(wait_until(lambda: self.loop.pending == 0))
+        self.loop.submit(wait_for_gate).result(timeout=5)
+
+    def test_cancel_frees_slot(self):
+        async def forever():
+            await asyncio.sleep(3600)
+
+        future = self.loop.submit(forever)
+        future.cancel()
+        self.assertTrue(future.cancelled())
+        self.loop.submit(asyncio.sleep, 0).result(timeout=5)
+        self.loop.submit(asyncio.sleep, 0).result(timeout=5)
+
+
+class TestAutomationLoopTkCallbacks(unittest.TestCase):
+    def test_callback_runs_on_tk_thread(self):
+        root = FakeTkRoot()
+        loop = AutomationLoop(tk_root=root)
+        loop.start()
+        try:
+            results = []
+
+            async def answer():
+                return 42
+
+            loop.submit(answer, callback=lambda future: results.append(future.result())).result(timeout=5)
+            self.assertEqual(results, [])
+            self.assertTrue(wait_until(lambda: root.run_pending() or results))
+            self.assertEqual(results, [42])
+            self.assertEqual(set(root.thread_ids), {threading.get_ident()})
+        finally:
+            loop.stop()
+
+    def test_root_attached_after_start(self):
+        root = FakeTkRoot()
+        loop = AutomationLoop()
+        loop.start()
+        try:
+            loop.set_tk_root(root)
+            self.assertEqual(len(root.scheduled), 1)
+            results = []
+
+            async def answer():
+                return 7
+
+            loop.submit(answer, callback=lambda future: results.append(future.result())).result(timeout=5)
+            self.assertEqual(results, [])
+            self.assertTrue(wait_until(lambda: root.run_pending() or results))
+            self.assertEqual(results, [7])
+        finally:
+            loop.stop()
+
+    def test_callback_without_root_warns(self):
+        loop = AutomationLoop()
+        loop.start()
+        try:
+            with self.assertLogs(level="WARNING"):
+                loop.submit(asyncio.sleep, 0, callback=lambda future: None).result(timeout=5)
+        finally:
+            loop.stop()
+
+
+class TestSharedAutomationLoop(unittest.TestCase):
+    def setUp(self):
+        automation_loop._shared_loop = None
+
+    def tearDown(self):
+        if automation_loop._shared_loop is not None:
+            automation_loop._shared_loop.stop()
+        automation_loop._shared_loop = None
+
+    def test_not_created_until_used(self):
+        self.assertIsNone(current_automation_loop())
+        loop = get_automation_loop()
+        self.assertIs(current_automation_loop(), loop)
+
+    def test_later_call_attaches_root(self):
+        loop = get_automation_loop()
+        root = FakeTkRoot()
+        self.assertIs(get_automation_loop(root), loop)
+        self.assertIs(loop.tk_root, root)
+        self.assertEqual(len(root.scheduled), 1)
+        # Attaching the same root again does not schedule a second pump.
+        get_automation_loop(root)
+        self.assertEqual(len(root.scheduled), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
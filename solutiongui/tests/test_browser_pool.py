@@ -0,0 +1,158 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import browser_pool
+from benchmarks import fakes
+from browser_pool import BrowserPool, get_browser_pool, release_pooled_context
+from config_store import ConfigStore
+
+
+class TestBrowserPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ConfigStore(os.path.join(self.temp_dir, "gui_config.json"), debounce_seconds=10)
+        self.api = fakes.FakePlaywrightApi(launch_delay=0.01)
+        patches = [
+            mock.patch.object(browser_pool, "get_config_store", return_value=self.store),
+            mock.patch.object(browser_pool, "playwright_api", self.api),
+            mock.patch.object(browser_pool, "_shared_pool", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_start_prelaunches_and_acquires_are_warm(self):
+        async def scenario():
+            pool = BrowserPool(size=2)
+            await pool.start()
+            for _ in range(3):
+                async with pool.context():
+                    pass
+            await pool.close()
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual(self.api.started[0].chromium.launches, 2)
+        self.assertEqual(pool.metrics.as_dict()["cold_launches"], 2)
+        self.assertEqual(pool.metrics.warm_hits, 3)
+        self.assertEqual(pool.metrics.contexts_recycled, 3)
+
+    def test_cold_acquire_is_not_a_warm_hit(self):
+        async def scenario():
+            pool = BrowserPool(size=1)
+            for _ in range(2):
+                async with pool.context():
+                    pass
+            await pool.close()
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual((pool.metrics.cold_launches, pool.metrics.warm_hits), (1, 1))
+
+    def test_max_contexts_limits_checked_out_contexts(self):
+        async def scenario():
+            pool = BrowserPool(size=1, max_contexts=2)
+            first = await pool.acquire_context()
+            await pool.acquire_context()
+            waiting = asyncio.create_task(pool.acquire_context())
+            await asyncio.sleep(0.05)
+            blocked = not waiting.done()
+            await pool.release_context(first)
+            await asyncio.wait_for(waiting, 1)
+            await pool.close()
+            return blocked
+
+        self.assertTrue(asyncio.run(scenario()))
+
+    def test_size_comes_from_settings(self):
+        self.store.update({"browser_pool_size": 3, "browser_pool_max_contexts": 6})
+
+        async def scenario():
+            pool = get_browser_pool()
+            await pool.start()
+            await browser_pool.close_browser_pool()
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual((pool.size, pool.max_contexts), (3, 6))
+        self.assertEqual(self.api.started[0].chromium.launches, 3)
+
+    def test_context_released_to_replaced_pool(self):
+        async def scenario():
+            old_pool = get_browser_pool()
+            context = await old_pool.acquire_context()
+            self.store.update({"headless_mode": True})
+            new_pool = get_browser_pool()
+            await asyncio.sleep(0)
+            still_open = not any(browser is None for browser in old_pool._browsers)
+            await release_pooled_context(context)
+            await browser_pool.close_browser_pool()
+            return old_pool, new_pool, still_open
+
+        old_pool, new_pool, still_open = asyncio.run(scenario())
+        self.assertIsNot(old_pool, new_pool)
+        # The old pool waited for its context, then closed once it came back.
+        self.assertTrue(still_open)
+        self.assertEqual(old_pool._owners, {})
+        self.assertEqual(old_pool.metrics.contexts_recycled, 1)
+        self.assertEqual(old_pool._browsers, [None])
+        self.assertEqual(new_pool.metrics.contexts_recycled, 0)
+
+    def test_pool_from_another_loop_is_closed_on_that_loop(self):
+        old_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 1)
+        self.addCleanup(old_loop.call_soon_threadsafe, old_loop.stop)
+
+        async def acquire_and_release():
+            pool = get_browser_pool()
+            async with pool.context():
+                pass
+            return pool
+
+        old_pool = asyncio.run_coroutine_threadsafe(acquire_and_release(), old_loop).result(5)
+
+        async def replace():
+            new_pool = get_browser_pool()
+            await browser_pool.close_browser_pool()
+            return new_pool
+
+        new_pool = asyncio.run(replace())
+        # The retire runs on the old loop; wait for it to finish there.
+        deadline = time.monotonic() + 5
+        while old_pool._playwright is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIsNot(old_pool, new_pool)
+        self.assertEqual(old_pool._browsers, [None])
+        self.assertIsNone(old_pool._playwright)
+
+    def test_settings_change_keeps_a_reference_to_the_retire_task(self):
+        async def scenario():
+            get_browser_pool()
+            self.store.update({"headless_mode": True})
+            get_browser_pool()
+            pending = set(browser_pool._retire_tasks)
+            await asyncio.gather(*pending)
+            await browser_pool.close_browser_pool()
+            return pending
+
+        self.assertEqual(len(asyncio.run(scenario())), 1)
+        self.assertEqual(browser_pool._retire_tasks, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
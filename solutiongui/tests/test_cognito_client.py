@@ -0,0 +1,178 @@
+import sys
+import os
+import datetime
+import json
+import subprocess
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cognito_client import CognitoError, CognitoIdentityClient, CognitoProtocolError, is_retryable_cognito_error
+from retry_policy import RetryPolicy
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+
+class CognitoStandIn(BaseHTTPRequestHandler):
+    """
+    Cognito Identity stand-in: records each request and answers with `responses[operation]`,
+    a (status, body) pair where body is a dict or raw bytes, or a list of such pairs
+    answered in turn (the last one repeats).
+    """
+    protocol_version = "HTTP/1.1"
+    responses = {}
+    requests = []
+
+    def do_POST(self):
+        operation = self.headers["X-Amz-Target"].rsplit(".", 1)[-1]
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((operation, dict(self.headers), payload))
+        response = self.responses[operation]
+        if isinstance(response, list):
+            response = response.pop(0) if len(response) > 1 else response[0]
+        status, body = response
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+LOGINS = {"midway-auth.amazon.com": "jwt"}
+NO_BACKOFF = RetryPolicy(max_attempts=3, base_delay=0, retryable=is_retryable_cognito_error)
+
+
+@unittest.skipUnless(requests is not None, "requests is not installed")
+class TestCognitoIdentityClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), CognitoStandIn)
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        CognitoStandIn.requests = []
+        CognitoStandIn.responses = {
+            "GetId": (200, {"IdentityId": "us-east-1:identity"}),
+            "GetCredentialsForIdentity": (200, {"IdentityId": "us-east-1:identity", "Credentials": {
+                "AccessKeyId": "ASIA1", "SecretKey": "secret", "SessionToken": "token", "Expiration": 1893456000.0,
+            }}),
+        }
+        self.client = CognitoIdentityClient("us-east-1", session=requests.Session(), endpoint=self.endpoint,
+                                            retry_policy=NO_BACKOFF)
+
+    def test_get_id_and_credentials(self):
+        identity = self.client.get_id(AccountId="123456789012", IdentityPoolId="us-east-1:pool", Logins=LOGINS)
+        response = self.client.get_credentials_for_identity(IdentityId=identity["IdentityId"], Logins=LOGINS)
+        credentials = response["Credentials"]
+        self.assertEqual(credentials["AccessKeyId"], "ASIA1")
+        self.assertEqual(credentials["Expiration"],
+                         datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc))
+
+        (first_operation, headers, payload), (second_operation, _, second_payload) = CognitoStandIn.requests
+        self.assertEqual((first_operation, second_operation), ("GetId", "GetCredentialsForIdentity"))
+        self.assertEqual(headers["X-Amz-Target"], "AWSCognitoIdentityService.GetId")
+        self.assertEqual(headers["Content-Type"], "application/x-amz-json-1.1")
+        self.assertNotIn("Authorization", headers)
+        self.assertEqual(payload, {"AccountId": "123456789012", "IdentityPoolId": "us-east-1:pool", "Logins": LOGINS})
+        self.assertEqual(second_payload, {"IdentityId": "us-east-1:identity", "Logins": LOGINS})
+
+    def test_service_error(self):
+        CognitoStandIn.responses["GetId"] = (400, {
+            "__type": "com.amazonaws.cognito.identity.model#NotAuthorizedException", "message": "Token expired",
+        })
+        with self.assertRaises(CognitoError) as raised:
+            self.client.get_id(AccountId="1", IdentityPoolId="us-east-1:pool", Logins=LOGINS)
+        self.assertEqual(raised.exception.code, "NotAuthorizedException")
+        self.assertEqual(raised.exception.response.status_code, 400)
+        self.assertIn("Token expired", str(raised.exception))
+        # Client errors are not retried.
+        self.assertEqual(len(CognitoStandIn.requests), 1)
+
+    def test_retries_throttling_and_server_errors(self):
+        for status, error_type in ((400, "TooManyRequestsException"), (500, "InternalErrorException"),
+                                   (503, "ServiceUnavailable")):
+            with self.subTest(error_type=error_type):
+                CognitoStandIn.requests = []
+                CognitoStandIn.responses["GetId"] = [
+                    (status, {"__type": f"com.amazonaws.cognito.identity.model#{error_type}", "message": "Retry"}),
+                    (200, {"IdentityId": "us-east-1:identity"}),
+                ]
+                identity = self.client.get_id(AccountId="1", IdentityPoolId="us-east-1:pool", Logins=LOGINS)
+                self.assertEqual(identity, {"IdentityId": "us-east-1:identity"})
+                self.assertEqual(len(CognitoStandIn.requests), 2)
+
+    def test_gives_up_after_max_attempts(self):
+        CognitoStandIn.responses["GetId"] = (400, {"__type": "TooManyRequestsException", "message": "Rate exceeded"})
+        with self.assertRaises(CognitoError) as raised:
+            self.client.get_id(AccountId="1", IdentityPoolId="us-east-1:pool", Logins=LOGINS)
+        self.assertEqual(raised.exception.code, "TooManyRequestsException")
+        self.assertEqual(len(CognitoStandIn.requests), 3)
+
+    def test_empty_success_body(self):
+        CognitoStandIn.responses["GetId"] = (200, b"")
+        client = CognitoIdentityClient("us-east-1", session=requests.Session(), endpoint=self.endpoint, fallback=False)
+        with self.assertRaises(CognitoProtocolError):
+            client.get_id(AccountId="1", IdentityPoolId="us-east-1:pool", Logins=LOGINS)
+
+    def test_unexpected_response_without_fallback(self):
+        CognitoStandIn.responses["GetId"] = (502, b"<html>Bad Gateway</html>")
+        client = CognitoIdentityClient("us-east-1", session=requests.Session(), endpoint=self.endpoint, fallback=False,
+                                       retry_policy=NO_BACKOFF)
+        with self.assertRaises(CognitoProtocolError):
+            client.get_id(AccountId="1", IdentityPoolId="us-east-1:pool", Logins=LOGINS)
+        # A 5xx is retried before it counts as an unexpected response.
+        self.assertEqual(len(CognitoStandIn.requests), 3)
+
+    def test_unexpected_response_falls_back_to_boto3(self):
+        class Boto3Client:
+            def __init__(self):
+                self.calls = []
+
+            def get_id(self, **kwargs):
+                self.calls.append(kwargs)
+                return {"IdentityId": "from-boto3"}
+
+        boto3_client = Boto3Client()
+        self.client._get_boto3_client = lambda: boto3_client
+        CognitoStandIn.responses["GetId"] = (502, b"<html>Bad Gateway</html>")
+        import cognito_client
+        available = cognito_client.boto3_available
+        cognito_client.boto3_available = lambda: True
+        try:
+            identity = self.client.get_id(AccountId="1", IdentityPoolId="us-east-1:pool", Logins=LOGINS)
+        finally:
+            cognito_client.boto3_available = available
+        self.assertEqual(identity, {"IdentityId": "from-boto3"})
+        self.assertEqual(boto3_client.calls, [{"AccountId": "1", "IdentityPoolId": "us-east-1:pool", "Logins": LOGINS}])
+
+
+class TestImportCost(unittest.TestCase):
+    def test_does_not_import_boto3_or_asyncio(self):
+        package_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, cognito_client; print(*(name in sys.modules for name in ('boto3', 'botocore', 'asyncio')))"],
+            capture_output=True, text=True, cwd=package_dir, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False False False")
+
+
+if __name__ == '__main__':
+    unittest.main()
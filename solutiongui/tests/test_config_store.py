@@ -0,0 +1,107 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config_store import ConfigStore
+
+
+class TestConfigStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "gui_config.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_file(self, data):
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+    def read_file(self):
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def test_defaults_and_existing_file(self):
+        self.write_file({"geometry": "711x902+274+50"})
+        store = ConfigStore(self.path)
+        self.assertEqual(store.get("geometry"), "711x902+274+50")
+        self.assertEqual(store.get("appearance_mode"), "dark")
+        self.assertFalse(store.all()["headless_mode"])
+
+    def test_writes_are_debounced_and_atomic(self):
+        store = ConfigStore(self.path, debounce_seconds=0.05)
+        for index in range(20):
+            store.set("geometry", f"{400 + index}x300+0+0")
+        self.assertFalse(os.path.exists(self.path))
+        time.sleep(0.3)
+        self.assertEqual(store.writes, 1)
+        self.assertEqual(self.read_file(), {"geometry": "419x300+0+0"})
+        self.assertEqual([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")], [])
+
+    def test_two_writers_do_not_lose_keys(self):
+        settings_store = ConfigStore(self.path, debounce_seconds=10)
+        geometry_store = ConfigStore(self.path, debounce_seconds=10)
+        settings_store.update({"appearance_mode": "light", "headless_mode": True})
+        geometry_store.set("geometry", "800x600+10+10")
+        settings_store.flush()
+        geometry_store.flush()
+        self.assertEqual(self.read_file(), {
+            "appearance_mode": "light", "headless_mode": True, "geometry": "800x600+10+10",
+        })
+
+    def test_schema_validation(self):
+        store = ConfigStore(self.path)
+        with self.assertRaises(ValueError):
+            store.set("headless_mode", "yes")
+        self.write_file({"headless_mode": "yes", "custom": 1})
+        store = ConfigStore(self.path)
+        self.assertFalse(store.get("headless_mode"))
+        self.assertEqual(store.get("custom"), 1)
+
+    def test_external_change_is_detected_and_notified(self):
+        self.write_file({"vpn_url": "https://old.example.com"})
+        store = ConfigStore(self.path, mtime_check_interval=0)
+        changes = []
+        store.subscribe(changes.append, keys=["vpn_url"])
+
+        self.write_file({"vpn_url": "https://new.example.com"})
+        os.utime(self.path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        self.assertEqual(store.get("vpn_url"), "https://new.example.com")
+        self.assertEqual(changes, [{"vpn_url": "https://new.example.com"}])
+
+    def test_subscribers_receive_local_changes(self):
+        store = ConfigStore(self.path, debounce_seconds=10)
+        changes = []
+        unsubscribe = store.subscribe(changes.append)
+        store.update({"browser_type": "firefox", "appearance_mode": "dark"})
+        store.set("browser_type", "firefox")
+        unsubscribe()
+        store.set("browser_type", "chromium")
+        self.assertEqual(changes, [{"browser_type": "firefox"}])
+
+    def test_concurrent_updates(self):
+        store = ConfigStore(self.path, debounce_seconds=0.01)
+
+        def writer(prefix):
+            for index in range(50):
+                store.set(f"{prefix}_count", index)
+
+        threads = [threading.Thread(target=writer, args=(f"thread{number}",)) for number in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        self.assertEqual(self.read_file(), {f"thread{number}_count": 49 for number in range(4)})
+
+
+if __name__ == '__main__':
+    unittest.main()
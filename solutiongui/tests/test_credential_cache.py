@@ -0,0 +1,66 @@
+import sys
+import os
+import datetime
+import time
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from credential_cache import CredentialCache
+
+
+class FakeIssuer:
+    def __init__(self, lifetime_seconds):
+        self.lifetime_seconds = lifetime_seconds
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=self.lifetime_seconds)
+        return f"AKIA{self.calls}", "secret", "token", expiration
+
+
+class TestCredentialCache(unittest.TestCase):
+    def test_reuses_until_expiry(self):
+        cache = CredentialCache(refresh_margin_seconds=60)
+        issuer = FakeIssuer(3600)
+        key = ("123456789012", "us-west-2:pool")
+        first = cache.get(key, issuer)
+        second = cache.get(key, issuer)
+        self.assertEqual(first, second)
+        self.assertEqual(issuer.calls, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_keys_are_independent(self):
+        cache = CredentialCache()
+        issuer = FakeIssuer(3600)
+        cache.get(("1", "us-west-2:a"), issuer)
+        cache.get(("2", "us-east-1:b"), issuer)
+        self.assertEqual(issuer.calls, 2)
+
+    def test_refreshes_ahead_of_expiry_in_background(self):
+        cache = CredentialCache(refresh_margin_seconds=30)
+        issuer = FakeIssuer(10)
+        key = ("1", "pool")
+        first = cache.get(key, issuer)
+        issuer.lifetime_seconds = 3600
+        stale = cache.get(key, issuer)
+        self.assertEqual(stale, first)
+        deadline = time.monotonic() + 5
+        while issuer.calls < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(issuer.calls, 2)
+        self.assertEqual(cache.get(key, issuer)[0], "AKIA2")
+
+    def test_expired_entry_is_reissued(self):
+        cache = CredentialCache(refresh_margin_seconds=0)
+        issuer = FakeIssuer(-1)
+        key = ("1", "pool")
+        cache.get(key, issuer)
+        cache.get(key, issuer)
+        self.assertEqual(issuer.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
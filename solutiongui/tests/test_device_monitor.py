@@ -0,0 +1,176 @@
+import sys
+import os
+import queue
+import threading
+import time
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from device_monitor import SecurityKeyMonitor, match_known_key
+from benchmarks.fakes import make_hid_devices
+
+
+def make_keys(count):
+    return make_hid_devices(count, vendor_id=0x1050, product_id=0x0407)
+
+
+class FakeBackend:
+    """
+    Enumeration backend whose device list is set by the test. With notifications
+    enabled, `wait_for_change` blocks until `plug`/`unplug` is called.
+    """
+
+    def __init__(self, devices=None, notifications=False):
+        self.devices = list(devices or [])
+        self.supports_notifications = notifications
+        self.enumerations = 0
+        self.waits = 0
+        self.closed = False
+        self._changed = threading.Event()
+
+    def enumerate(self):
+        self.enumerations += 1
+        return [dict(device) for device in self.devices]
+
+    def wait_for_change(self, timeout):
+        self.waits += 1
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+    def wake(self):
+        self._changed.set()
+
+    def plug(self, device):
+        self.devices.append(device)
+        self._changed.set()
+
+    def unplug(self, device):
+        self.devices.remove(device)
+        self._changed.set()
+
+    def close(self):
+        self.closed = True
+
+
+class TestSecurityKeyMonitor(unittest.TestCase):
+    def drain(self, events):
+        items = []
+        while True:
+            try:
+                items.append(events.get_nowait())
+            except queue.Empty:
+                return items
+
+    def test_match_known_key(self):
+        device = make_keys(1)[0]
+        self.assertEqual(match_known_key(device), "YubiKey 5 NFC")
+        self.assertIsNone(match_known_key({"vendor_id": 0x046d, "product_id": 0xc52b}))
+
+    def test_added_after_debounce(self):
+        device = make_keys(1)[0]
+        backend = FakeBackend()
+        monitor = SecurityKeyMonitor(backend=backend, debounce_seconds=0.05)
+
+        self.assertIsNone(monitor.scan(now=0.0))
+        backend.devices.append(device)
+        self.assertAlmostEqual(monitor.scan(now=1.0), 0.05)
+        self.assertEqual(self.drain(monitor.events), [])
+
+        monitor.scan(now=1.06)
+        events = self.drain(monitor.events)
+        self.assertEqual([(event.kind, event.name) for event in events], [("added", "YubiKey 5 NFC")])
+        self.assertIn(device["path"], monitor.snapshot())
+
+    def test_removed(self):
+        device = make_keys(1)[0]
+        backend = FakeBackend([device])
+        monitor = SecurityKeyMonitor(backend=backend, debounce_seconds=0.05)
+        monitor.scan(now=0.0)
+        monitor.scan(now=0.1)
+        self.drain(monitor.events)
+
+        backend.devices.clear()
+        monitor.scan(now=1.0)
+        monitor.scan(now=1.1)
+        self.assertEqual([event.kind for event in self.drain(monitor.events)], ["removed"])
+        self.assertEqual(monitor.snapshot(), {})
+
+    def test_flapping_device_is_ignored(self):
+        device = make_keys(1)[0]
+        backend = FakeBackend()
+        monitor = SecurityKeyMonitor(backend=backend, debounce_seconds=0.05)
+        for step in range(10):
+            if step % 2 == 0:
+                backend.devices.append(device)
+            else:
+                backend.devices.remove(device)
+            monitor.scan(now=step * 0.01)
+        monitor.scan(now=1.0)
+        self.assertEqual(self.drain(monitor.events), [])
+        self.assertEqual(monitor.snapshot(), {})
+
+    def test_unknown_devices_are_filtered(self):
+        mouse = dict(make_hid_devices(1, vendor_id=0x046d, product_id=0xc52b)[0], usage_page=0x0001)
+        backend = FakeBackend([mouse])
+        monitor = SecurityKeyMonitor(backend=backend, debounce_seconds=0)
+        monitor.scan(now=0.0)
+        self.assertEqual(self.drain(monitor.events), [])
+
+    def test_notification_backend_detects_quickly_and_idles(self):
+        device = make_keys(1)[0]
+        backend = FakeBackend(notifications=True)
+        monitor = SecurityKeyMonitor(backend=backend, debounce_seconds=0.02, idle_timeout=5.0)
+        monitor.start()
+        try:
+            time.sleep(0.2)
+            # Idle: the thread is blocked waiting for a notification, not polling.
+            self.assertLessEqual(backend.enumerations, 1)
+
+            started = time.monotonic()
+            backend.plug(device)
+            event = monitor.events.get(timeout=1)
+            latency = time.monotonic() - started
+            self.assertEqual(event.kind, "added")
+            self.assertLess(latency, 0.1)
+        finally:
+            monitor.stop()
+        self.assertTrue(backend.closed)
+
+    def test_first_enumeration_error_does_not_stop_monitor(self):
+        device = make_keys(1)[0]
+        backend = FakeBackend([device])
+        enumerate_devices = backend.enumerate
+        failures = [OSError("hid_enumerate failed")]
+
+        def flaky_enumerate():
+            if failures:
+                raise failures.pop()
+            return enumerate_devices()
+
+        backend.enumerate = flaky_enumerate
+        monitor = SecurityKeyMonitor(backend=backend, debounce_seconds=0.01, min_interval=0.01, max_interval=0.02)
+        with self.assertLogs(level="ERROR"):
+            monitor.start()
+            try:
+                event = monitor.events.get(timeout=1)
+            finally:
+                monitor.stop()
+        self.assertEqual(event.kind, "added")
+
+    def test_polling_backend_backs_off_when_idle(self):
+        backend = FakeBackend()
+        monitor = SecurityKeyMonitor(backend=backend, min_interval=0.01, max_interval=0.08)
+        monitor.start()
+        try:
+            time.sleep(0.5)
+        finally:
+            monitor.stop()
+        # Fixed 10 ms polling would enumerate ~50 times; backing off to 80 ms keeps it low.
+        self.assertLess(backend.enumerations, 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import sys
+import os
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+import unittest
+import zipfile
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from diagnostics import DiagnosticsRun, current_run, end_run, enforce_retention, record_step, start_run
+
+
+class FakeTracing:
+    def __init__(self):
+        self.started = False
+
+    async def start(self, **kwargs):
+        self.started = True
+
+    async def stop(self, path=None):
+        with open(path, "wb") as f:
+            f.write(b"trace")
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.tracing = FakeTracing()
+
+    async def close(self):
+        with open(self.options["record_har_path"], "w") as f:
+            json.dump({"log": {"entries": []}}, f)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDiagnostics(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_one_bundle_per_run(self):
+        clock = FakeClock()
+
+        async def flow():
+            run = start_run("midway_login", root=self.root, clock=clock)
+            context = FakeContext(run.context_options())
+            await run.attach(context)
+            record_step(1, "Navigating.")
+            clock.now = 0.25
+            record_step(2, "Filling in username and PIN.")
+            clock.now = 0.5
+            await run.detach(context)
+            await context.close()
+            end_run(run, "success")
+            self.assertIsNone(current_run())
+            return run
+
+        run = asyncio.run(flow())
+        run.wait(5)
+
+        self.assertEqual(os.listdir(self.root), [f"{run.name}.zip"])
+        with zipfile.ZipFile(run.bundle_path) as bundle:
+            self.assertEqual(sorted(bundle.namelist()), ["network.har", "steps.json", "trace.zip"])
+            steps = json.loads(bundle.read("steps.json"))
+        self.assertEqual(steps["outcome"], "success")
+        self.assertEqual(steps["total_ms"], 500.0)
+        self.assertEqual([(step["step"], step["duration_ms"]) for step in steps["steps"]], [(1, 250.0), (2, 250.0)])
+
+    def test_steps_are_ignored_without_a_run(self):
+        record_step(1, "Nothing records this.")
+        self.assertIsNone(current_run())
+
+    def test_retention(self):
+        for index in range(5):
+            path = os.path.join(self.root, f"flow_{index}.zip")
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+            os.utime(path, (time.time() + index, time.time() + index))
+        deleted = enforce_retention(self.root, retention=3)
+        self.assertEqual(sorted(os.path.basename(path) for path in deleted), ["flow_0.zip", "flow_1.zip"])
+
+        deleted = enforce_retention(self.root, retention=3, max_total_bytes=250)
+        self.assertEqual(sorted(os.listdir(self.root)), ["flow_3.zip", "flow_4.zip"])
+
+    def test_run_without_trace_still_bundles_steps(self):
+        run = DiagnosticsRun("reports_open", root=self.root)
+        run.step(1, "Opening reports.")
+        run.finish("failure")
+        run.wait(5)
+        with zipfile.ZipFile(run.bundle_path) as bundle:
+            self.assertEqual(bundle.namelist(), ["steps.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
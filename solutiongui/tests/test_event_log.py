@@ -0,0 +1,152 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+from unittest import mock
+
+import event_log
+from event_log import (
+    EventWriter,
+    apply_event_log_setting,
+    disable_event_log,
+    emit_event,
+    enable_event_log,
+    event_file_name,
+    is_event_log_enabled,
+    timed_event,
+)
+from event_query import INDEX_FILE, build_index, parse_time, query
+
+DAY = 24 * 3600
+
+
+def write_events(log_dir, events):
+    for event in events:
+        path = os.path.join(log_dir, event_file_name(event["ts"]))
+        with open(path, "a") as f:
+            f.write(json.dumps(event) + "\n")
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        disable_event_log()
+        shutil.rmtree(self.log_dir)
+
+    def test_emit_is_noop_when_disabled(self):
+        emit_event("key_added", name="YubiKey 5 NFC")
+        self.assertEqual(os.listdir(self.log_dir), [])
+
+    def test_emit_and_timed_event(self):
+        enable_event_log(self.log_dir)
+        emit_event("key_added", vendor_id="0x1949", product_id="0x0429")
+        with timed_event("passcode_lookup", serial="G030PM0000000001", region="us-east-1") as event:
+            event["outcome"] = "failure"
+        with self.assertRaises(ValueError):
+            with timed_event("link_open", name="REPORTS"):
+                raise ValueError("boom")
+        disable_event_log()
+
+        events = list(query(self.log_dir))
+        self.assertEqual([event["type"] for event in events], ["key_added", "passcode_lookup", "link_open"])
+        self.assertEqual(events[1]["outcome"], "failure")
+        self.assertIn("duration_ms", events[1])
+        self.assertEqual((events[2]["outcome"], events[2]["error"]), ("failure", "ValueError"))
+
+
+    def test_apply_setting(self):
+        with mock.patch.object(event_log, "enable_event_log", side_effect=lambda: enable_event_log(self.log_dir)), \
+                mock.patch.dict(os.environ, {"SOLUTIONGUI_EVENT_LOG": ""}):
+            apply_event_log_setting(False)
+            self.assertFalse(is_event_log_enabled())
+            apply_event_log_setting(True)
+            self.assertTrue(is_event_log_enabled())
+            apply_event_log_setting(False)
+            self.assertFalse(is_event_log_enabled())
+            with mock.patch.dict(os.environ, {"SOLUTIONGUI_EVENT_LOG": "1"}):
+                apply_event_log_setting(False)
+            self.assertTrue(is_event_log_enabled())
+
+    def test_dropped_count_is_exact_across_threads(self):
+        writer = EventWriter(self.log_dir, queue_size=10)
+        release = threading.Event()
+        write = writer._write
+        writer._write = lambda *args: release.wait(5) and write(*args)
+        threads = [threading.Thread(target=lambda: [writer.put(time.time(), "{}") for _ in range(500)])
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        queued = writer.queue.qsize()
+        release.set()
+        writer.close()
+        # The writer holds at most one event while it is blocked.
+        self.assertIn(8 * 500 - writer.dropped, (queued, queued + 1))
+        self.assertEqual(writer.written, 8 * 500 - writer.dropped)
+
+
+class TestEventQuery(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.now = time.time()
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir)
+
+    def make_events(self, start, count, event_type="passcode_lookup", **fields):
+        return [dict({"ts": start + index, "type": event_type, "outcome": "success"}, **fields) for index in range(count)]
+
+    def test_filters(self):
+        old = self.make_events(self.now - 30 * DAY, 10, outcome="failure", region="us-east-1")
+        recent = self.make_events(self.now - 2 * DAY, 10, region="eu-west-1")
+        failures = self.make_events(self.now - DAY, 5, outcome="failure", region="us-east-1")
+        keys = self.make_events(self.now - DAY + 100, 5, event_type="key_added")
+        write_events(self.log_dir, old + recent + failures + keys)
+
+        matches = list(query(
+            self.log_dir, event_type="passcode_lookup", outcome="failure",
+            since=parse_time("7d", now=self.now), where={"region": "us-east-1"},
+        ))
+        self.assertEqual(len(matches), 5)
+        self.assertEqual(len(list(query(self.log_dir, event_type="key_added"))), 5)
+
+    def test_blocks_skip_unrelated_data(self):
+        write_events(self.log_dir, self.make_events(self.now - 3600, 1000, event_type="vpn_status"))
+        write_events(self.log_dir, self.make_events(self.now, 3, event_type="key_added"))
+        index = build_index(self.log_dir, block_size=100)
+        blocks = [block for entry in index["files"].values() for block in entry["blocks"]]
+        matching = [block for block in blocks if "type=key_added" in block[5]]
+        self.assertEqual(len(matching), 1)
+        self.assertEqual(len(list(query(self.log_dir, event_type="key_added", index=index))), 3)
+
+    def test_index_is_incremental(self):
+        write_events(self.log_dir, self.make_events(self.now, 5))
+        build_index(self.log_dir)
+        self.assertTrue(os.path.exists(os.path.join(self.log_dir, INDEX_FILE)))
+
+        write_events(self.log_dir, self.make_events(self.now + 10, 5, event_type="key_added"))
+        # A partially written line is left for the next indexing pass.
+        with open(os.path.join(self.log_dir, event_file_name(self.now + 10)), "a") as f:
+            f.write('{"ts": 1, "type": "par')
+        index = build_index(self.log_dir)
+        self.assertEqual(sum(block[4] for entry in index["files"].values() for block in entry["blocks"]), 10)
+        self.assertEqual(len(list(query(self.log_dir, event_type="key_added"))), 5)
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time("2d", now=10 * DAY), 8 * DAY)
+        self.assertEqual(parse_time("1970-01-02"), DAY)
+
+
+if __name__ == '__main__':
+    unittest.main()
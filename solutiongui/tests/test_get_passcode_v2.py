@@ -0,0 +1,269 @@
+import sys
+import os
+import io
+import json
+import multiprocessing
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    from gui import get_passcode_v2
+    from gui.get_passcode_v2 import Region, batch_record, discover_region, fetch_passcodes_bulk, parse_serial_list
+    from passcode_client import PasscodeClient
+    from benchmarks import fakes
+    from benchmarks.standin import StandInServer
+except SystemExit:
+    get_passcode_v2 = None
+
+forks = multiprocessing.get_start_method() == "fork"
+
+
+def fake_get_passcode(serial_number, region_string, midway_helper):
+    """
+    Fails for serials starting with "BAD" and otherwise answers with a pending rotation.
+    """
+    if serial_number.startswith("BAD"):
+        return Region(region_string), {"error": "404 Client Error"}
+    return Region(region_string), {"reported": "111111", "desired": "222222"}
+
+
+def only_in_us_west_2(serial_number, region_string, midway_helper):
+    if region_string != Region.us_west_2.value:
+        return Region(region_string), {"error": "404 Client Error"}
+    return Region(region_string), {"reported": "333333"}
+
+
+class FakeClient:
+    """
+    PasscodeClient stand-in: answers from `lookup` after `delays[region]` seconds and
+    records every call.
+    """
+
+    def __init__(self, lookup=fake_get_passcode, delays=None):
+        self.lookup = lookup
+        self.delays = delays or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, serial_number, region_string, midway_helper):
+        with self._lock:
+            self.calls.append((serial_number, region_string))
+        time.sleep(self.delays.get(region_string, 0))
+        return self.lookup(serial_number, region_string, midway_helper)
+
+
+@unittest.skipUnless(get_passcode_v2 is not None, "requests or requests-aws4auth is not installed")
+class TestParseSerialList(unittest.TestCase):
+    def test_csv_with_header(self):
+        text = "serial,site,notes\nG030A1,SEA,ok\nG030B2,PDX,\n"
+        self.assertEqual(parse_serial_list(text), ["G030A1", "G030B2"])
+
+    def test_mixed_separators_and_normalisation(self):
+        text = "sG030A1_2024; G030B2\tG030C3  G030D4\r\nSG030E5"
+        self.assertEqual(parse_serial_list(text), ["G030A1", "G030B2", "G030C3", "G030D4", "G030E5"])
+
+    def test_duplicates_keep_first_occurrence(self):
+        self.assertEqual(parse_serial_list("G030B2\nG030A1\nsG030B2\nG030A1_x"), ["G030B2", "G030A1"])
+
+    def test_nothing_usable(self):
+        self.assertEqual(parse_serial_list("serial\n\n;;,\nnone"), [])
+
+
+@unittest.skipUnless(get_passcode_v2 is not None, "requests or requests-aws4auth is not installed")
+class TestDiscoverRegion(unittest.TestCase):
+    def test_first_success_wins(self):
+        def known_in_two_regions(serial_number, region_string, midway_helper):
+            if region_string in ("eu-west-1", "us-west-2"):
+                return Region(region_string), {"reported": region_string}
+            return Region(region_string), {"error": "404 Client Error"}
+
+        client = FakeClient(known_in_two_regions, delays={"us-west-2": 0.3})
+        region, data = discover_region("G030A1", None, client=client)
+        self.assertEqual((region, data), (Region.eu_west_1, {"reported": "eu-west-1"}))
+
+    def test_slow_region_does_not_delay_success(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def unreachable_us_east_1(serial_number, region_string, midway_helper):
+            if region_string == Region.us_east_1.value:
+                release.wait(10)
+                return Region(region_string), {"error": "Read timed out."}
+            return only_in_us_west_2(serial_number, region_string, midway_helper)
+
+        started = time.monotonic()
+        region, data = discover_region("G030A1", None, client=FakeClient(unreachable_us_east_1))
+        self.assertEqual((region, data), (Region.us_west_2, {"reported": "333333"}))
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_unknown_device_returns_last_error(self):
+        client = FakeClient(lambda serial, region, helper: (Region(region), {"error": f"404 in {region}"}))
+        region, data = discover_region("G030A1", None, client=client)
+        self.assertIsInstance(region, Region)
+        self.assertEqual(data, {"error": f"404 in {region.value}"})
+
+    def test_uses_get_passcode_without_client(self):
+        with mock.patch.object(get_passcode_v2, "get_passcode", only_in_us_west_2):
+            self.assertEqual(discover_region("G030A1", None), (Region.us_west_2, {"reported": "333333"}))
+
+
+@unittest.skipUnless(get_passcode_v2 is not None, "requests or requests-aws4auth is not installed")
+class TestFetchPasscodesBulk(unittest.TestCase):
+    def test_reports_every_result(self):
+        client = FakeClient()
+        reported = []
+        results = fetch_passcodes_bulk(["G030A1", "BAD0001", "G030B2"], "us-east-1", None, max_workers=2,
+                                       on_result=lambda *result: reported.append(result), client=client)
+        self.assertEqual(sorted(results), sorted(reported))
+        by_serial = {serial: (region, data) for serial, region, data in results}
+        self.assertEqual(set(by_serial), {"G030A1", "BAD0001", "G030B2"})
+        self.assertEqual(by_serial["G030A1"], (Region.us_east_1, {"reported": "111111", "desired": "222222"}))
+        self.assertIn("error", by_serial["BAD0001"][1])
+        self.assertEqual({region for _, region in client.calls}, {"us-east-1"})
+
+    def test_auto_region_discovers_per_device(self):
+        client = FakeClient(only_in_us_west_2)
+        results = fetch_passcodes_bulk(["G030A1", "G030B2"], "auto", None, client=client)
+        self.assertEqual({(serial, region) for serial, region, _ in results},
+                         {("G030A1", Region.us_west_2), ("G030B2", Region.us_west_2)})
+
+    def test_cancel_skips_lookups_not_started(self):
+        cancel_event = threading.Event()
+        client = FakeClient(delays={"us-east-1": 0.05})
+
+        def on_result(serial_number, region, data):
+            cancel_event.set()
+
+        serials = [f"G030A{index}" for index in range(6)]
+        results = fetch_passcodes_bulk(serials, "us-east-1", None, max_workers=1, on_result=on_result,
+                                       cancel_event=cancel_event, client=client)
+        cancelled = [serial for serial, region, data in results if data == {"error": "Cancelled."}]
+        self.assertEqual(len(results), 6)
+        self.assertEqual(len(client.calls), 6 - len(cancelled))
+        self.assertGreaterEqual(len(cancelled), 4)
+        self.assertTrue(all(region is None for serial, region, data in results if serial in cancelled))
+
+
+@unittest.skipUnless(get_passcode_v2 is not None, "requests or requests-aws4auth is not installed")
+class TestBatchRecord(unittest.TestCase):
+    def test_success(self):
+        record = batch_record("G030A1", Region.us_east_1, {"reported": "111111", "desired": "222222"}, 0.01234)
+        self.assertEqual(record, {
+            "serial": "G030A1", "region": "us-east-1", "current": "111111", "upcoming": "222222", "latency_ms": 12.3,
+        })
+
+    def test_error_without_region(self):
+        record = batch_record("G030A1", None, {"error": "Device not found in any region."}, 0.5)
+        self.assertEqual(record, {
+            "serial": "G030A1", "region": None, "error": "Device not found in any region.", "latency_ms": 500.0,
+        })
+
+
+@unittest.skipUnless(get_passcode_v2 is not None, "requests or requests-aws4auth is not installed")
+class TestBatchLookup(unittest.TestCase):
+    def setUp(self):
+        helper = fakes.FakeMidwayHelper()
+        patches = [
+            mock.patch.object(get_passcode_v2, "_worker_midway_helper", helper),
+            mock.patch.object(get_passcode_v2, "_worker_client", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_explicit_region(self):
+        get_passcode_v2._worker_client = PasscodeClient(fake_get_passcode)
+        serial_number, region, data, seconds = get_passcode_v2._batch_lookup(("G030A1", "eu-west-1"))
+        self.assertEqual((serial_number, region), ("G030A1", Region.eu_west_1))
+        self.assertEqual(data["reported"], "111111")
+        self.assertGreaterEqual(seconds, 0)
+
+    def test_auto_region(self):
+        get_passcode_v2._worker_client = PasscodeClient(only_in_us_west_2)
+        _, region, data, _ = get_passcode_v2._batch_lookup(("G030A1", "auto"))
+        self.assertEqual((region, data), (Region.us_west_2, {"reported": "333333"}))
+
+
+@unittest.skipUnless(get_passcode_v2 is not None, "requests or requests-aws4auth is not installed")
+@unittest.skipUnless(forks, "worker processes only inherit the fakes when forked")
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(get_passcode_v2, "_shared_midway_helper", fakes.FakeMidwayHelper())
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_against_stand_in(self):
+        account = get_passcode_v2.device_admin_lambda_accounts[Region.us_east_1]
+        with StandInServer(use_tls=False) as server, \
+                mock.patch.dict(account, {"endpoint": server.base_url}):
+            output = io.StringIO()
+            summary = get_passcode_v2.run_batch(["G030A1", "G030B2", "G030C3"], "us-east-1", 2, output=output)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(record["serial"] for record in records), ["G030A1", "G030B2", "G030C3"])
+        for record in records:
+            self.assertEqual((record["region"], record["current"], record["upcoming"]), ("us-east-1", "123456", ""))
+        self.assertEqual((summary["devices"], summary["failed"], summary["workers"]), (3, 0, 2))
+        self.assertIn("p95_ms", summary)
+
+    def test_main_reads_file_and_reports_failures(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, "serials.csv")
+        with open(path, "w", newline="") as file:
+            file.write("serial,site\nG030A1,SEA\nBAD0001,SEA\nG030A1,SEA\n")
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(get_passcode_v2, "get_passcode", fake_get_passcode), \
+                redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = get_passcode_v2.main(["--batch", "-f", path, "-r", "us-east-1", "-w", "4"])
+
+        self.assertEqual(exit_code, 1)
+        records = {record["serial"]: record for record in map(json.loads, stdout.getvalue().splitlines())}
+        self.assertEqual(set(records), {"G030A1", "BAD0001"})
+        self.assertEqual(records["G030A1"]["upcoming"], "222222")
+        self.assertEqual(records["BAD0001"]["error"], "404 Client Error")
+        self.assertIn("2 devices, 1 failed", stderr.getvalue())
+
+
+@unittest.skipUnless(get_passcode_v2 is not None, "requests or requests-aws4auth is not installed")
+class TestMain(unittest.TestCase):
+    def test_without_batch_opens_window(self):
+        with mock.patch.object(get_passcode_v2, "run_gui", return_value=0) as run_gui:
+            self.assertEqual(get_passcode_v2.main([]), 0)
+        run_gui.assert_called_once_with()
+
+    def test_serials_require_batch(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            get_passcode_v2.main(["G030A1"])
+
+    def test_no_valid_serials(self):
+        stderr = io.StringIO()
+        with mock.patch.object(sys, "stdin", io.StringIO("serial\n\n")), redirect_stderr(stderr):
+            self.assertEqual(get_passcode_v2.main(["--batch"]), 1)
+        self.assertIn("No valid serial numbers", stderr.getvalue())
+
+    def test_spans_share_the_timing_module(self):
+        import timing
+        self.assertIs(sys.modules[get_passcode_v2.span.__module__], timing)
+
+    def test_batch_does_not_import_tk(self):
+        package_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, gui.get_passcode_v2; print('tkinter' in sys.modules)"],
+            capture_output=True, text=True, cwd=package_dir, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import sys
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import requests  # noqa: F401
+    from http_pool import SessionPool, SignerCache, get_session_pool
+except ImportError:
+    requests = None
+
+
+class KeepAliveStandIn(BaseHTTPRequestHandler):
+    """
+    Answers every GET with 200 and records the client port, one per TCP connection.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    client_ports = []
+
+    def do_GET(self):
+        self.client_ports.append(self.client_address[1])
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSigner:
+    def __init__(self, access_key_id, secret_key, region, service, session_token=None):
+        self.args = (access_key_id, secret_key, region, service, session_token)
+
+
+@unittest.skipUnless(requests is not None, "requests is not installed")
+class TestSessionPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveStandIn)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        KeepAliveStandIn.client_ports = []
+        self.pool = SessionPool()
+        self.addCleanup(self.pool.close)
+
+    def test_one_session_per_endpoint(self):
+        first = self.pool.get("https://device-admin.example.com/devices/A/passcode")
+        self.assertIs(self.pool.get("https://device-admin.example.com/devices/B/passcode?x=1"), first)
+        self.assertIsNot(self.pool.get("https://other.example.com/devices/A/passcode"), first)
+        self.assertIsNot(self.pool.get("http://device-admin.example.com/devices/A/passcode"), first)
+        self.assertIsNot(self.pool.get("https://device-admin.example.com:8443/"), first)
+
+    def test_requests_reuse_the_connection(self):
+        url = f"{self.base_url}/devices/G030A/passcode"
+        for _ in range(5):
+            self.pool.get(url).get(url, timeout=5).raise_for_status()
+        self.assertEqual(len(KeepAliveStandIn.client_ports), 5)
+        self.assertEqual(len(set(KeepAliveStandIn.client_ports)), 1)
+
+    def test_close_drops_sessions(self):
+        session = self.pool.get(self.base_url)
+        self.pool.close()
+        self.assertIsNot(self.pool.get(self.base_url), session)
+
+    def test_shared_pool(self):
+        self.assertIs(get_session_pool(), get_session_pool())
+
+
+@unittest.skipUnless(requests is not None, "requests is not installed")
+class TestSignerCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SignerCache(factory=FakeSigner)
+
+    def test_reuses_signer_for_same_credentials_and_scope(self):
+        signer = self.cache.get("AKID", "secret", "token", "us-east-1")
+        self.assertIs(self.cache.get("AKID", "secret", "token", "us-east-1", "execute-api"), signer)
+        self.assertEqual(signer.args, ("AKID", "secret", "us-east-1", "execute-api", "token"))
+
+    def test_scopes_are_separate(self):
+        east = self.cache.get("AKID", "secret", "token", "us-east-1")
+        west = self.cache.get("AKID", "secret", "token", "us-west-2")
+        other_service = self.cache.get("AKID", "secret", "token", "us-east-1", "s3")
+        self.assertIsNot(east, west)
+        self.assertIsNot(east, other_service)
+        self.assertIs(self.cache.get("AKID", "secret", "token", "us-east-1"), east)
+
+    def test_rotated_credentials_rebuild_the_signer(self):
+        old = self.cache.get("AKID", "secret", "token", "us-east-1")
+        new = self.cache.get("AKID2", "secret2", "token2", "us-east-1")
+        self.assertIsNot(new, old)
+        self.assertEqual(new.args[0], "AKID2")
+        # Only the latest credentials are kept per scope.
+        self.assertIsNot(self.cache.get("AKID", "secret", "token", "us-east-1"), old)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import sys
+import os
+import random
+import threading
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gui.key_list_model import KeyedListModel, SecurityKeysListView
+from benchmarks.fakes import FakeTextbox
+
+
+class FakeListbox:
+    """
+    Listbox stand-in: integer indexes only, like tkinter.Listbox.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def curselection(self):
+        return ()
+
+    def delete(self, first, last=None):
+        if last == "end":
+            del self.items[first:]
+        else:
+            del self.items[int(first)]
+
+    def insert(self, index, label):
+        self.items.insert(int(index), label)
+
+
+class FakeTkRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, func):
+        self.scheduled.append(func)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for func in scheduled:
+            func()
+
+
+class TestKeyedListModel(unittest.TestCase):
+    def test_only_changes_are_applied(self):
+        textbox = FakeTextbox()
+        view = SecurityKeysListView(textbox)
+        keys = [f"Key {index}" for index in range(100)]
+        view.render(keys)
+        self.assertEqual(textbox.lines, keys)
+
+        textbox.operations = 0
+        keys[50] = "Key 100"
+        view.render(keys)
+        self.assertEqual(textbox.lines, keys)
+        self.assertEqual(textbox.operations, 2)
+
+        textbox.operations = 0
+        view.render(keys)
+        self.assertEqual(textbox.operations, 0)
+
+    def test_duplicate_names_and_reordering(self):
+        model = KeyedListModel()
+        rows = []
+
+        def apply(operations):
+            for operation in operations:
+                if operation[0] == "remove":
+                    del rows[operation[1]]
+                else:
+                    rows.insert(operation[1], operation[2])
+
+        generator = random.Random(7)
+        names = ["YubiKey 5 NFC", "Amazon ZUKEY 2 HID", "Feitian ePass"]
+        for _ in range(200):
+            snapshot = [generator.choice(names) for _ in range(generator.randint(0, 8))]
+            apply(model.diff(snapshot))
+            self.assertEqual(rows, snapshot)
+
+    def test_listbox_uses_integer_indexes(self):
+        listbox = FakeListbox()
+        view = SecurityKeysListView(listbox)
+        view.render(["A", "B", "C"])
+        view.render(["A", "C", "D"])
+        self.assertEqual(listbox.items, ["A", "C", "D"])
+
+    def test_submissions_coalesce_into_one_repaint_per_frame(self):
+        root = FakeTkRoot()
+        textbox = FakeTextbox()
+        view = SecurityKeysListView(textbox, tk_root=root)
+        view.start()
+
+        def monitor():
+            for count in range(1, 51):
+                view.submit([f"Key {index}" for index in range(count)])
+
+        thread = threading.Thread(target=monitor)
+        thread.start()
+        thread.join()
+        root.run_pending()
+
+        self.assertEqual(view.repaints, 1)
+        self.assertEqual(len(textbox.lines), 50)
+        view.stop()
+        root.run_pending()
+        self.assertEqual(root.scheduled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from key_registry import (
+    Descriptor, DescriptorCache, KeyDefinition, SecurityKeyRegistry, get_key_registry, load_definitions
+)
+
+
+def make_device(vendor_id, product_id, path=b"/dev/hidraw0", usage_page=0x0001, **extra):
+    device = {"path": path, "vendor_id": vendor_id, "product_id": product_id, "usage_page": usage_page}
+    device.update(extra)
+    return device
+
+
+class FakeReader:
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.paths = []
+
+    def __call__(self, path):
+        self.paths.append(path)
+        return self.descriptor
+
+
+class TestSecurityKeyRegistry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_shared_registry_knows_zukey(self):
+        self.assertEqual(get_key_registry().lookup(make_device(0x1949, 0x0429)), "Amazon ZUKEY 2 HID")
+        self.assertEqual(get_key_registry().lookup(make_device(0x18d1, 0x5020)), "Google Titan Security Key")
+
+    def test_conflicting_definitions_keep_first(self):
+        registry = SecurityKeyRegistry([
+            KeyDefinition("First", 0x1234, 0x0001, ()),
+            KeyDefinition("Second", 0x1234, 0x0001, ()),
+        ])
+        self.assertEqual(registry.lookup(make_device(0x1234, 0x0001)), "First")
+        with self.assertRaises(TypeError):
+            registry.index[(1, 2)] = None
+
+    def test_serial_prefix_fallback(self):
+        registry = SecurityKeyRegistry([
+            KeyDefinition("Vendor Key", None, None, ("VK",)),
+            KeyDefinition("Vendor Key Pro", None, None, ("VKP",)),
+        ])
+        self.assertEqual(registry.lookup(make_device(0x9999, 0x0001, serial_number="VK123")), "Vendor Key")
+        self.assertEqual(registry.lookup(make_device(0x9999, 0x0001, serial_number="VKP123")), "Vendor Key Pro")
+        self.assertIsNone(registry.lookup(make_device(0x9999, 0x0001, serial_number="XX123")))
+
+    def test_usage_page_fallback_reads_descriptor_once(self):
+        reader = FakeReader(Descriptor("Acme", "Acme FIDO Key", "123"))
+        registry = SecurityKeyRegistry([], DescriptorCache(reader))
+        device = make_device(0x9999, 0x0002, usage_page=0xF1D0, product_string="")
+        for _ in range(5):
+            self.assertEqual(registry.lookup(device), "Acme FIDO Key")
+        self.assertEqual(reader.paths, [b"/dev/hidraw0"])
+
+        registry.descriptor_cache.prune([])
+        registry.lookup(device)
+        self.assertEqual(len(reader.paths), 2)
+
+    def test_unreadable_descriptor_is_cached(self):
+        def reader(path):
+            raise OSError("access denied")
+
+        registry = SecurityKeyRegistry([], DescriptorCache(reader))
+        device = make_device(0x9999, 0x0002, usage_page=0xF1D0)
+        self.assertEqual(registry.lookup(device), "FIDO Security Key")
+        registry.lookup(device)
+        self.assertEqual(registry.descriptor_cache.reads, 1)
+
+    def test_load_definitions(self):
+        path = os.path.join(self.temp_dir, "security_keys.json")
+        with open(path, "w") as f:
+            json.dump([
+                {"name": "Example Key", "idVendor": "0x1234", "idProduct": "0x5678"},
+                {"name": "Serial Key", "serial_prefixes": ["SK"]},
+                {"idVendor": 1},
+            ], f)
+        definitions = load_definitions(path)
+        self.assertEqual(definitions[0], KeyDefinition("Example Key", 0x1234, 0x5678, ()))
+        self.assertEqual(definitions[1].serial_prefixes, ("SK",))
+        self.assertEqual(len(definitions), 2)
+        self.assertEqual(load_definitions(os.path.join(self.temp_dir, "missing.json")), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import sys
+import os
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lazy_import import lazy_import
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_imports_on_first_use(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+        self.assertFalse(colorsys.is_loaded)
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(colorsys.is_loaded)
+
+    def test_missing_module_fails_at_use(self):
+        missing = lazy_import("module_that_does_not_exist")
+        with self.assertRaises(ImportError):
+            missing.anything
+
+
+if __name__ == '__main__':
+    unittest.main()
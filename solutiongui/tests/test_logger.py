@@ -0,0 +1,122 @@
+import sys
+import os
+import logging
+import queue
+import shutil
+import tempfile
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logger import BoundedQueueHandler, BoundedQueueListener, SizeAndTimeRotatingFileHandler, TextBoxHandler
+
+
+def make_record(message, level=logging.INFO, args=None):
+    return logging.LogRecord("test", level, __file__, 1, message, args, None)
+
+
+class FakeTextbox:
+    def __init__(self):
+        self.text = ""
+        self.inserts = 0
+        self.scheduled = []
+
+    def after(self, delay_ms, func):
+        self.scheduled.append(func)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for func in scheduled:
+            func()
+
+    def configure(self, **kwargs):
+        pass
+
+    def insert(self, index, text):
+        self.inserts += 1
+        self.text += text
+
+    def index(self, index):
+        return f"{self.text.count(chr(10)) + 1}.0"
+
+    def delete(self, start, end):
+        line = int(end.split(".")[0]) - 1
+        self.text = "".join(self.text.splitlines(True)[line:])
+
+    def see(self, index):
+        pass
+
+
+class TestBoundedQueueHandler(unittest.TestCase):
+    def drain(self, log_queue):
+        messages = []
+        while not log_queue.empty():
+            messages.append(log_queue.get_nowait().getMessage())
+        return messages
+
+    def test_drop_oldest(self):
+        log_queue = queue.Queue(maxsize=3)
+        handler = BoundedQueueHandler(log_queue, overflow="drop_oldest")
+        for index in range(5):
+            handler.handle(make_record(f"record {index}"))
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(self.drain(log_queue), ["record 2", "record 3", "record 4"])
+
+        handler.handle(make_record("after"))
+        self.assertEqual(self.drain(log_queue), ["Log queue full: dropped 2 log record(s).", "after"])
+
+    def test_drop_newest(self):
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, overflow="drop_newest", block_timeout=0.01)
+        for index in range(4):
+            handler.handle(make_record(f"record {index}"))
+        self.assertEqual(self.drain(log_queue), ["record 0", "record 1"])
+        self.assertEqual(handler.dropped, 2)
+
+    def test_args_are_merged_on_the_calling_thread(self):
+        log_queue = queue.Queue()
+        handler = BoundedQueueHandler(log_queue)
+        keys = ["A"]
+        handler.handle(make_record("keys: %s", args=(keys,)))
+        keys.append("B")
+        self.assertEqual(self.drain(log_queue), ["keys: ['A']"])
+
+    def test_listener_writes_and_stops_with_full_queue(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "link_opener.log")
+            file_handler = SizeAndTimeRotatingFileHandler(path, max_bytes=200, backup_count=2)
+            log_queue = queue.Queue(maxsize=2)
+            handler = BoundedQueueHandler(log_queue, overflow="block", block_timeout=1.0)
+            listener = BoundedQueueListener(log_queue, file_handler)
+            listener.start()
+            for index in range(50):
+                handler.handle(make_record(f"Detected new security key {index}"))
+            listener.stop()
+            file_handler.close()
+            self.assertTrue(os.path.exists(path + ".1"))
+            self.assertFalse(os.path.exists(path + ".3"))
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestTextBoxHandler(unittest.TestCase):
+    def test_records_are_batched_per_frame(self):
+        textbox = FakeTextbox()
+        handler = TextBoxHandler(textbox, max_lines=10)
+        handler.start()
+        for index in range(25):
+            handler.handle(make_record(f"line {index}"))
+        textbox.run_pending()
+        self.assertEqual(textbox.inserts, 1)
+        self.assertEqual(textbox.text.splitlines()[-1], "line 24")
+        self.assertLessEqual(len(textbox.text.splitlines()), 10)
+
+        handler.stop()
+        textbox.run_pending()
+        self.assertEqual(textbox.scheduled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
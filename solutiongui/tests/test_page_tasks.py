@@ -0,0 +1,98 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import browser_pool
+import route_profiles
+from benchmarks import fakes
+from config_store import ConfigStore
+from page_tasks import SUCCESS, TIMEOUT, PageTask, async_run_page_tasks, page_content_length
+
+DELAYS = {
+    "https://fast.example.com/": 0.05,
+    "https://medium.example.com/": 0.1,
+    "https://slow.example.com/": 0.2,
+    "https://dashboard.example.com/": 0.15,
+    "https://reports.example.com/": 0.1,
+    "https://hung.example.com/": 5.0,
+}
+
+
+class TestPageTasks(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ConfigStore(os.path.join(self.temp_dir, "gui_config.json"), debounce_seconds=10)
+        self.api = fakes.FakePlaywrightApi(
+            launch_delay=0, page_delays=DELAYS, page_statuses={"https://medium.example.com/": 503}
+        )
+        patches = [
+            mock.patch.object(browser_pool, "get_config_store", return_value=self.store),
+            mock.patch.object(route_profiles, "get_config_store", return_value=self.store),
+            mock.patch.object(browser_pool, "playwright_api", self.api),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_batch_takes_about_as_long_as_the_slowest_page(self):
+        tasks = [PageTask(url.split("/")[2], url) for url in DELAYS if "hung" not in url]
+        report = asyncio.run(async_run_page_tasks(tasks, concurrency=len(tasks), timeout_ms=2000))
+        summary = report.summary()
+
+        self.assertEqual([result.name for result in report.results], [task.name for task in tasks])
+        self.assertEqual((summary["succeeded"], summary["failed"]), (4, 1))
+        self.assertEqual(report.failed[0].error, "HTTP 503")
+        self.assertLess(summary["wall_ms"], summary["slowest_ms"] + 100)
+        self.assertGreater(summary["speedup"], 2)
+
+    def test_concurrency_limit_and_timeout(self):
+        tasks = [PageTask("hung", "https://hung.example.com/"),
+                 PageTask("reports", "https://reports.example.com/", page_content_length)]
+        report = asyncio.run(async_run_page_tasks(tasks, concurrency=1, timeout_ms=300))
+        hung, reports = report.results
+        self.assertEqual(hung.outcome, TIMEOUT)
+        self.assertEqual(reports.outcome, SUCCESS)
+        self.assertGreater(reports.value, 0)
+        # With one slot the second task waited for the first to time out.
+        self.assertGreater(report.wall_ms, 350)
+
+    def test_batch_runs_headless_with_the_saved_browser(self):
+        self.store.set("browser_type", "firefox")
+        asyncio.run(async_run_page_tasks([PageTask("fast", "https://fast.example.com/")]))
+        firefox = self.api.started[0].firefox
+        self.assertEqual(firefox.launch_options, [{"headless": True}])
+        self.assertEqual(self.api.started[0].chromium.launches, 0)
+
+    def test_shared_pool_follows_settings(self):
+        async def scenario():
+            first = browser_pool.get_browser_pool()
+            self.store.update({"headless_mode": True})
+            second = browser_pool.get_browser_pool()
+            await asyncio.sleep(0)
+            await browser_pool.close_browser_pool()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertIsNot(first, second)
+        self.assertTrue(first._closed)
+        self.assertEqual((second.browser_type, second.headless), ("chromium", True))
+
+    def test_launch_options(self):
+        self.assertEqual(browser_pool.launch_options("chromium", False),
+                         {"headless": False, "channel": "chrome", "args": ["--start-maximized"]})
+        self.assertEqual(browser_pool.launch_options("chromium", True), {"headless": True, "channel": "chrome"})
+        self.assertEqual(browser_pool.launch_options("firefox", False), {"headless": False})
+
+
+if __name__ == '__main__':
+    unittest.main()
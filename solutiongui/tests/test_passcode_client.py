@@ -0,0 +1,178 @@
+import sys
+import os
+import json
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from passcode_client import PasscodeClient
+
+
+class PasscodeStandIn(BaseHTTPRequestHandler):
+    """
+    Device-admin stand-in: GET /<region>/devices/<serial>/passcode answers after `delay`
+    seconds with the passcodes in `devices` and counts the requests it served.
+    """
+    delay = 0.0
+    devices = {}
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            type(self).requests += 1
+        time.sleep(self.delay)
+        parts = self.path.strip("/").split("/")
+        serial = parts[2] if len(parts) == 4 else None
+        if serial in self.devices:
+            status, payload = 200, dict(self.devices[serial])
+        else:
+            status, payload = 404, {"message": "Not Found"}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPasscodeClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), PasscodeStandIn)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        PasscodeStandIn.delay = 0.0
+        PasscodeStandIn.requests = 0
+        PasscodeStandIn.devices = {"G030A": {"reported": "111111", "desired": "111111"}}
+        self.clock = FakeClock()
+        self.client = PasscodeClient(self.fetch, ttl_seconds=30, clock=self.clock)
+
+    def fetch(self, serial_number, region):
+        # Same contract as get_passcode: (region, data) with errors folded into data.
+        url = f"{self.base_url}/{region}/devices/{serial_number}/passcode"
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return region, json.loads(response.read())
+        except Exception as e:
+            return region, {"error": str(e)}
+
+    def test_concurrent_lookups_share_one_request(self):
+        PasscodeStandIn.delay = 0.2
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.client.get("G030A", "us-east-1")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(PasscodeStandIn.requests, 1)
+        self.assertEqual(results, [("us-east-1", {"reported": "111111", "desired": "111111"})] * 8)
+        stats = self.client.stats()
+        self.assertEqual((stats["misses"], stats["coalesced"]), (1, 7))
+
+    def test_regions_are_looked_up_separately(self):
+        self.client.get("G030A", "us-east-1")
+        self.client.get("G030A", "eu-west-1")
+        self.assertEqual(PasscodeStandIn.requests, 2)
+
+    def test_settled_passcode_is_cached_until_ttl(self):
+        self.client.get("G030A", "us-east-1")
+        self.clock.now = 29
+        self.client.get("G030A", "us-east-1")
+        self.assertEqual(PasscodeStandIn.requests, 1)
+        self.assertEqual(self.client.stats()["hits"], 1)
+        self.clock.now = 31
+        self.client.get("G030A", "us-east-1")
+        self.assertEqual(PasscodeStandIn.requests, 2)
+        self.assertEqual(self.client.stats()["misses"], 2)
+
+    def test_pending_rotation_drops_cached_entry(self):
+        self.client.get("G030A", "us-east-1")
+        PasscodeStandIn.devices["G030A"] = {"reported": "111111", "desired": "222222"}
+        self.clock.now = 31
+        _, data = self.client.get("G030A", "us-east-1")
+        self.assertEqual(data["desired"], "222222")
+        _, data = self.client.get("G030A", "us-east-1")
+        self.assertEqual(PasscodeStandIn.requests, 3)
+        stats = self.client.stats()
+        self.assertEqual((stats["dropped"], stats["entries"], stats["hits"]), (1, 0, 0))
+
+        # Once the device reports the new passcode it is cached again.
+        PasscodeStandIn.devices["G030A"] = {"reported": "222222", "desired": "222222"}
+        self.client.get("G030A", "us-east-1")
+        _, data = self.client.get("G030A", "us-east-1")
+        self.assertEqual(data["reported"], "222222")
+        self.assertEqual(PasscodeStandIn.requests, 4)
+
+    def test_errors_are_not_cached(self):
+        _, data = self.client.get("UNKNOWN", "us-east-1")
+        self.assertIn("error", data)
+        self.client.get("UNKNOWN", "us-east-1")
+        self.assertEqual(PasscodeStandIn.requests, 2)
+
+    def test_followers_see_leader_exception(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing_fetch(serial_number, region):
+            started.set()
+            release.wait(5)
+            raise ConnectionError("endpoint unreachable")
+
+        client = PasscodeClient(failing_fetch)
+        errors = []
+
+        def lookup():
+            try:
+                client.get("G030A", "us-east-1")
+            except ConnectionError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=lookup)
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lookup)
+        follower.start()
+        while client.stats()["coalesced"] == 0:
+            time.sleep(0.01)
+        release.set()
+        leader.join()
+        follower.join()
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(client.stats()["entries"], 0)
+
+    def test_invalidate(self):
+        self.client.get("G030A", "us-east-1")
+        self.client.invalidate("G030A")
+        self.client.get("G030A", "us-east-1")
+        self.assertEqual(PasscodeStandIn.requests, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
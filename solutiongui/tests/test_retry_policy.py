@@ -0,0 +1,177 @@
+import sys
+import os
+import asyncio
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from retry_policy import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, async_call_with_retry, call_with_retry, is_retryable,
+    is_retryable_network_error,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Flaky:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+class TestClassification(unittest.TestCase):
+    def test_status_codes(self):
+        self.assertTrue(is_retryable(HTTPError(503)))
+        self.assertTrue(is_retryable(HTTPError(429)))
+        self.assertFalse(is_retryable(HTTPError(404)))
+
+    def test_timeouts_and_throttling(self):
+        self.assertTrue(is_retryable(TimeoutError()))
+        throttled = Exception("throttled")
+        throttled.response = {"Error": {"Code": "ThrottlingException"}}
+        self.assertTrue(is_retryable(throttled))
+        self.assertFalse(is_retryable(ValueError("bad input")))
+
+    def test_browser_network_errors(self):
+        # Playwright raises its generic Error for navigation failures.
+        class Error(Exception):
+            pass
+
+        self.assertTrue(is_retryable(Error("net::ERR_CONNECTION_RESET at https://example.com/")))
+        self.assertTrue(is_retryable(Error("NS_ERROR_NET_RESET")))
+        self.assertFalse(is_retryable(Error("net::ERR_NAME_NOT_RESOLVED at https://example.com/")))
+
+    def test_network_errors_only(self):
+        class TimeoutError(Exception):
+            pass
+
+        self.assertTrue(is_retryable_network_error(Exception("net::ERR_CONNECTION_RESET at https://example.com/")))
+        self.assertFalse(is_retryable_network_error(TimeoutError("Timeout 60000ms exceeded.")))
+
+
+class TestCallWithRetry(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def call(self, func, policy=None, breaker=None):
+        return call_with_retry(func, policy or RetryPolicy(), breaker, sleep=self.clock.sleep, clock=self.clock)
+
+    def test_retries_transient_then_succeeds(self):
+        func = Flaky([HTTPError(502), TimeoutError()])
+        self.assertEqual(self.call(func), "ok")
+        self.assertEqual(func.calls, 3)
+        self.assertEqual(len(self.clock.sleeps), 2)
+
+    def test_client_error_is_not_retried(self):
+        func = Flaky([HTTPError(403)])
+        with self.assertRaises(HTTPError):
+            self.call(func)
+        self.assertEqual(func.calls, 1)
+
+    def test_attempt_limit(self):
+        func = Flaky([HTTPError(500)] * 10)
+        with self.assertRaises(HTTPError):
+            self.call(func, RetryPolicy(max_attempts=3))
+        self.assertEqual(func.calls, 3)
+
+    def test_backoff_is_bounded_and_jittered(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+        for attempt in range(1, 8):
+            delay = policy.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(3.0, 2 ** (attempt - 1)))
+
+    def test_deadline_stops_retries(self):
+        policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=1.0, deadline=0.5)
+        policy.backoff = lambda attempt: 1.0
+        func = Flaky([HTTPError(500)] * 10)
+        with self.assertRaises(HTTPError):
+            self.call(func, policy)
+        self.assertEqual(func.calls, 1)
+
+    def test_circuit_breaker_opens_and_recovers(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=self.clock)
+        policy = RetryPolicy(max_attempts=1)
+        for _ in range(2):
+            with self.assertRaises(HTTPError):
+                self.call(Flaky([HTTPError(500)]), policy, breaker)
+        with self.assertRaises(CircuitOpenError):
+            self.call(Flaky([]), policy, breaker)
+        self.clock.now += 10
+        self.assertEqual(self.call(Flaky([]), policy, breaker), "ok")
+        self.assertEqual(breaker.state, "closed")
+
+    def test_interrupted_trial_reopens_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=self.clock)
+        policy = RetryPolicy(max_attempts=1)
+        with self.assertRaises(HTTPError):
+            self.call(Flaky([HTTPError(500)]), policy, breaker)
+        self.clock.now += 10
+        with self.assertRaises(KeyboardInterrupt):
+            self.call(Flaky([KeyboardInterrupt()]), policy, breaker)
+        self.assertEqual(breaker.state, "open")
+        self.assertEqual(self.call(Flaky([]), policy, breaker), "ok")
+
+
+class TestAsyncCallWithRetry(unittest.IsolatedAsyncioTestCase):
+    async def test_retries_coroutine(self):
+        func = Flaky([TimeoutError()])
+
+        async def navigate():
+            return func()
+
+        result = await async_call_with_retry(navigate, RetryPolicy(base_delay=0.001))
+        self.assertEqual(result, "ok")
+        self.assertEqual(func.calls, 2)
+
+    async def test_cancelled_trial_does_not_stick_half_open(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        task = asyncio.create_task(async_call_with_retry(hang, RetryPolicy(max_attempts=1), breaker, clock=clock))
+        await started.wait()
+        self.assertEqual(breaker.state, "half_open")
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import route_profiles
+from config_store import ConfigStore
+from route_profiles import FULL, MINIMAL, ReadyCondition, SavingsTracker, is_allowed, link_settings, navigate
+
+# (url, resource type, size in bytes) requested by the fake dashboard page.
+SUBRESOURCES = [
+    ("https://toolkit.corp.amazon.com/app.js", "script", 40000),
+    ("https://toolkit.corp.amazon.com/style.css", "stylesheet", 10000),
+    ("https://toolkit.corp.amazon.com/logo.png", "image", 80000),
+    ("https://static.amazon.com/font.woff2", "font", 30000),
+    ("https://analytics.example.net/beacon.js", "script", 5000),
+]
+
+
+class FakeFrame:
+    def __init__(self, url):
+        self.url = url
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, frame=None):
+        self.url = url
+        self.resource_type = resource_type
+        if frame is not None:
+            self.frame = frame
+
+
+class FakeResponse:
+    def __init__(self, request, size):
+        self.request = request
+        self.headers = {"content-length": str(size)}
+        self.status = 200
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.allowed = None
+
+    async def continue_(self):
+        self.allowed = True
+
+    async def abort(self, error_code=None):
+        self.allowed = False
+
+
+class FakeRoutingPage:
+    """
+    Page that requests SUBRESOURCES through the installed route handler; every
+    request takes `request_delay` seconds unless blocked.
+    """
+
+    def __init__(self, request_delay=0.01):
+        self.request_delay = request_delay
+        self.handlers = {}
+        self.route_handler = None
+        self.waited_for = []
+
+    def on(self, event, callback):
+        self.handlers[event] = callback
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    async def goto(self, url, timeout=None, wait_until=None):
+        document = FakeRequest(url, "document")
+        self.handlers["request"](document)
+        self.handlers["response"](FakeResponse(document, 2000))
+        for resource_url, resource_type, size in SUBRESOURCES:
+            request = FakeRequest(resource_url, resource_type)
+            self.handlers["request"](request)
+            route = FakeRoute(request)
+            if self.route_handler is None:
+                route.allowed = True
+            else:
+                await self.route_handler(route)
+            if route.allowed:
+                await asyncio.sleep(self.request_delay)
+                self.handlers["response"](FakeResponse(request, size))
+        return FakeResponse(document, 2000)
+
+    async def wait_for_load_state(self, state="load", timeout=None):
+        self.waited_for.append(("load_state", state))
+
+    async def wait_for_selector(self, selector, state="visible", timeout=None):
+        self.waited_for.append(("selector", selector))
+
+
+class TestRouteProfiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ConfigStore(os.path.join(self.temp_dir, "gui_config.json"), debounce_seconds=10)
+        patch = mock.patch.object(route_profiles, "get_config_store", return_value=self.store)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_minimal_profile_decisions(self):
+        site = "amazon.com"
+        self.assertTrue(is_allowed(MINIMAL, "https://toolkit.corp.amazon.com/app.js", "script", site))
+        self.assertTrue(is_allowed(MINIMAL, "https://cdn.example.net/page", "document", site))
+        self.assertFalse(is_allowed(MINIMAL, "https://toolkit.corp.amazon.com/logo.png", "image", site))
+        self.assertFalse(is_allowed(MINIMAL, "https://analytics.example.net/beacon.js", "script", site))
+        self.assertTrue(is_allowed(FULL, "https://analytics.example.net/beacon.js", "script", site))
+
+    def test_per_link_overrides(self):
+        self.assertEqual(link_settings("GENERAL DASHBOARD"), (MINIMAL, ReadyCondition(load_state="domcontentloaded")))
+        self.assertEqual(link_settings("REPORTS")[0], FULL)
+
+        self.store.set("route_profiles", {
+            "TICKETS LINK": {"profile": "allowlist", "allow": ["*.example.net"], "ready": {"selector": "#list"}},
+        })
+        profile, ready = link_settings("TICKETS LINK")
+        self.assertEqual(profile.name, "allowlist")
+        self.assertEqual(ready, ReadyCondition(selector="#list"))
+        self.assertTrue(is_allowed(profile, "https://analytics.example.net/beacon.js", "script", "amazon.dev"))
+        self.assertTrue(is_allowed(profile, "https://sn.opstechit.amazon.dev/logo.png", "image", "amazon.dev"))
+        self.assertFalse(is_allowed(profile, "https://ads.example.com/ad.js", "script", "amazon.dev"))
+
+    def test_navigation_reports_savings(self):
+        url = "https://toolkit.corp.amazon.com/"
+        tracker = SavingsTracker(smoothing=1.0)
+        self.store.set("route_profiles", {"DASHBOARD FULL": {"profile": "full"}})
+
+        _, full = asyncio.run(navigate(FakeRoutingPage(), url, "DASHBOARD FULL", tracker=tracker))
+        self.assertEqual((full.requests, full.blocked, full.bytes_loaded), (6, 0, 167000))
+
+        # Use the full navigation as the time baseline for the minimal one.
+        tracker._full_ms["DASHBOARD"] = full.duration_ms
+        page = FakeRoutingPage()
+        _, minimal = asyncio.run(navigate(page, url, "DASHBOARD", tracker=tracker))
+        self.assertEqual((minimal.requests, minimal.blocked, minimal.bytes_loaded), (6, 3, 52000))
+        # Estimated from the latest size per type (smoothing=1.0): image, font, and the last script (app.js).
+        self.assertEqual(minimal.bytes_saved, 80000 + 30000 + 40000)
+        self.assertGreater(minimal.ms_saved, 0)
+        self.assertEqual(page.waited_for, [("load_state", "domcontentloaded")])
+
+    def test_redirect_to_another_site_keeps_its_first_party(self):
+        page = FakeRoutingPage()
+        stats = route_profiles.NavigationStats(MINIMAL)
+        asyncio.run(route_profiles.apply_profile(
+            page, MINIMAL, "https://sn.opstechit.amazon.dev/now/sow/list", stats, SavingsTracker()
+        ))
+        # The document redirected to the Midway login on amazon.com.
+        login = FakeFrame("https://midway-auth.amazon.com/SSO/redirect")
+
+        def decide(url, resource_type, frame):
+            route = FakeRoute(FakeRequest(url, resource_type, frame))
+            asyncio.run(page.route_handler(route))
+            return route.allowed
+
+        self.assertTrue(decide("https://midway-auth.amazon.com/static/login.js", "script", login))
+        self.assertTrue(decide("https://midway-auth.amazon.com/api/session", "xhr", login))
+        self.assertTrue(decide("https://sn.opstechit.amazon.dev/api/list", "xhr", login))
+        self.assertFalse(decide("https://analytics.example.net/beacon.js", "script", login))
+        self.assertFalse(decide("https://midway-auth.amazon.com/logo.png", "image", login))
+        # Requests without a frame (service workers) fall back to the starting site.
+        self.assertFalse(decide("https://midway-auth.amazon.com/static/login.js", "script", None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urlparse
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import automation
+from session_cache import StorageStateCache
+
+
+def cookie_header(storage_state, url):
+    """
+    Builds a Cookie header value from a storage state, standing in for the browser when
+    the login stand-in is called with urllib.
+
+    Args:
+        storage_state (dict): Storage state as saved by Playwright.
+        url (str): The URL the request is sent to.
+
+    Returns:
+        str: Header value such as "a=1; b=2" (empty if no cookie matches).
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    path = parsed.path or "/"
+    now = time.time()
+    pairs = []
+    for cookie in (storage_state or {}).get("cookies", []):
+        domain = cookie.get("domain", "").lstrip(".")
+        if domain and host != domain and not host.endswith(f".{domain}"):
+            continue
+        if not path.startswith(cookie.get("path", "/")):
+            continue
+        if cookie.get("secure") and parsed.scheme != "https":
+            continue
+        if 0 <= cookie.get("expires", -1) <= now:
+            continue
+        pairs.append(f"{cookie['name']}={cookie['value']}")
+    return "; ".join(pairs)
+
+
+class LoginStandIn(BaseHTTPRequestHandler):
+    """
+    Minimal login stand-in: /protected needs a valid session cookie, otherwise it
+    redirects to /login.
+    """
+    valid_sessions = set()
+
+    def do_GET(self):
+        cookie = self.headers.get("Cookie", "")
+        session = dict(part.split("=", 1) for part in cookie.split("; ") if "=" in part).get("session")
+        if self.path == "/protected" and session not in self.valid_sessions:
+            self.send_response(302)
+            self.send_header("Location", "/login")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(self.path.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestStorageStateCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), LoginStandIn)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = StorageStateCache(cache_dir=self.cache_dir)
+        LoginStandIn.valid_sessions = {"abc123"}
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def make_state(self, expires=-1):
+        return {
+            "cookies": [{
+                "name": "session", "value": "abc123", "domain": "127.0.0.1",
+                "path": "/", "expires": expires, "secure": False,
+            }],
+            "origins": [],
+        }
+
+    def open_protected(self, state):
+        request = urllib.request.Request(f"{self.base_url}/protected")
+        request.add_header("Cookie", cookie_header(state, request.full_url))
+        with urllib.request.urlopen(request) as response:
+            return response.geturl()
+
+    def test_cached_session_skips_login(self):
+        self.cache.save("jdoe", self.make_state())
+        state = self.cache.load("jdoe")
+        final_url = self.open_protected(state)
+        self.assertFalse(self.cache.is_login_redirect(final_url))
+
+    def test_login_redirect_invalidates(self):
+        self.cache.save("jdoe", self.make_state())
+        LoginStandIn.valid_sessions = set()
+        final_url = self.open_protected(self.cache.load("jdoe"))
+        self.assertTrue(self.cache.is_login_redirect(final_url))
+        self.cache.invalidate("jdoe")
+        self.assertIsNone(self.cache.load("jdoe"))
+
+    def test_expiry_follows_cookie(self):
+        self.cache.save("jdoe", self.make_state(expires=time.time() + 0.05))
+        self.assertIsNotNone(self.cache.load("jdoe"))
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.load("jdoe"))
+
+    def test_keyed_by_username(self):
+        self.cache.save("jdoe", self.make_state())
+        self.assertIsNone(self.cache.load("asmith"))
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+
+
+class FakePage:
+    def __init__(self):
+        self.url = "about:blank"
+
+
+class TestOpenAuthenticatedPage(unittest.TestCase):
+    """
+    Drives `automation.open_authenticated_page` with a fake pooled context and page.
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = StorageStateCache(cache_dir=self.cache_dir)
+        self.contexts = []
+        self.released = []
+        self.final_url = None
+        patches = [
+            mock.patch.object(automation, "get_session_cache", return_value=self.cache),
+            mock.patch.object(automation, "acquire_pooled_page", self.acquire_pooled_page),
+            mock.patch.object(automation, "release_page_context", self.release_page_context),
+            mock.patch.object(automation, "navigate", self.navigate),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    async def acquire_pooled_page(self, **context_options):
+        context = FakeContext(context_options)
+        self.contexts.append(context)
+        return context, FakePage()
+
+    async def release_page_context(self, context):
+        self.released.append(context)
+
+    async def navigate(self, page, url, name=None, timeout=60000, goto=None, tracker=None):
+        page.url = self.final_url or url
+
+    def make_state(self):
+        return {
+            "cookies": [{"name": "session", "value": "abc123", "domain": "example.com", "path": "/", "expires": -1}],
+            "origins": [],
+        }
+
+    def open(self, url, username="jdoe"):
+        return asyncio.run(automation.open_authenticated_page(url, username))
+
+    def test_cached_session_is_passed_as_storage_state(self):
+        self.cache.save("jdoe", self.make_state())
+        context, page = self.open("https://example.com/reports")
+        self.assertEqual(context.options, {"storage_state": self.make_state()})
+        self.assertEqual(page.url, "https://example.com/reports")
+        self.assertIsNotNone(self.cache.load("jdoe"))
+
+    def test_without_cached_session_no_storage_state(self):
+        context, _ = self.open("https://example.com/reports")
+        self.assertEqual(context.options, {})
+
+    def test_login_redirect_invalidates_cached_session(self):
+        self.cache.save("jdoe", self.make_state())
+        self.final_url = "https://midway-auth.amazon.com/login?next=/reports"
+        self.open("https://example.com/reports")
+        self.assertIsNone(self.cache.load("jdoe"))
+        self.assertEqual(self.released, [])
+
+    def test_navigation_failure_releases_context(self):
+        async def failing_navigate(*args, **kwargs):
+            raise TimeoutError("navigation timed out")
+
+        with mock.patch.object(automation, "navigate", failing_navigate):
+            with self.assertRaises(TimeoutError):
+                self.open("https://example.com/reports")
+        self.assertEqual(self.released, self.contexts)
+
+
+if __name__ == '__main__':
+    unittest.main()
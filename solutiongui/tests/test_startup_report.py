@@ -0,0 +1,47 @@
+import sys
+import os
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import startup_report
+
+
+def import_entry(module, ok=True, total_ms=10.0):
+    return {"module": module, "ok": ok, "total_ms": total_ms, "slowest": [],
+            "error": None if ok else f"ModuleNotFoundError: No module named '{module}'"}
+
+
+class TestExitStatus(unittest.TestCase):
+    def run_main(self, imports, window=None, argv=()):
+        patches = [mock.patch.object(startup_report, "measure_import", side_effect=lambda module: imports[module])]
+        if window is not None:
+            patches.append(mock.patch.object(startup_report, "measure_first_window", return_value=window))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        with redirect_stdout(io.StringIO()):
+            return startup_report.main(list(imports) + list(argv))
+
+    def test_all_within_budget(self):
+        self.assertEqual(self.run_main({"automation": import_entry("automation")}), 0)
+
+    def test_over_budget(self):
+        self.assertEqual(self.run_main({"automation": import_entry("automation", total_ms=900)}), 1)
+
+    def test_failed_import(self):
+        imports = {"automation": import_entry("automation"), "missing": import_entry("missing", ok=False)}
+        self.assertEqual(self.run_main(imports), 1)
+
+    def test_failed_first_window(self):
+        window = {"target": "gui.passcode_window:PasscodeApp", "ok": False, "first_window_ms": None,
+                  "error": "no display"}
+        self.assertEqual(self.run_main({"automation": import_entry("automation")}, window, ["--first-window"]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
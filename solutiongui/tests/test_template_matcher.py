@@ -0,0 +1,70 @@
+import sys
+import os
+import importlib.util
+import shutil
+import tempfile
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+HAS_OPENCV = importlib.util.find_spec("cv2") is not None and importlib.util.find_spec("numpy") is not None
+
+from template_matcher import TemplateMatcher
+
+
+@unittest.skipUnless(HAS_OPENCV, "numpy and opencv-python are required")
+class TestTemplateMatcher(unittest.TestCase):
+    def setUp(self):
+        from benchmarks import fakes
+        self.fakes = fakes
+        self.template = fakes.make_button_template()
+        self.matcher = TemplateMatcher()
+        self.matcher.add_template("manage_button.png", self.template)
+
+    def test_finds_template_at_each_display_scale(self):
+        for scale in (1.0, 1.25, 1.5, 0.8):
+            screen = self.fakes.make_synthetic_screen(self.template, (1301, 777), scale=scale, seed=3)
+            self.matcher.forget_hint("manage_button.png")
+            match = self.matcher.find("manage_button.png", screen)
+            self.assertIsNotNone(match, scale)
+            self.assertEqual((match.left, match.top, match.scale), (1301, 777, scale))
+        self.assertEqual(self.matcher.stats.coarse_hits, 4)
+
+    def test_last_hit_region_is_searched_first(self):
+        screen = self.fakes.make_synthetic_screen(self.template, (400, 300), seed=1)
+        first = self.matcher.find("manage_button.png", screen)
+        moved = self.fakes.make_synthetic_screen(self.template, (410, 305), seed=1)
+        second = self.matcher.find("manage_button.png", moved)
+        self.assertEqual((second.left, second.top), (410, 305))
+        self.assertEqual(self.matcher.stats.hint_hits, 1)
+        self.assertEqual(first.center, (475, 320))
+
+        # Far away from the hint: falls back to the coarse search.
+        far = self.fakes.make_synthetic_screen(self.template, (1500, 900), seed=1)
+        self.assertEqual(self.matcher.find("manage_button.png", far)[1:3], (1500, 900))
+        self.assertEqual(self.matcher.stats.coarse_hits, 2)
+
+    def test_missing_template_on_screen(self):
+        import numpy as np
+        screen = self.fakes.make_synthetic_screen(np.zeros((1, 1, 3), dtype=np.uint8), (0, 0), seed=2)
+        self.assertIsNone(self.matcher.find("manage_button.png", screen))
+        self.assertEqual(self.matcher.stats.misses, 1)
+
+    def test_templates_are_read_from_disk_once(self):
+        import cv2
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cv2.imwrite(os.path.join(temp_dir, "accounts_button.png"), self.template)
+            matcher = TemplateMatcher(template_dir=temp_dir)
+            matcher.preload(["accounts_button.png", "missing_button.png"])
+            os.remove(os.path.join(temp_dir, "accounts_button.png"))
+            self.assertEqual(len(matcher.load("accounts_button.png")), len(matcher.scales))
+            with self.assertRaises(FileNotFoundError):
+                matcher.load("missing_button.png")
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
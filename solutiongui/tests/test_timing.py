@@ -0,0 +1,106 @@
+import sys
+import os
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import timing
+from timing import (
+    RollingHistogram,
+    apply_timing_setting,
+    disable_timing,
+    enable_timing,
+    format_table,
+    is_timing_enabled,
+    snapshot,
+    span,
+    timed,
+)
+
+
+class TestTiming(unittest.TestCase):
+    def setUp(self):
+        timing.reset()
+
+    def tearDown(self):
+        disable_timing()
+        timing.reset()
+
+    def test_percentiles(self):
+        histogram = RollingHistogram(window=100)
+        for milliseconds in range(1, 201):
+            histogram.add(milliseconds / 1000)
+        stats = histogram.percentiles()
+        self.assertEqual(stats["count"], 200)
+        # Only the latest 100 samples (101..200 ms) are kept.
+        self.assertEqual((stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]),
+                         (150.0, 195.0, 199.0, 200.0))
+
+    def test_span_and_decorator(self):
+        enable_timing(summary_interval=None)
+
+        @timed("sync.step")
+        def sync_step():
+            time.sleep(0.01)
+
+        @timed()
+        async def async_step():
+            await asyncio.sleep(0.01)
+
+        with span("block"):
+            sync_step()
+        asyncio.run(async_step())
+        with self.assertRaises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+
+        stats = snapshot()
+        self.assertEqual(list(stats), [
+            "TestTiming.test_span_and_decorator.<locals>.async_step", "block", "failing", "sync.step",
+        ])
+        self.assertGreaterEqual(stats["block"]["p50_ms"], stats["sync.step"]["p50_ms"])
+        self.assertGreaterEqual(stats["sync.step"]["p50_ms"], 10)
+        self.assertIn("sync.step", format_table(stats))
+
+    def test_disabled_records_nothing_and_is_cheap(self):
+        @timed("disabled.step")
+        def step():
+            return 1
+
+        calls = 100000
+        started = time.perf_counter()
+        for _ in range(calls):
+            with span("disabled.block"):
+                pass
+            step()
+        per_call_us = (time.perf_counter() - started) / calls * 1e6
+        self.assertEqual(snapshot(), {})
+        self.assertLess(per_call_us, 5)
+
+    def test_periodic_summary(self):
+        with self.assertLogs(level="INFO") as logs:
+            enable_timing(summary_interval=0.05)
+            with span("midway.submit"):
+                pass
+            time.sleep(0.2)
+            disable_timing()
+        summaries = [line for line in logs.output if "Timing summary: midway.submit" in line]
+        self.assertEqual(len(summaries), 1)
+
+    def test_apply_setting(self):
+        with mock.patch.dict(os.environ, {"SOLUTIONGUI_TIMING": ""}):
+            apply_timing_setting(True)
+            self.assertTrue(is_timing_enabled())
+            apply_timing_setting(False)
+            self.assertFalse(is_timing_enabled())
+            with mock.patch.dict(os.environ, {"SOLUTIONGUI_TIMING": "1"}):
+                apply_timing_setting(False)
+            self.assertTrue(is_timing_enabled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import sys
+import os
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ui_steps import Locator, Step, StepEngine, StepTimeout, UiBackend, appears
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeSettingsApp(UiBackend):
+    """
+    Simulated Windows Settings: controls appear a fixed time after the click that reveals
+    them. `failing_clicks` makes the first clicks on a control raise.
+    """
+
+    # Control title -> (title of the control it reveals, delay in seconds)
+    REVEALS = {
+        "Sign-in options": ("Security Key", 0.8),
+        "Security Key": ("Manage", 0.3),
+        "Manage": ("Reset", 0.3),
+        "Reset": ("Yes", 0.2),
+    }
+
+    def __init__(self, clock, window_delay=1.2, confirm=True, failing_clicks=None):
+        self.clock = clock
+        self.window_delay = window_delay
+        self.confirm = confirm
+        self.failing_clicks = dict(failing_clicks or {})
+        self.visible_at = {}
+        self.clicks = []
+
+    def launch(self, command):
+        self.visible_at["Settings"] = self.clock() + self.window_delay
+        self.visible_at["Sign-in options"] = self.clock() + self.window_delay
+
+    def find(self, locator):
+        title = "Settings" if locator.control_type == "Window" else locator.title
+        visible_at = self.visible_at.get(title)
+        if visible_at is None or self.clock() < visible_at:
+            return None
+        return title
+
+    def is_ready(self, element):
+        return True
+
+    def click(self, element):
+        if self.failing_clicks.get(element):
+            self.failing_clicks[element] -= 1
+            raise RuntimeError(f"{element} is not clickable yet")
+        self.clicks.append(element)
+        if element == "Yes":
+            del self.visible_at["Yes"]
+            return
+        revealed, delay = self.REVEALS.get(element, (None, 0))
+        if revealed == "Yes" and not self.confirm:
+            return
+        if revealed:
+            self.visible_at[revealed] = self.clock() + delay
+
+
+class TestStepEngine(unittest.TestCase):
+    def setUp(self):
+        import automation
+        self.automation = automation
+        self.clock = FakeClock()
+
+    def reset(self, **kwargs):
+        backend = FakeSettingsApp(self.clock, **kwargs)
+        engine = StepEngine(backend, clock=self.clock, sleep=self.clock.sleep)
+        return backend, self.automation.reset_security_key(backend, engine)
+
+    def test_reset_finishes_as_soon_as_the_ui_is_ready(self):
+        backend, result = self.reset()
+        self.assertTrue(result.ok)
+        self.assertEqual(backend.clicks, ["Sign-in options", "Security Key", "Manage", "Reset", "Yes"])
+        self.assertEqual([step.status for step in result.steps], ["ok"] * 6)
+        # The UI needs 2.8 s; polling adds at most one interval per wait.
+        self.assertLess(result.duration_ms, 2800 + 5 * 500)
+        self.assertLess(self.clock.now, 5.0)
+
+    def test_slow_settings_window_does_not_fail(self):
+        _, result = self.reset(window_delay=9.0)
+        self.assertTrue(result.ok)
+        self.assertGreaterEqual(result.steps[0].duration_ms, 9000)
+
+    def test_failed_click_retries_only_that_step(self):
+        backend, result = self.reset(failing_clicks={"Manage": 1})
+        self.assertTrue(result.ok)
+        attempts = {step.name: step.attempts for step in result.steps}
+        self.assertEqual(attempts["manage"], 2)
+        self.assertEqual(backend.clicks.count("Sign-in options"), 1)
+
+    def test_missing_confirmation_is_skipped(self):
+        _, result = self.reset(confirm=False)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.steps[-1].status, "skipped")
+
+    def test_missing_control_fails_the_flow(self):
+        clock = self.clock
+        backend = FakeSettingsApp(clock)
+        engine = StepEngine(backend, clock=clock, sleep=clock.sleep)
+        backend.launch("settings")
+        steps = [
+            Step("sign-in options", Locator("Sign-in options", "ListItem"), verify=appears(Locator("Security Key"))),
+            Step("bluetooth", Locator("Bluetooth", "Button"), timeout=2, retries=1),
+            Step("never reached", Locator("Manage", "Button")),
+        ]
+        result = engine.run("test", steps)
+        self.assertFalse(result.ok)
+        self.assertEqual([(step.name, step.status, step.attempts) for step in result.steps],
+                         [("sign-in options", "ok", 1), ("bluetooth", "failed", 2)])
+        self.assertIn("StepTimeout", result.steps[-1].error)
+
+    def test_polling_interval_grows(self):
+        engine = StepEngine(None, min_interval=0.05, max_interval=0.5, growth=2, clock=self.clock, sleep=self.clock.sleep)
+        with self.assertRaises(StepTimeout):
+            engine.wait_for(lambda: False, 2.0)
+        self.assertEqual(self.clock.sleeps[:5], [0.05, 0.1, 0.2, 0.4, 0.5])
+        self.assertAlmostEqual(self.clock.now, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
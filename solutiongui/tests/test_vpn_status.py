@@ -0,0 +1,138 @@
+import sys
+import os
+import asyncio
+import socket
+import threading
+import time
+import unittest
+
+# Add the package directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import vpn_status
+from vpn_status import CONNECTED, DISCONNECTED, UNKNOWN, VpnStatusService, connect_tcp
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeNetwork:
+    """
+    Fake resolver and connector. `resolvable` and `reachable` switch the outcome.
+    """
+
+    def __init__(self, resolvable=True, reachable=True, delay=0.0):
+        self.resolvable = resolvable
+        self.reachable = reachable
+        self.delay = delay
+        self.resolutions = 0
+
+    async def resolve(self, host, port):
+        self.resolutions += 1
+        await asyncio.sleep(self.delay)
+        if not self.resolvable:
+            raise socket.gaierror(-2, "Name or service not known")
+        return [("10.0.0.1", port)]
+
+    async def connect(self, address, timeout):
+        if not self.reachable:
+            raise ConnectionRefusedError(111, "Connection refused")
+
+
+def make_service(network, cli_result=False, clock=None, **kwargs):
+    return VpnStatusService(
+        check_url="https://internal.example.com", resolver=network.resolve, connector=network.connect,
+        cli_check=(lambda: cli_result) if cli_result is not None else None, clock=clock or FakeClock(), **kwargs
+    )
+
+
+class TestVpnStatusService(unittest.TestCase):
+    def test_states(self):
+        self.assertEqual(make_service(FakeNetwork()).refresh(), CONNECTED)
+        self.assertEqual(make_service(FakeNetwork(resolvable=False)).refresh(), DISCONNECTED)
+        self.assertEqual(make_service(FakeNetwork(reachable=False)).refresh(), DISCONNECTED)
+        self.assertEqual(make_service(FakeNetwork(reachable=False), cli_result=True).refresh(), UNKNOWN)
+
+    def test_vpn_settings_module_is_loaded_once(self):
+        self.assertIs(vpn_status._load_vpn_settings(), vpn_status._load_vpn_settings())
+
+    def test_ttl_cache_and_backoff(self):
+        clock = FakeClock()
+        network = FakeNetwork(resolvable=False)
+        service = make_service(network, clock=clock, ttl_seconds=30, min_backoff=5, max_backoff=20)
+
+        service.refresh()
+        delays = []
+        for _ in range(4):
+            delays.append(service._next_probe_at - clock.now)
+            clock.now = service._next_probe_at
+            service.refresh()
+        self.assertEqual(delays, [5, 10, 20, 20])
+
+        network.resolvable = True
+        service.refresh()
+        self.assertEqual(service._next_probe_at - clock.now, 30)
+
+    def test_status_is_cached_and_probes_in_background(self):
+        clock = FakeClock()
+        network = FakeNetwork(delay=0.05)
+        service = make_service(network, clock=clock)
+
+        started = time.perf_counter()
+        self.assertEqual(service.status(), UNKNOWN)
+        self.assertLess(time.perf_counter() - started, 0.01)
+        service._probe_thread.join(2)
+        self.assertEqual(service.status(), CONNECTED)
+        for _ in range(1000):
+            service.is_connected()
+        self.assertEqual(network.resolutions, 1)
+
+    def test_subscribers_are_notified_on_change(self):
+        network = FakeNetwork()
+        service = make_service(network)
+        changes = []
+        unsubscribe = service.subscribe(lambda old, new, detail: changes.append((old, new)))
+        service.refresh()
+        service.refresh()
+        network.resolvable = False
+        service.refresh()
+        unsubscribe()
+        network.resolvable = True
+        service.refresh()
+        self.assertEqual(changes, [(UNKNOWN, CONNECTED), (CONNECTED, DISCONNECTED)])
+
+    def test_hung_cli_check_does_not_block_probe(self):
+        release = threading.Event()
+
+        def hung_cli():
+            release.wait(5)
+            return True
+
+        service = VpnStatusService(
+            check_url="https://internal.example.com", resolver=FakeNetwork().resolve,
+            connector=FakeNetwork().connect, cli_check=hung_cli, probe_timeout=0.1,
+        )
+        started = time.perf_counter()
+        self.assertEqual(service.refresh(), CONNECTED)
+        self.assertLess(time.perf_counter() - started, 1)
+        release.set()
+
+    def test_connect_tcp_against_local_listener(self):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        try:
+            asyncio.run(connect_tcp(listener.getsockname(), 1))
+        finally:
+            listener.close()
+        with self.assertRaises(OSError):
+            asyncio.run(connect_tcp(listener.getsockname(), 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
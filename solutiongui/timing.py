@@ -0,0 +1,272 @@
+"""
+Lightweight step timing. Wrap a step in `with span("midway.goto"):` or decorate a
+function with `@timed("passcode.lookup")`; each step keeps a rolling window of its
+latest durations in memory, from which p50/p95/p99 are computed on demand.
+
+Timing is off by default. While it is off, `span()` returns a shared no-op context
+manager and `@timed` wrappers call straight through, so instrumented code pays one
+global lookup per step. The app applies the timing_enabled setting at startup; set
+SOLUTIONGUI_TIMING=1 to enable it at import time regardless.
+
+Every module imports this one as `timing`, so the passcode lookup, the automation steps
+and the Settings tab all share one set of recorded durations.
+"""
+import functools
+import inspect
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_WINDOW = 1024
+DEFAULT_SUMMARY_INTERVAL = 300.0
+
+_enabled = False
+_histograms = {}
+_histograms_lock = threading.Lock()
+_summary_thread = None
+_summary_stop = threading.Event()
+
+
+class RollingHistogram:
+    """
+    The latest `window` durations of one step.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self):
+        """
+        Returns:
+            dict: Total count and p50/p95/p99/max of the window in milliseconds.
+        """
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": self.count, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+        def nearest_rank(fraction):
+            return round(ordered[max(0, math.ceil(fraction * len(ordered)) - 1)] * 1000, 1)
+
+        return {
+            "count": self.count,
+            "p50_ms": nearest_rank(0.50),
+            "p95_ms": nearest_rank(0.95),
+            "p99_ms": nearest_rank(0.99),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+
+def record(name, seconds):
+    """
+    Adds a duration to a step's histogram.
+
+    Args:
+        name (str): Step name, e.g. "midway.submit".
+        seconds (float): Duration in seconds.
+    """
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(name, RollingHistogram())
+    histogram.add(seconds)
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """
+    Context manager timing the enclosed block as step `name`. Failed steps are recorded too.
+
+    Args:
+        name (str): Step name.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name=None):
+    """
+    Decorator timing every call of a function or coroutine function.
+
+    Args:
+        name (str): Step name (default: the function's qualified name).
+    """
+    def decorator(func):
+        step = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(step, time.perf_counter() - started)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(step, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """
+    Returns the percentiles of every step, sorted by name.
+
+    Returns:
+        dict: Step name -> percentiles (see `RollingHistogram.percentiles`).
+    """
+    with _histograms_lock:
+        histograms = sorted(_histograms.items())
+    return {name: histogram.percentiles() for name, histogram in histograms}
+
+
+def reset():
+    """
+    Discards all recorded durations.
+    """
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def format_table(stats=None):
+    """
+    Formats a snapshot as a fixed-width table for the GUI.
+
+    Args:
+        stats (dict): Output of `snapshot()` (default: a new snapshot).
+
+    Returns:
+        str: One line per step.
+    """
+    stats = snapshot() if stats is None else stats
+    if not stats:
+        return "No timings recorded yet."
+    width = max(len(name) for name in stats)
+    lines = [f"{'step':<{width}} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}"]
+    for name, values in stats.items():
+        cells = [f"{values[key]:8.1f}" if values[key] is not None else f"{'-':>8}" for key in ("p50_ms", "p95_ms", "p99_ms")]
+        lines.append(f"{name:<{width}} {values['count']:>6} {' '.join(cells)}")
+    return "\n".join(lines)
+
+
+def summary_line(stats=None):
+    """
+    Returns a single log line summarising every step, or None if nothing was recorded.
+    """
+    stats = snapshot() if stats is None else stats
+    if not stats:
+        return None
+    parts = [
+        f"{name} p50={values['p50_ms']}ms p95={values['p95_ms']}ms p99={values['p99_ms']}ms n={values['count']}"
+        for name, values in stats.items()
+    ]
+    return "Timing summary: " + "; ".join(parts)
+
+
+def _log_summaries(interval):
+    last_counts = None
+    while not _summary_stop.wait(interval):
+        stats = snapshot()
+        counts = {name: values["count"] for name, values in stats.items()}
+        if counts and counts != last_counts:
+            logging.info(summary_line(stats))
+        last_counts = counts
+
+
+def enable_timing(summary_interval=DEFAULT_SUMMARY_INTERVAL):
+    """
+    Starts recording step timings and logs a summary every `summary_interval` seconds
+    while new samples arrive.
+
+    Args:
+        summary_interval (float): Seconds between summary lines (None or 0 to disable them).
+    """
+    global _enabled, _summary_thread
+    _enabled = True
+    if summary_interval and (_summary_thread is None or not _summary_thread.is_alive()):
+        _summary_stop.clear()
+        _summary_thread = threading.Thread(
+            target=_log_summaries, args=(summary_interval,), name="timing-summary", daemon=True
+        )
+        _summary_thread.start()
+    logging.info("Step timing enabled.")
+
+
+def disable_timing():
+    """
+    Stops recording step timings and the periodic summary. Recorded durations are kept.
+    """
+    global _enabled, _summary_thread
+    _enabled = False
+    _summary_stop.set()
+    if _summary_thread is not None:
+        _summary_thread.join(1)
+        _summary_thread = None
+
+
+def is_timing_enabled():
+    return _enabled
+
+
+def apply_timing_setting(enabled):
+    """
+    Turns step timing on or off to match the saved setting. SOLUTIONGUI_TIMING=1 keeps
+    it on regardless.
+
+    Args:
+        enabled (bool): Value of the timing_enabled setting.
+    """
+    enabled = enabled or os.environ.get("SOLUTIONGUI_TIMING") == "1"
+    if enabled and not is_timing_enabled():
+        enable_timing()
+    elif not enabled and is_timing_enabled():
+        disable_timing()
+
+
+if os.environ.get("SOLUTIONGUI_TIMING") == "1":
+    enable_timing()
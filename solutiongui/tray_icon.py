@@ -1,8 +1,11 @@
 import threading
 import logging
-import pystray
-from PIL import Image
 import os
+from lazy_import import lazy_import
+
+# pystray and Pillow load when the tray icon is created.
+pystray = lazy_import("pystray")
+PIL_Image = lazy_import("PIL.Image")
 
 def setup_tray_icon(show_callback, exit_callback):
     """
@@ -17,7 +20,7 @@ def setup_tray_icon(show_callback, exit_callback):
         logging.warning(f"Tray icon file {icon_path} not found.")
         return None
 
-    image = Image.open(icon_path)
+    image = PIL_Image.open(icon_path)
     menu = pystray.Menu(
         pystray.MenuItem('Show', show_callback),
         pystray.MenuItem('Exit', exit_callback)
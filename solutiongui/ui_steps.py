@@ -0,0 +1,259 @@
+"""
+Condition-driven engine for desktop UI automation.
+
+A flow is a list of declarative steps. Each step locates a control, waits until it is
+ready, acts on it and optionally verifies the result. Waits poll with short intervals
+that grow while nothing changes, so a step finishes as soon as the UI is ready instead
+of after a fixed sleep. A failing step is retried on its own; the flow is not restarted.
+
+UI access goes through a backend (`PywinautoBackend` on Windows), so the engine and its
+timing can be exercised with a fake backend anywhere.
+"""
+import logging
+import time
+from collections import namedtuple
+from lazy_import import lazy_import
+from timing import record, is_timing_enabled
+
+pywinauto = lazy_import("pywinauto")
+
+# Criteria for a control; fields left as None are not matched.
+Locator = namedtuple("Locator", ["title", "control_type", "title_re"], defaults=(None, None, None))
+
+CLICK = "click"
+
+
+class Step(namedtuple("Step", ["name", "locator", "action", "verify", "timeout", "retries", "optional"])):
+    """
+    One step of a flow.
+
+    Attributes:
+        name (str): Name used in logs and timings.
+        locator (Locator): Control to wait for.
+        action: CLICK, a callable `(backend, element)`, or None to only wait.
+        verify (function): Callable `(backend) -> bool` that must become true after the action (optional).
+        timeout (float): Seconds to wait for the control, and for the verification.
+        retries (int): Extra attempts after a failed attempt.
+        optional (bool): A control that never appears skips the step instead of failing the flow.
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, locator, action=CLICK, verify=None, timeout=10.0, retries=2, optional=False):
+        return super().__new__(cls, name, locator, action, verify, timeout, retries, optional)
+
+
+StepResult = namedtuple("StepResult", ["name", "status", "attempts", "duration_ms", "error"])
+FlowResult = namedtuple("FlowResult", ["name", "ok", "steps", "duration_ms"])
+
+
+class StepTimeout(Exception):
+    """
+    Raised when a condition does not become true in time.
+    """
+
+
+def appears(locator):
+    """
+    Verification that holds once `locator` exists.
+    """
+    return lambda backend: backend.find(locator) is not None
+
+
+def disappears(locator):
+    """
+    Verification that holds once `locator` no longer exists.
+    """
+    return lambda backend: backend.find(locator) is None
+
+
+class UiBackend:
+    """
+    Interface between the step engine and a UI automation library.
+    """
+
+    def launch(self, command):
+        """
+        Starts an application.
+        """
+        raise NotImplementedError
+
+    def find(self, locator):
+        """
+        Returns the control matching `locator`, or None. Must not block.
+        """
+        raise NotImplementedError
+
+    def is_ready(self, element):
+        """
+        Returns True if the control is visible and enabled.
+        """
+        raise NotImplementedError
+
+    def click(self, element):
+        raise NotImplementedError
+
+
+class PywinautoBackend(UiBackend):
+    """
+    Backend for Windows applications using pywinauto's UI Automation API.
+    """
+
+    def __init__(self, window_title_re=".*Settings.*"):
+        """
+        Args:
+            window_title_re (str): Title pattern of the top-level window holding the controls.
+        """
+        self.window_title_re = window_title_re
+        self.app = None
+
+    def launch(self, command):
+        self.app = pywinauto.Application(backend="uia").start(command)
+
+    def _window(self):
+        return self.app.window(title_re=self.window_title_re)
+
+    def find(self, locator):
+        if locator.control_type == "Window":
+            spec = self.app.window(title_re=locator.title_re or self.window_title_re)
+        else:
+            criteria = {key: value for key, value in locator._asdict().items() if value is not None}
+            spec = self._window().child_window(**criteria)
+        try:
+            return spec if spec.exists(timeout=0) else None
+        except Exception:
+            return None
+
+    def is_ready(self, element):
+        try:
+            return element.is_visible() and element.is_enabled()
+        except Exception:
+            return False
+
+    def click(self, element):
+        element.click_input()
+
+
+class StepEngine:
+    """
+    Runs flows against a backend.
+    """
+
+    def __init__(self, backend, min_interval=0.05, max_interval=0.5, growth=1.5,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            backend (UiBackend): UI backend.
+            min_interval (float): First polling interval in seconds.
+            max_interval (float): Longest polling interval in seconds.
+            growth (float): Factor applied to the interval after each unsuccessful poll.
+            clock (function): Monotonic time source.
+            sleep (function): Sleep function.
+        """
+        self.backend = backend
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.clock = clock
+        self.sleep = sleep
+
+    def wait_for(self, condition, timeout):
+        """
+        Polls `condition()` until it returns a truthy value.
+
+        Args:
+            condition (function): Condition to poll; exceptions count as "not yet".
+            timeout (float): Seconds to keep polling.
+
+        Returns:
+            The truthy value returned by the condition.
+
+        Raises:
+            StepTimeout: If the condition is still false after `timeout` seconds.
+        """
+        deadline = self.clock() + timeout
+        interval = self.min_interval
+        while True:
+            try:
+                value = condition()
+            except Exception:
+                value = None
+            if value:
+                return value
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                raise StepTimeout(f"Condition not met within {timeout:g}s.")
+            self.sleep(min(interval, remaining))
+            interval = min(self.max_interval, interval * self.growth)
+
+    def _locate(self, locator):
+        element = self.backend.find(locator)
+        if element is not None and self.backend.is_ready(element):
+            return element
+        return None
+
+    def _attempt(self, step):
+        element = self.wait_for(lambda: self._locate(step.locator), step.timeout)
+        if step.action == CLICK:
+            self.backend.click(element)
+        elif step.action is not None:
+            step.action(self.backend, element)
+        if step.verify is not None:
+            self.wait_for(lambda: step.verify(self.backend), step.timeout)
+
+    def run_step(self, step, flow_name="flow"):
+        """
+        Runs one step, retrying it on failure.
+
+        Returns:
+            StepResult: status is "ok", "skipped" (optional control absent) or "failed".
+        """
+        started = self.clock()
+        attempts = 0
+        error = None
+        status = "failed"
+        while attempts <= step.retries:
+            attempts += 1
+            try:
+                self._attempt(step)
+                status, error = "ok", None
+                break
+            except StepTimeout as e:
+                error = e
+                if step.optional and self.backend.find(step.locator) is None:
+                    status = "skipped"
+                    break
+            except Exception as e:
+                error = e
+            logging.info(f"Step '{step.name}' attempt {attempts} failed: {error}")
+        duration = self.clock() - started
+        if is_timing_enabled():
+            record(f"ui.{flow_name}.{step.name}", duration)
+        return StepResult(step.name, status, attempts, round(duration * 1000, 1),
+                          None if error is None else f"{type(error).__name__}: {error}")
+
+    def run(self, name, steps):
+        """
+        Runs the steps in order and stops at the first failed step.
+
+        Args:
+            name (str): Flow name used in logs and timings.
+            steps (list): Step entries.
+
+        Returns:
+            FlowResult: Per-step results and the total duration.
+        """
+        started = self.clock()
+        results = []
+        for step in steps:
+            logging.info(f"Step '{step.name}'...")
+            result = self.run_step(step, name)
+            results.append(result)
+            if result.status == "failed":
+                logging.error(f"Step '{step.name}' failed after {result.attempts} attempt(s): {result.error}")
+                break
+            logging.info(f"Step '{step.name}' {result.status} in {result.duration_ms:.0f} ms.")
+        duration = self.clock() - started
+        if is_timing_enabled():
+            record(f"ui.{name}", duration)
+        ok = all(result.status != "failed" for result in results)
+        return FlowResult(name, ok, results, round(duration * 1000, 1))
@@ -54,7 +54,7 @@ def get_connected_vpn():
 
     if current_os == "Linux":
         try:
-            result = subprocess.run(["nmcli", "con", "show", "--active"], capture_output=True, text=True)
+            result = subprocess.run(["nmcli", "con", "show", "--active"], capture_output=True, text=True, timeout=5)
             active_connections = result.stdout.splitlines()
             vpn_connections = [line for line in active_connections if "vpn" in line.lower()]
             return vpn_connections[0] if vpn_connections else None
@@ -70,7 +70,7 @@ def get_connected_vpn():
                 return cisco_status
 
             # If Cisco AnyConnect is not active, fallback to checking using PowerShell
-            result = subprocess.run(["powershell", "-Command", "Get-VpnConnection"], capture_output=True, text=True)
+            result = subprocess.run(["powershell", "-Command", "Get-VpnConnection"], capture_output=True, text=True, timeout=5)
             if "Name" in result.stdout:
                 return result.stdout.strip()
             return None
@@ -80,7 +80,7 @@ def get_connected_vpn():
 
     elif current_os == "Darwin":
         try:
-            result = subprocess.run(["scutil", "--nc", "list"], capture_output=True, text=True)
+            result = subprocess.run(["scutil", "--nc", "list"], capture_output=True, text=True, timeout=5)
             active_connections = result.stdout.splitlines()
             vpn_connections = [line for line in active_connections if "Connected" in line]
             return vpn_connections[0] if vpn_connections else None
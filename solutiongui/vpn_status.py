@@ -0,0 +1,278 @@
+"""
+VPN status service. The VPN state is cached, so gating a link button on it is a dict
+lookup; stale entries are refreshed by a background probe that resolves and connects to
+VPN_CHECK_URL while the VPN client CLI check (`vpn settings.py`) runs concurrently.
+While disconnected, re-probes back off exponentially.
+"""
+import asyncio
+import functools
+import importlib.util
+import logging
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+from config import VPN_CHECK_URL
+from event_log import emit_event
+
+CONNECTED = "connected"
+DISCONNECTED = "disconnected"
+UNKNOWN = "unknown"
+
+VPN_SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vpn settings.py")
+
+
+async def resolve_host(host, port):
+    """
+    Resolves a hostname without blocking the event loop.
+
+    Returns:
+        list: Socket addresses for TCP connections.
+    """
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4] for info in infos]
+
+
+async def connect_tcp(address, timeout):
+    """
+    Opens and closes a TCP connection to `address`, raising OSError or TimeoutError on failure.
+    """
+    _, writer = await asyncio.wait_for(asyncio.open_connection(address[0], address[1]), timeout)
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _load_vpn_settings():
+    # "vpn settings.py" is not importable by name; load it once rather than on every probe.
+    spec = importlib.util.spec_from_file_location("vpn_settings", VPN_SETTINGS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def vpn_client_connected():
+    """
+    Asks the platform VPN client whether a VPN connection is active, using the checks in
+    `vpn settings.py` (vpncli, nmcli, Get-VpnConnection or scutil).
+
+    Returns:
+        bool: True if the client reports an active connection.
+    """
+    return bool(_load_vpn_settings().get_connected_vpn())
+
+
+class VpnStatusService:
+    """
+    Tracks the VPN state as CONNECTED, DISCONNECTED or UNKNOWN.
+    """
+
+    def __init__(self, check_url=VPN_CHECK_URL, ttl_seconds=30.0, probe_timeout=3.0, min_backoff=5.0,
+                 max_backoff=300.0, resolver=resolve_host, connector=connect_tcp,
+                 cli_check=vpn_client_connected, clock=time.monotonic):
+        """
+        Initializes the service. No probe runs until the state is first requested.
+
+        Args:
+            check_url (str): URL that is only reachable over the VPN.
+            ttl_seconds (float): How long a CONNECTED result stays fresh.
+            probe_timeout (float): Timeout for the network and CLI checks.
+            min_backoff (float): Re-probe delay after the first DISCONNECTED or UNKNOWN result.
+            max_backoff (float): Upper bound for the re-probe delay.
+            resolver (function): Async (host, port) -> addresses.
+            connector (function): Async (address, timeout) -> None, raising on failure.
+            cli_check (function): Blocking () -> bool from the VPN client CLI, or None to skip it.
+            clock (function): Monotonic time source.
+        """
+        parsed = urlparse(check_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.ttl_seconds = ttl_seconds
+        self.probe_timeout = probe_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.resolver = resolver
+        self.connector = connector
+        self.cli_check = cli_check
+        self.clock = clock
+        self.state = UNKNOWN
+        self.detail = "Not probed yet."
+        self.probes = 0
+        self._next_probe_at = 0.0
+        self._backoff = min_backoff
+        self._probe_thread = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def status(self):
+        """
+        Returns the cached state and starts a background probe if it is due. Never blocks.
+
+        Returns:
+            str: CONNECTED, DISCONNECTED or UNKNOWN.
+        """
+        if self.clock() >= self._next_probe_at:
+            self._start_background_probe()
+        return self.state
+
+    def is_connected(self):
+        return self.status() == CONNECTED
+
+    def subscribe(self, callback):
+        """
+        Registers `callback(old_state, new_state, detail)` for state changes. It runs on the
+        probe thread, so GUI code should hand it to `after()`.
+
+        Returns:
+            function: Call it to unsubscribe.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def invalidate(self):
+        """
+        Forces the next `status()` call to re-probe, e.g. after the user reconnects.
+        """
+        self._next_probe_at = 0.0
+        self._backoff = self.min_backoff
+
+    def _start_background_probe(self):
+        with self._lock:
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(target=self.refresh, name="vpn-probe", daemon=True)
+            self._probe_thread.start()
+
+    def refresh(self):
+        """
+        Probes the VPN now and updates the state. Blocks for up to `probe_timeout`.
+
+        Returns:
+            str: The new state.
+        """
+        try:
+            state, detail = asyncio.run(self.probe())
+        except Exception as e:
+            logging.exception(f"VPN probe failed: {e}")
+            state, detail = UNKNOWN, f"Probe error: {e}"
+        self._update(state, detail)
+        return state
+
+    async def probe(self):
+        """
+        Runs the network check (DNS resolution, then a TCP connect) and the VPN client CLI
+        check concurrently.
+
+        Returns:
+            tuple: (state, detail)
+        """
+        self.probes += 1
+        network = asyncio.ensure_future(self._probe_network())
+        cli = asyncio.ensure_future(self._probe_cli())
+        (reachable, network_detail), cli_connected = await asyncio.gather(network, cli)
+        if reachable:
+            return CONNECTED, network_detail
+        if cli_connected:
+            # The client reports a tunnel but the check host is unreachable.
+            return UNKNOWN, f"VPN client reports a connection, but {network_detail}"
+        return DISCONNECTED, network_detail
+
+    async def _probe_network(self):
+        """
+        Returns:
+            tuple: (True if the check host accepted a connection, detail)
+        """
+        try:
+            addresses = await asyncio.wait_for(self.resolver(self.host, self.port), self.probe_timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            logging.info("VPN connection is not active. Failed to resolve hostname.")
+            return False, f"failed to resolve {self.host}: {e or type(e).__name__}"
+        last_error = None
+        for address in addresses:
+            try:
+                await self.connector(address, self.probe_timeout)
+                return True, f"reached {self.host}:{self.port}"
+            except (OSError, asyncio.TimeoutError) as e:
+                last_error = e
+        return False, f"could not connect to {self.host}:{self.port}: {last_error or 'no addresses'}"
+
+    async def _probe_cli(self):
+        if self.cli_check is None:
+            return None
+        # A daemon thread rather than the default executor, so a hung CLI cannot hold up
+        # the shutdown of the probe's event loop.
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def deliver(result, error):
+            if not future.done():
+                future.set_exception(error) if error else future.set_result(result)
+
+        def run():
+            result, error = None, None
+            try:
+                result = self.cli_check()
+            except Exception as e:
+                error = e
+            try:
+                loop.call_soon_threadsafe(deliver, result, error)
+            except RuntimeError:
+                pass  # The probe already finished and its loop is closed.
+
+        threading.Thread(target=run, name="vpn-cli-check", daemon=True).start()
+        try:
+            return await asyncio.wait_for(future, self.probe_timeout)
+        except Exception as e:
+            logging.info(f"VPN client check unavailable: {e or type(e).__name__}")
+            return None
+
+    def _update(self, state, detail):
+        now = self.clock()
+        if state == CONNECTED:
+            self._backoff = self.min_backoff
+            self._next_probe_at = now + self.ttl_seconds
+        else:
+            self._next_probe_at = now + self._backoff
+            self._backoff = min(self.max_backoff, self._backoff * 2)
+
+        old_state, self.state, self.detail = self.state, state, detail
+        if old_state == state:
+            return
+        logging.info(f"VPN status changed: {old_state} -> {state} ({detail})")
+        emit_event("vpn_status", outcome=state, previous=old_state, detail=detail)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(old_state, state, detail)
+            except Exception:
+                logging.exception("VPN status subscriber failed.")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_vpn_status_service():
+    """
+    Returns the shared VPN status service for VPN_CHECK_URL.
+
+    Returns:
+        VpnStatusService: The shared service.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = VpnStatusService()
+        return _service